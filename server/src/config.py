@@ -1,16 +1,30 @@
 """Application configuration with Pydantic settings."""
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 import secrets
 
 
+@lru_cache(maxsize=8)
+def _parse_cors_origins(cors_origins: str) -> Tuple[str, ...]:
+    """Split a comma-separated CORS origins string (memoized per raw value)."""
+    if cors_origins == "*":
+        return ("*",)
+    return tuple(origin.strip() for origin in cors_origins.split(",") if origin.strip())
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Server Configuration
     server_host: str = "0.0.0.0"
     server_port: int = 8000
+    # Uvicorn worker processes. Repositories are in-memory and per process,
+    # so keep 1 unless the data lives in a shared store.
+    server_workers: int = 1
+    # Processes that run bcrypt hashing/verification (0 = in the request thread)
+    password_hash_workers: int = 0
     debug: bool = False
     
     # Security
@@ -35,6 +49,11 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_format: str = "json"
     
+    # Idempotency-Key body fingerprint: "xxh128" (fast) or "sha256"
+    idempotency_body_hash: str = "xxh128"
+    # Largest request body accepted with an Idempotency-Key (bytes)
+    idempotency_max_request_body: int = 1024 * 1024
+    
     # Testing
     disable_rate_limiting: bool = False
     
@@ -47,6 +66,9 @@ class Settings(BaseSettings):
     max_login_attempts: int = 5
     login_lockout_duration_minutes: int = 15
     login_attempt_window_minutes: int = 15
+    # Keep login attempt counters in Redis so all workers share them
+    use_redis_login_tracker: bool = False
+    redis_url: str = "redis://localhost:6379/0"
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -57,9 +79,8 @@ class Settings(BaseSettings):
     
     def get_cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
-        if self.cors_origins == "*":
-            return ["*"]
-        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+        # Keyed on the raw string so a changed setting is re-parsed
+        return list(_parse_cors_origins(self.cors_origins))
     
     def validate_config(self) -> None:
         """Validate critical configuration at startup."""
@@ -98,6 +119,10 @@ class Settings(BaseSettings):
         if self.default_max_wrong_guesses < 1:
             errors.append("DEFAULT_MAX_WRONG_GUESSES must be at least 1")
         
+        # All repositories are in-memory, so every worker would see different data
+        if self.server_workers != 1:
+            errors.append("SERVER_WORKERS must be 1 (application state is not shared between processes)")
+        
         if errors:
             raise ValueError(f"Configuration validation failed:\n- " + "\n- ".join(errors))
 
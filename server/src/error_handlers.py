@@ -14,6 +14,17 @@ from .models.error import ErrorResponse, ErrorCode
 logger = logging.getLogger(__name__)
 
 
+class ErrorJSONResponse(JSONResponse):
+    """JSONResponse for ErrorResponse models.
+    
+    Serializes the model straight to JSON with pydantic-core instead of
+    model_dump() into a dict followed by json.dumps.
+    """
+    
+    def render(self, content: ErrorResponse) -> bytes:
+        return content.model_dump_json().encode("utf-8")
+
+
 async def hangman_exception_handler(request: Request, exc: HangmanException) -> JSONResponse:
     """Handle custom Hangman exceptions."""
     request_id = getattr(request.state, "request_id", None)
@@ -28,18 +39,18 @@ async def hangman_exception_handler(request: Request, exc: HangmanException) ->
     
     # Log the error
     logger.warning(
-        f"HangmanException: {exc.error_code.value} - {exc.message}",
+        "HangmanException: %s - %s", error_response.error_code, exc.message,
         extra={
             "request_id": request_id,
             "path": request.url.path,
-            "error_code": exc.error_code.value,
+            "error_code": error_response.error_code,
             "status_code": exc.status_code
         }
     )
     
-    return JSONResponse(
+    return ErrorJSONResponse(
         status_code=exc.status_code,
-        content=error_response.model_dump()
+        content=error_response
     )
 
 
@@ -62,7 +73,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
     
     logger.warning(
-        f"Validation error: {errors}",
+        "Validation error: %s", errors,
         extra={
             "request_id": request_id,
             "path": request.url.path,
@@ -70,9 +81,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
     
-    return JSONResponse(
+    return ErrorJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=error_response.model_dump()
+        content=error_response
     )
 
 
@@ -99,7 +110,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
     )
     
     logger.warning(
-        f"HTTP {exc.status_code}: {exc.detail}",
+        "HTTP %s: %s", exc.status_code, exc.detail,
         extra={
             "request_id": request_id,
             "path": request.url.path,
@@ -107,9 +118,63 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
         }
     )
     
-    return JSONResponse(
+    return ErrorJSONResponse(
         status_code=exc.status_code,
-        content=error_response.model_dump()
+        content=error_response
+    )
+
+
+async def value_error_handler(request: Request, exc: ValueError) -> JSONResponse:
+    """Handle ValueError raised by services as a 400 Bad Request."""
+    request_id = getattr(request.state, "request_id", None)
+    
+    error_response = ErrorResponse.create(
+        error_code=ErrorCode.INVALID_INPUT,
+        message=str(exc) or "Bad request",
+        detail=None,
+        request_id=request_id,
+        path=request.url.path
+    )
+    
+    logger.warning(
+        "HTTP 400: %s", exc,
+        extra={
+            "request_id": request_id,
+            "path": request.url.path,
+            "status_code": status.HTTP_400_BAD_REQUEST
+        }
+    )
+    
+    return ErrorJSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content=error_response
+    )
+
+
+async def permission_error_handler(request: Request, exc: PermissionError) -> JSONResponse:
+    """Handle PermissionError raised by services as a 403 Forbidden."""
+    request_id = getattr(request.state, "request_id", None)
+    
+    error_response = ErrorResponse.create(
+        error_code=ErrorCode.FORBIDDEN,
+        message=str(exc) or "Access denied",
+        detail=None,
+        request_id=request_id,
+        path=request.url.path
+    )
+    
+    logger.warning(
+        "HTTP 403: %s", exc,
+        extra={
+            "request_id": request_id,
+            "path": request.url.path,
+            "status_code": status.HTTP_403_FORBIDDEN
+        }
+    )
+    
+    return ErrorJSONResponse(
+        status_code=status.HTTP_403_FORBIDDEN,
+        content=error_response
     )
 
 
@@ -119,7 +184,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
     
     # Log the full traceback for debugging
     logger.error(
-        f"Unhandled exception: {type(exc).__name__}: {str(exc)}",
+        "Unhandled exception: %s: %s", type(exc).__name__, exc,
         extra={
             "request_id": request_id,
             "path": request.url.path,
@@ -135,9 +200,9 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         path=request.url.path
     )
     
-    return JSONResponse(
+    return ErrorJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response.model_dump()
+        content=error_response
     )
 
 
@@ -146,6 +211,8 @@ def register_exception_handlers(app) -> None:
     app.add_exception_handler(HangmanException, hangman_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(PermissionError, permission_error_handler)
     app.add_exception_handler(Exception, general_exception_handler)
     
     logger.info("Exception handlers registered")
@@ -1,14 +1,19 @@
 """Hangman Server API - Clean refactored version."""
 
-from fastapi import FastAPI, Depends, HTTPException, status, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
-from typing import Optional
-from datetime import datetime
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Callable, Hashable, Optional
+from datetime import datetime, timedelta
 import asyncio
+import hashlib
 import json
 import logging
+import re
+import time
+import orjson
 
 # Import config
 from .config import settings
@@ -17,13 +22,14 @@ from .config import settings
 from .models import (
     RegisterRequest, LoginRequest, RefreshRequest,
     CreateSessionRequest, GuessRequest, ErrorResponse,
-    ForgotPasswordRequest, ResetPasswordRequest, UpdateProfileRequest
+    ForgotPasswordRequest, ResetPasswordRequest, UpdateProfileRequest,
+    DictionaryCreate
 )
 
 # Import repositories
 from .repositories import (
     UserRepository, SessionRepository,
-    GameRepository, DictionaryRepository
+    GameRepository, DictionaryRepository, LeaderboardRepository
 )
 
 # Import services
@@ -31,10 +37,16 @@ from .services import (
     AuthService, SessionService, GameService,
     StatsService, DictionaryService
 )
+from .services.stats_service import PERIOD_DAYS
 
 # Import utils
-from .utils.auth_utils import decode_token
+from .utils.auth_utils import decode_token, decode_token_cached, start_hash_pool, shutdown_hash_pool
 from .utils.logging_config import setup_logging
+from .utils.game_utils import FINISHED_STATUSES, SCORED_STATUSES
+from .utils.response_cache import response_cache
+from .utils.pagination import build_link_header
+from .utils.idempotency import _idempotency_store
+from .utils.event_manager import event_manager
 
 # Import exception handlers
 from .error_handlers import register_exception_handlers
@@ -55,19 +67,40 @@ try:
     settings.validate_config()
     logger.info("✓ Configuration validation passed")
 except ValueError as e:
-    logger.warning(f"⚠ Configuration validation warnings: {e}")
+    logger.warning("⚠ Configuration validation warnings: %s", e)
     if not settings.debug:
         logger.error("Configuration errors in production mode - refusing to start")
         raise  # Fail fast in production
     else:
         logger.info("Running in DEBUG mode - proceeding despite validation warnings")
 
+# Datetimes are serialized by orjson as naive-UTC ISO strings with a "Z"
+# suffix (same text as isoformat() + "Z"), so handlers can hand them over as-is
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+class UTCORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that renders datetimes as UTC with a "Z" suffix.
+    
+    FastAPI runs jsonable_encoder on plain dict return values, which turns
+    datetimes into strings first; return this response directly to skip
+    that pass.
+    """
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=ORJSON_OPTIONS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Hangman Server API",
     version="1.0.0",
     description="Hangman game server with modular architecture",
     debug=settings.debug,
+    default_response_class=UTCORJSONResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Bad Request"},
         401: {"model": ErrorResponse, "description": "Unauthorized"},
@@ -115,23 +148,146 @@ user_repo = UserRepository()
 session_repo = SessionRepository()
 game_repo = GameRepository()
 dict_repo = DictionaryRepository()
+leaderboard_repo = LeaderboardRepository()
 
 # Initialize services with dependency injection
 auth_service = AuthService(user_repo)
 session_service = SessionService(session_repo, dict_repo)
-game_service = GameService(game_repo, session_repo, dict_repo)
-stats_service = StatsService(user_repo, session_repo, game_repo)
+game_service = GameService(game_repo, session_repo, dict_repo, leaderboard_repo)
+stats_service = StatsService(user_repo, session_repo, game_repo, leaderboard_repo)
 dict_service = DictionaryService(dict_repo, session_repo)
 
 
+# Cache TTLs (seconds) for read-heavy endpoints; writes invalidate via repo versions
+USER_STATS_CACHE_TTL = 120
+GLOBAL_STATS_CACHE_TTL = 300
+LEADERBOARD_CACHE_TTL = 60
+
+# Client/proxy cache lifetime for public stats responses (Cache-Control max-age)
+STATS_HTTP_MAX_AGE = 60
+
+# Dictionary metadata (no word lists) keyed by id: preloaded at startup and
+# written through by the admin dictionary endpoints under _dict_cache_lock
+_DICT_CACHE: dict[str, dict] = {}
+_dict_cache_version = -1
+_dict_cache_lock = asyncio.Lock()
+
+# Words per chunk when streaming a dictionary's word list
+WORDS_STREAM_BATCH = 1000
+
+# Characters not allowed in generated dictionary ids
+_SLUG_RE = re.compile(r'[^a-z0-9_]')
+
+# Full rebuild of the materialized leaderboard (safety net for missed updates)
+LEADERBOARD_REFRESH_INTERVAL = 24 * 60 * 60
+
+
+def _stats_version() -> tuple:
+    """Combined write version of the data that statistics are computed from.
+    
+    Statistics only count finished games, and every finished (or deleted)
+    game goes through the leaderboard repository, so its version stands in
+    for the games table: guesses in unfinished games keep cached stats valid.
+    """
+    return (user_repo.version, session_repo.version, leaderboard_repo.version)
+
+
+def _load_dict_cache() -> None:
+    """(Re)load _DICT_CACHE from the dictionary repository."""
+    global _dict_cache_version
+    _DICT_CACHE.clear()
+    for entry in dict_service.list_dictionaries(active_only=False):
+        _DICT_CACHE[entry["dictionary_id"]] = entry
+    _dict_cache_version = dict_repo.version
+
+
+def _write_dict_cache(dictionary_id: str, entry: Optional[dict], version_before: int) -> None:
+    """Apply one successful admin write to _DICT_CACHE (entry=None removes it).
+    
+    The cache is marked current only if it was current before the write;
+    otherwise the next read reloads it from the repository.
+    """
+    global _dict_cache_version
+    if entry is None:
+        _DICT_CACHE.pop(dictionary_id, None)
+    else:
+        _DICT_CACHE[dictionary_id] = entry
+    if _dict_cache_version == version_before:
+        _dict_cache_version = dict_repo.version
+
+
+def _stats_etag(period: str, *parts) -> str:
+    """Strong ETag for a public stats response.
+    
+    Derived from the leaderboard version (the materialized view's last
+    update), so it changes when a game finishes or a ranked user is removed
+    or renamed, but not on guesses in unfinished games. Rolling-window
+    periods also roll it every STATS_HTTP_MAX_AGE seconds, because games
+    age out of the window without a write.
+    """
+    window = int(time.time() // STATS_HTTP_MAX_AGE) if period in PERIOD_DAYS else 0
+    raw = ":".join(map(str, (period, *parts, leaderboard_repo.version, window)))
+    return '"' + hashlib.md5(raw.encode()).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's If-None-Match matches etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" not in tags and etag not in tags:
+        return None
+    return Response(status_code=304, headers=_cache_headers(etag))
+
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={STATS_HTTP_MAX_AGE}"}
+
+
+async def _cached(key: Hashable, factory: Callable[[], Any], ttl_seconds: float, offload: bool) -> Any:
+    """Serve key from response_cache, computing misses with factory.
+    
+    Cache hits stay on the event loop. With offload, misses (full-scan
+    recomputations) run in the threadpool so they don't stall other
+    in-flight requests; otherwise they run on the loop. Factories that read
+    the materialized leaderboard must not be offloaded: it is updated on the
+    loop without a lock.
+    """
+    result = response_cache.get(key)
+    if result is None:
+        result = await run_in_threadpool(factory) if offload else factory()
+        response_cache.set(key, result, ttl_seconds)
+    return result
+
+
 # ============= DEPENDENCIES =============
 
-def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)):
-    """Dependency to get current authenticated user."""
+def _token_payload(request: Request, token: str) -> dict:
+    """Return the JWT payload for this request's bearer token.
+    
+    RateLimiterMiddleware already decodes the token and leaves the payload
+    on request.state; fall back to decode_token_cached when it did not
+    (rate limiting disabled, skipped path or invalid token).
+    """
+    payload = getattr(request.state, "jwt_payload", None)
+    if payload is None:
+        payload = decode_token_cached(token)
+    return payload
+
+
+async def get_current_user(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)):
+    """Dependency to get current authenticated user.
+    
+    Runs on the event loop (no threadpool hop) so decode_token_cached can
+    share one decode between concurrent requests using the same token.
+    The user itself is looked up on every call so deleted accounts are
+    rejected immediately.
+    """
     if not credentials:
         raise UnauthorizedException("Authorization header required")
     try:
-        payload = decode_token(credentials.credentials)
+        payload = _token_payload(request, credentials.credentials)
         user_id = payload.get("sub")
         if not user_id:
             raise UnauthorizedException("Invalid token: missing user ID")
@@ -144,7 +300,25 @@ def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depen
         raise UnauthorizedException(str(e))
 
 
-def get_admin_user(user=Depends(get_current_user)):
+async def get_current_user_id(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> str:
+    """Dependency returning the authenticated user ID from the token alone.
+    
+    Unlike get_current_user this skips the user lookup, for endpoints that
+    only compare the caller's ID against a path parameter.
+    """
+    if not credentials:
+        raise UnauthorizedException("Authorization header required")
+    try:
+        payload = _token_payload(request, credentials.credentials)
+    except ValueError as e:
+        raise UnauthorizedException(str(e))
+    user_id = payload.get("sub")
+    if not user_id:
+        raise UnauthorizedException("Invalid token: missing user ID")
+    return user_id
+
+
+async def get_admin_user(user=Depends(get_current_user)):
     """Dependency to ensure user is admin."""
     if not auth_service.is_admin(user["user_id"]):
         raise ForbiddenException("Admin access required")
@@ -154,21 +328,21 @@ def get_admin_user(user=Depends(get_current_user)):
 # ============= UTILITY ENDPOINTS =============
 
 @app.get("/healthz")
-def health():
+async def health():
     """Health check endpoint."""
     return {"ok": True}
 
 
 @app.get("/version")
-def version():
+async def version():
     """Get API version."""
     return {"version": "1.0.0", "build": "2025-11-02"}
 
 
 @app.get("/time")
-def server_time():
+async def server_time():
     """Get server time."""
-    return {"time": datetime.utcnow().isoformat() + "Z"}
+    return UTCORJSONResponse({"time": datetime.utcnow()})
 
 
 # Initialize Prometheus metrics instrumentation
@@ -191,21 +365,21 @@ instrumentator.instrument(app).expose(app, include_in_schema=True, tags=["Observ
 
 # ============= AUTH ENDPOINTS =============
 
+# register, login and reset_password hash or verify with bcrypt (CPU-bound,
+# ~100ms), so those service calls are sent to the threadpool explicitly;
+# everything else in the auth handlers stays on the event loop.
+
 @app.post("/api/v1/auth/register", status_code=201)
-def register(req: RegisterRequest):
+async def register(req: RegisterRequest):
     """Register a new user."""
-    try:
-        result = auth_service.register_user(req.email, req.password, req.nickname)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return await run_in_threadpool(auth_service.register_user, req.email, req.password, req.nickname)
 
 
 @app.post("/api/v1/auth/login")
-def login(req: LoginRequest):
+async def login(req: LoginRequest):
     """Login and get access token."""
     try:
-        result = auth_service.login_user(req.email, req.password)
+        result = await run_in_threadpool(auth_service.login_user, req.email, req.password)
         # Add token_type for standard OAuth2 response
         return {**result, "token_type": "bearer"}
     except ValueError as e:
@@ -213,7 +387,7 @@ def login(req: LoginRequest):
 
 
 @app.post("/api/v1/auth/refresh")
-def refresh(req: RefreshRequest):
+async def refresh(req: RefreshRequest):
     """Refresh access token."""
     try:
         payload = decode_token(req.refresh_token)
@@ -227,25 +401,25 @@ def refresh(req: RefreshRequest):
 
 
 @app.post("/api/v1/auth/forgot-password")
-def forgot_password(req: ForgotPasswordRequest):
+async def forgot_password(req: ForgotPasswordRequest):
     """Request password reset token."""
     return auth_service.request_password_reset(req.email)
 
 
 @app.post("/api/v1/auth/reset-password")
-def reset_password(req: ResetPasswordRequest):
+async def reset_password(req: ResetPasswordRequest):
     """Reset password using token."""
-    return auth_service.reset_password(req.token, req.new_password)
+    return await run_in_threadpool(auth_service.reset_password, req.token, req.new_password)
 
 
 @app.get("/api/v1/users/me")
-def get_profile(user=Depends(get_current_user)):
+async def get_profile(user=Depends(get_current_user)):
     """Get current user profile."""
     return user
 
 
 @app.patch("/api/v1/users/me")
-def update_profile(req: UpdateProfileRequest, user=Depends(get_current_user)):
+async def update_profile(req: UpdateProfileRequest, user=Depends(get_current_user)):
     """Update user profile (email and/or nickname)."""
     user_id = user["user_id"]
     
@@ -255,39 +429,30 @@ def update_profile(req: UpdateProfileRequest, user=Depends(get_current_user)):
     
     # Update profile
     updated_user = auth_service.update_profile(user_id, req.email, req.nickname)
+    if req.nickname is not None:
+        # Keep the nickname denormalized onto the leaderboard row in sync
+        leaderboard_repo.set_nickname(user_id, updated_user.get("nickname"))
     return updated_user
 
 
 @app.delete("/api/v1/users/me", status_code=204)
-def delete_account(user=Depends(get_current_user)):
+async def delete_account(user=Depends(get_current_user)):
     """Delete user account and all associated data (GDPR compliance)."""
     user_id = user["user_id"]
     
-    # Cascade delete all user data
-    # 1. Get all user sessions to delete games
-    user_sessions = session_repo.get_by_user(user_id)
-    session_ids = [s["session_id"] for s in user_sessions]
-    
-    # 2. Delete all games for those sessions (includes guesses)
-    games_deleted = game_repo.delete_by_user(user_id, session_ids)
-    logger.info(f"Deleted {games_deleted} games for user {user_id}")
-    
-    # 3. Delete all sessions
-    sessions_deleted = session_repo.delete_by_user(user_id)
-    logger.info(f"Deleted {sessions_deleted} sessions for user {user_id}")
-    
-    # 4. Delete user account
-    user_deleted = user_repo.delete(user_id)
-    if not user_deleted:
-        logger.error(f"Failed to delete user {user_id}")
+    # Cascade delete all user data (games, guesses, sessions, leaderboard row, account)
+    deleted = user_repo.cascade_delete(user_id, session_repo, game_repo, leaderboard_repo)
+    if not deleted["users"]:
+        logger.error("Failed to delete user %s", user_id)
         raise HTTPException(status_code=500, detail="Failed to delete user account")
     
-    logger.info(f"User account {user_id} deleted successfully")
+    logger.info("Deleted %s games and %s sessions for user %s", deleted['games'], deleted['sessions'], user_id)
+    logger.info("User account %s deleted successfully", user_id)
     return None  # 204 No Content
 
 
 @app.get("/api/v1/users/me/export")
-def export_user_data(user=Depends(get_current_user)):
+async def export_user_data(user=Depends(get_current_user)):
     """Export all user data (GDPR data portability - Article 20)."""
     user_id = user["user_id"]
     
@@ -299,7 +464,7 @@ def export_user_data(user=Depends(get_current_user)):
         stats_service
     )
     
-    logger.info(f"User data export generated for user {user_id}")
+    logger.info("User data export generated for user %s", user_id)
     return export_data
 
 
@@ -324,8 +489,6 @@ async def event_stream(user=Depends(get_current_user)):
     });
     ```
     """
-    from .utils.event_manager import event_manager
-    
     user_id = user["user_id"]
     queue = asyncio.Queue()
     
@@ -334,7 +497,7 @@ async def event_stream(user=Depends(get_current_user)):
         try:
             # Subscribe to events
             await event_manager.subscribe(user_id, queue)
-            logger.info(f"SSE stream started for user {user_id}")
+            logger.info("SSE stream started for user %s", user_id)
             
             # Send initial connection event
             yield f"event: connected\ndata: {json.dumps({'user_id': user_id, 'timestamp': datetime.utcnow().isoformat() + 'Z'})}\n\n"
@@ -355,13 +518,13 @@ async def event_stream(user=Depends(get_current_user)):
                     yield f": heartbeat\n\n"
                     
         except asyncio.CancelledError:
-            logger.info(f"SSE stream cancelled for user {user_id}")
+            logger.info("SSE stream cancelled for user %s", user_id)
         except Exception as e:
-            logger.error(f"Error in SSE stream for user {user_id}: {e}")
+            logger.error("Error in SSE stream for user %s: %s", user_id, e)
         finally:
             # Unsubscribe on disconnect
             await event_manager.unsubscribe(user_id, queue)
-            logger.info(f"SSE stream ended for user {user_id}")
+            logger.info("SSE stream ended for user %s", user_id)
     
     return StreamingResponse(
         event_generator(),
@@ -380,48 +543,65 @@ class ConnectionManager:
     """WebSocket connection manager for real-time bidirectional communication."""
     
     def __init__(self):
-        self.active_connections: dict[str, list[WebSocket]] = {}
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        # Reverse index so disconnect() does not depend on the caller's user_id
+        self._ws_to_user: dict[WebSocket, str] = {}
     
     async def connect(self, websocket: WebSocket, user_id: str):
         """Connect a WebSocket for a user."""
         await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
-        logger.info(f"WebSocket connected for user {user_id}")
+        self.active_connections.setdefault(user_id, set()).add(websocket)
+        self._ws_to_user[websocket] = user_id
+        logger.info("WebSocket connected for user %s", user_id)
     
-    def disconnect(self, websocket: WebSocket, user_id: str):
-        """Disconnect a WebSocket."""
-        if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
+    def disconnect(self, websocket: WebSocket, user_id: Optional[str] = None):
+        """Disconnect a WebSocket (user_id is resolved from the socket itself)."""
+        user_id = self._ws_to_user.pop(websocket, user_id)
+        connections = self.active_connections.get(user_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.active_connections[user_id]
-        logger.info(f"WebSocket disconnected for user {user_id}")
+        logger.info("WebSocket disconnected for user %s", user_id)
     
     async def send_personal_message(self, message: dict, user_id: str):
         """Send message to specific user's WebSocket connections."""
-        if user_id in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error sending WebSocket message to {user_id}: {e}")
-                    disconnected.append(connection)
-            
-            # Clean up disconnected connections
-            for conn in disconnected:
-                self.disconnect(conn, user_id)
+        # Snapshot: connections may be added or dropped while we await sends
+        for connection in tuple(self.active_connections.get(user_id, ())):
+            try:
+                await _ws_send_json(connection, message)
+            except Exception as e:
+                logger.error("Error sending WebSocket message to %s: %s", user_id, e)
+                self.disconnect(connection)
     
     async def broadcast(self, message: dict):
-        """Broadcast message to all connected users."""
-        for user_id in list(self.active_connections.keys()):
-            await self.send_personal_message(message, user_id)
+        """Broadcast message to all connected users concurrently."""
+        # Fan out so one slow client does not delay delivery to everyone else
+        await asyncio.gather(
+            *(self.send_personal_message(message, user_id) for user_id in list(self.active_connections)),
+            return_exceptions=True
+        )
 
 
 ws_manager = ConnectionManager()
 
 
+async def _ws_receive_json(websocket: WebSocket):
+    """Receive a JSON frame (text or binary) and parse it with orjson."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    raw = message.get("bytes")
+    if raw is None:
+        raw = message.get("text", "")
+    return orjson.loads(raw)
+
+
+async def _ws_send_json(websocket: WebSocket, data: dict):
+    """Serialize with orjson and send as a text frame (browser clients expect strings)."""
+    await websocket.send_text(orjson.dumps(data, option=ORJSON_OPTIONS).decode("utf-8"))
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
     """
@@ -466,7 +646,7 @@ async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
         return
     
     try:
-        payload = decode_token(token)
+        payload = decode_token_cached(token)
         user_id = payload.get("sub")
         if not user_id:
             await websocket.accept()
@@ -479,7 +659,7 @@ async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
             await websocket.close(code=1008, reason="User not found")
             return
     except Exception as e:
-        logger.warning(f"WebSocket authentication failed: {e}")
+        logger.warning("WebSocket authentication failed: %s", e)
         await websocket.accept()
         await websocket.close(code=1008, reason="Authentication failed")
         return
@@ -488,19 +668,19 @@ async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
     await ws_manager.connect(websocket, user_id)
     
     # Send welcome message
-    await websocket.send_json({
+    await _ws_send_json(websocket, {
         "type": "connected",
         "data": {
             "user_id": user_id,
             "message": "WebSocket connection established"
         },
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": datetime.utcnow()
     })
     
     try:
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
+            data = await _ws_receive_json(websocket)
             
             msg_type = data.get("type", "")
             msg_data = data.get("data", {})
@@ -508,81 +688,106 @@ async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
             # Handle different message types
             if msg_type == "ping":
                 # Respond with pong
-                await websocket.send_json({
+                now = datetime.utcnow()
+                await _ws_send_json(websocket, {
                     "type": "pong",
-                    "data": {"timestamp": datetime.utcnow().isoformat() + "Z"},
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "data": {"timestamp": now},
+                    "timestamp": now
                 })
             
             elif msg_type == "subscribe":
                 # Subscribe to channel (future enhancement)
                 channel = msg_data.get("channel", "general")
-                await websocket.send_json({
+                await _ws_send_json(websocket, {
                     "type": "subscribed",
                     "data": {"channel": channel},
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": datetime.utcnow()
                 })
-                logger.info(f"User {user_id} subscribed to channel {channel}")
+                logger.info("User %s subscribed to channel %s", user_id, channel)
             
             elif msg_type == "message":
                 # Echo message back (or handle custom logic)
-                await websocket.send_json({
+                await _ws_send_json(websocket, {
                     "type": "message_received",
                     "data": msg_data,
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": datetime.utcnow()
                 })
             
             else:
                 # Unknown message type
-                await websocket.send_json({
+                await _ws_send_json(websocket, {
                     "type": "error",
                     "data": {"message": f"Unknown message type: {msg_type}"},
-                    "timestamp": datetime.utcnow().isoformat() + "Z"
+                    "timestamp": datetime.utcnow()
                 })
     
     except WebSocketDisconnect:
-        ws_manager.disconnect(websocket, user_id)
-        logger.info(f"WebSocket disconnected for user {user_id}")
+        ws_manager.disconnect(websocket)
+        logger.info("WebSocket disconnected for user %s", user_id)
     except Exception as e:
-        logger.error(f"WebSocket error for user {user_id}: {e}")
-        ws_manager.disconnect(websocket, user_id)
+        logger.error("WebSocket error for user %s: %s", user_id, e)
+        ws_manager.disconnect(websocket)
 
 
 # ============= SESSION ENDPOINTS =============
 
 @app.get("/api/v1/sessions")
-def list_user_sessions(user=Depends(get_current_user)):
-    """List all sessions for the current user."""
+async def list_user_sessions(
+    request: Request,
+    page: Optional[int] = None,
+    page_size: int = 10,
+    user=Depends(get_current_user)
+):
+    """List sessions for the current user.
+    
+    Without page, all sessions are returned; with page (1-indexed) only
+    that page is built and a Link header points at the other pages.
+    """
     try:
         user_sessions = session_repo.get_by_user(user["user_id"])
+        headers = {}
+        
+        if page is not None:
+            if page < 1 or page_size < 1:
+                raise HTTPException(status_code=400, detail="page and page_size must be at least 1")
+            total = len(user_sessions)
+            start = (page - 1) * page_size
+            user_sessions = user_sessions[start:start + page_size]
+            base_url = str(request.url).split('?')[0]
+            headers["Link"] = build_link_header(
+                base_url=base_url,
+                page=page,
+                page_size=page_size,
+                total_items=total
+            )
         
-        # Add game counts for each session
+        # Add game counts for each session (read-only views, nothing copied)
         result = []
         for session in user_sessions:
-            session_games = game_repo.get_by_session(session["session_id"])
-            finished = sum(1 for g in session_games if g["status"] in ["WON", "LOST", "ABORTED"])
+            session_games = game_repo.get_by_sessions([session["session_id"]])
+            finished = sum(1 for g in session_games if g["status"] in FINISHED_STATUSES)
             result.append({
                 **session,
                 "games_created": len(session_games),
                 "games_finished": finished
             })
         
-        return result
+        # Serialize the list in one orjson call (skips jsonable_encoder)
+        return UTCORJSONResponse(result, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error listing sessions: {e}")
+        logger.error("Error listing sessions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/v1/sessions", status_code=201)
-def create_session(req: CreateSessionRequest, request: Request, user=Depends(get_current_user)):
+async def create_session(req: CreateSessionRequest, request: Request, user=Depends(get_current_user)):
     """
     Create a new game session.
     
     Supports idempotency via Idempotency-Key header.
     """
-    from .utils.idempotency import _idempotency_store
-    import hashlib
-    
     # Check for idempotency key
     idempotency_key = request.headers.get("Idempotency-Key")
     
@@ -593,43 +798,38 @@ def create_session(req: CreateSessionRequest, request: Request, user=Depends(get
         # Check if already processed
         if composite_key in _idempotency_store:
             cached_result, timestamp = _idempotency_store[composite_key]
-            from datetime import datetime, timedelta
             if datetime.utcnow() - timestamp < timedelta(hours=24):
-                logger.info(f"Idempotency replay: key={idempotency_key}, endpoint=create_session")
+                logger.info("Idempotency replay: key=%s, endpoint=create_session", idempotency_key)
                 return cached_result
     
     # Execute normally
-    try:
-        result = session_service.create_session(
-            user_id=user["user_id"],
-            num_games=req.num_games,
-            dictionary_id=req.dictionary_id,
-            difficulty=req.difficulty,
-            language=req.language,
-            max_misses=req.max_misses,
-            allow_word_guess=req.allow_word_guess,
-            seed=req.seed
-        )
-        
-        # Store result if idempotency key was provided
-        if idempotency_key:
-            from datetime import datetime
-            _idempotency_store[composite_key] = (result, datetime.utcnow())
-        
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    result = session_service.create_session(
+        user_id=user["user_id"],
+        num_games=req.num_games,
+        dictionary_id=req.dictionary_id,
+        difficulty=req.difficulty,
+        language=req.language,
+        max_misses=req.max_misses,
+        allow_word_guess=req.allow_word_guess,
+        seed=req.seed
+    )
+    
+    # Store result if idempotency key was provided
+    if idempotency_key:
+        _idempotency_store[composite_key] = (result, datetime.utcnow())
+    
+    return result
 
 
 @app.get("/api/v1/sessions/{session_id}")
-def get_session(session_id: str, user=Depends(get_current_user)):
+async def get_session(session_id: str, user=Depends(get_current_user)):
     """Get session details."""
     try:
         session = session_service.get_session(session_id, user["user_id"])
         
         # Add game counts
         session_games = game_repo.get_by_session(session_id)
-        finished = sum(1 for g in session_games if g["status"] in ["WON", "LOST", "ABORTED"])
+        finished = sum(1 for g in session_games if g["status"] in FINISHED_STATUSES)
         
         return {
             **session,
@@ -638,33 +838,24 @@ def get_session(session_id: str, user=Depends(get_current_user)):
         }
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 @app.post("/api/v1/sessions/{session_id}/abort")
-def abort_session(session_id: str, user=Depends(get_current_user)):
+async def abort_session(session_id: str, user=Depends(get_current_user)):
     """Abort a session."""
     try:
         result = session_service.abort_session(session_id, user["user_id"])
         
         # Abort all IN_PROGRESS games in session
-        for game in game_repo.get_by_session(session_id):
-            if game["status"] == "IN_PROGRESS":
-                game_repo.update(game["game_id"], {
-                    "status": "ABORTED",
-                    "updated_at": datetime.utcnow().isoformat() + "Z"
-                })
+        game_service.abort_session_games(session_id)
         
         return {"session_id": session_id, "status": "ABORTED", "message": "Session aborted successfully"}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 @app.get("/api/v1/sessions/{session_id}/games")
-def list_session_games(
+async def list_session_games(
     request: Request,
     session_id: str,
     page: int = 1,
@@ -672,9 +863,6 @@ def list_session_games(
     user=Depends(get_current_user)
 ):
     """List games in a session with pagination."""
-    from .utils.pagination import build_link_header
-    from fastapi.responses import JSONResponse
-    
     try:
         result = game_service.list_session_games(session_id, user["user_id"], page, page_size)
         
@@ -687,19 +875,13 @@ def list_session_games(
             total_items=result.get("total", 0)
         )
         
-        # Create response with Link header
-        return JSONResponse(
-            content=result,
-            headers={"Link": link_header}
-        )
+        return UTCORJSONResponse(result, headers={"Link": link_header})
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 @app.get("/api/v1/sessions/{session_id}/stats")
-def get_session_stats(session_id: str, user=Depends(get_current_user)):
+async def get_session_stats(session_id: str, user=Depends(get_current_user)):
     """Get statistics for a session."""
     try:
         # Verify session exists and user has access
@@ -709,7 +891,7 @@ def get_session_stats(session_id: str, user=Depends(get_current_user)):
         session_games = game_repo.get_by_session(session_id)
         
         # Filter finished games (won or lost, not aborted)
-        finished_games = [g for g in session_games if g["status"] in ["WON", "LOST"]]
+        finished_games = [g for g in session_games if g["status"] in SCORED_STATUSES]
         
         if not finished_games:
             return {
@@ -751,21 +933,17 @@ def get_session_stats(session_id: str, user=Depends(get_current_user)):
         }
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 # ============= GAME ENDPOINTS =============
 
 @app.post("/api/v1/sessions/{session_id}/games", status_code=201)
-def create_game(session_id: str, request: Request, user=Depends(get_current_user)):
+async def create_game(session_id: str, request: Request, user=Depends(get_current_user)):
     """
     Create a new game in a session.
     
     Supports idempotency via Idempotency-Key header.
     """
-    from .utils.idempotency import _idempotency_store
-    
     # Check for idempotency key
     idempotency_key = request.headers.get("Idempotency-Key")
     
@@ -776,101 +954,96 @@ def create_game(session_id: str, request: Request, user=Depends(get_current_user
         # Check if already processed
         if composite_key in _idempotency_store:
             cached_result, timestamp = _idempotency_store[composite_key]
-            from datetime import datetime, timedelta
             if datetime.utcnow() - timestamp < timedelta(hours=24):
-                logger.info(f"Idempotency replay: key={idempotency_key}, endpoint=create_game")
+                logger.info("Idempotency replay: key=%s, endpoint=create_game", idempotency_key)
                 return cached_result
     
     # Execute normally
-    try:
-        result = game_service.create_game(session_id, user["user_id"])
-        
-        # Store result if idempotency key was provided
-        if idempotency_key:
-            from datetime import datetime
-            _idempotency_store[composite_key] = (result, datetime.utcnow())
-        
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
+    result = game_service.create_game(session_id, user["user_id"])
+    
+    # Store result if idempotency key was provided
+    if idempotency_key:
+        _idempotency_store[composite_key] = (result, datetime.utcnow())
+    
+    return result
 
 
 @app.get("/api/v1/sessions/{session_id}/games/{game_id}/state")
-def get_game_state(session_id: str, game_id: str, user=Depends(get_current_user)):
+async def get_game_state(session_id: str, game_id: str, user=Depends(get_current_user)):
     """Get current game state."""
     try:
         game = game_service.get_game(game_id, user["user_id"])
         return game
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 @app.post("/api/v1/sessions/{session_id}/games/{game_id}/guess")
-def make_guess(session_id: str, game_id: str, req: GuessRequest, user=Depends(get_current_user)):
+async def make_guess(session_id: str, game_id: str, req: GuessRequest, user=Depends(get_current_user)):
     """Make a guess (letter or word)."""
-    try:
-        if req.letter:
-            result = game_service.make_guess_letter(game_id, req.letter, user["user_id"])
-        elif req.word:
-            result = game_service.make_guess_word(game_id, req.word, user["user_id"])
-        else:
-            raise HTTPException(status_code=400, detail="Must provide letter or word")
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
+    if req.letter:
+        return game_service.make_guess_letter(game_id, req.letter, user["user_id"])
+    if req.word:
+        return game_service.make_guess_word(game_id, req.word, user["user_id"])
+    raise HTTPException(status_code=400, detail="Must provide letter or word")
 
 
 @app.get("/api/v1/sessions/{session_id}/games/{game_id}/history")
-def get_game_history(session_id: str, game_id: str, user=Depends(get_current_user)):
+async def get_game_history(session_id: str, game_id: str, user=Depends(get_current_user)):
     """Get guess history for a game."""
     try:
         result = game_service.get_game_history(game_id, user["user_id"])
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 @app.post("/api/v1/sessions/{session_id}/games/{game_id}/abort")
-def abort_game(session_id: str, game_id: str, user=Depends(get_current_user)):
+async def abort_game(session_id: str, game_id: str, user=Depends(get_current_user)):
     """Abort a game."""
     try:
         result = game_service.abort_game(game_id, user["user_id"])
         return {"game_id": game_id, "status": "ABORTED", "message": "Game aborted successfully"}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except PermissionError as e:
-        raise HTTPException(status_code=403, detail=str(e))
 
 
 # ============= STATISTICS ENDPOINTS =============
 
 @app.get("/api/v1/users/{user_id}/stats")
-def get_user_stats(user_id: str, period: str = "all", current_user=Depends(get_current_user)):
+async def get_user_stats(user_id: str, period: str = "all", current_user_id: str = Depends(get_current_user_id)):
     """Get user statistics."""
-    if user_id != current_user["user_id"]:
+    # Ownership check needs only the token; no repository access before it
+    if user_id != current_user_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    result = stats_service.get_user_stats(user_id, period)
-    return result
+    return await _cached(
+        ("user_stats", user_id, period, _stats_version()),
+        lambda: stats_service.get_user_stats(user_id, period),
+        ttl_seconds=USER_STATS_CACHE_TTL,
+        offload=not stats_service.uses_materialized(period)
+    )
 
 
 @app.get("/api/v1/stats/global")
-def get_global_stats(period: str = "all"):
+async def get_global_stats(request: Request, response: Response, period: str = "all"):
     """Get global statistics."""
-    result = stats_service.get_global_stats(period)
-    return result
+    etag = _stats_etag(period)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    response.headers.update(_cache_headers(etag))
+    return await _cached(
+        ("global_stats", period, _stats_version()),
+        lambda: stats_service.get_global_stats(period),
+        ttl_seconds=GLOBAL_STATS_CACHE_TTL,
+        offload=not stats_service.uses_materialized(period)
+    )
 
 
 @app.get("/api/v1/leaderboard")
-def get_leaderboard(
+async def get_leaderboard(
     request: Request,
     metric: str = "composite_score",
     period: str = "all",
@@ -878,23 +1051,23 @@ def get_leaderboard(
     page: int = 1
 ):
     """Get leaderboard with pagination support."""
-    from .utils.pagination import build_link_header
-    from fastapi.responses import JSONResponse
+    etag = _stats_etag(period, metric, page, limit)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     
     # Calculate offset for pagination
     page_size = limit
     offset = (page - 1) * page_size
     
-    # Get leaderboard entries (limit + 1 to check if there are more)
-    result = stats_service.get_leaderboard(metric, period, page_size + 1)
-    
-    # Check if there are more entries
-    has_more = len(result) > page_size
-    entries = result[:page_size] if has_more else result
-    
-    # For leaderboard, we estimate total based on what we know
-    # In production, you'd want to get actual total from stats_service
-    estimated_total = offset + len(entries) + (1 if has_more else 0)
+    # Get exactly this page plus the number of ranked players
+    entries, total = await _cached(
+        ("leaderboard", metric, period, page_size, offset, _stats_version()),
+        lambda: stats_service.get_leaderboard_page(metric, period, page_size, offset),
+        ttl_seconds=LEADERBOARD_CACHE_TTL,
+        offload=not stats_service.uses_materialized(period)
+    )
+    has_more = offset + len(entries) < total
     
     response_data = {
         "entries": entries,
@@ -902,6 +1075,7 @@ def get_leaderboard(
         "period": period,
         "page": page,
         "page_size": page_size,
+        "total": total,
         "has_more": has_more
     }
     
@@ -911,63 +1085,49 @@ def get_leaderboard(
         base_url=base_url,
         page=page,
         page_size=page_size,
-        total_items=estimated_total,
+        total_items=total,
         query_params={"metric": metric, "period": period}
     )
     
-    return JSONResponse(
-        content=response_data,
-        headers={"Link": link_header}
-    )
+    return UTCORJSONResponse(response_data, headers={"Link": link_header, **_cache_headers(etag)})
 
 
 # ============= ADMIN ENDPOINTS =============
 
 @app.get("/api/v1/admin/stats")
-def get_admin_stats(admin=Depends(get_admin_user)):
+async def get_admin_stats(admin=Depends(get_admin_user)):
     """Get comprehensive admin dashboard statistics (admin only)."""
-    result = stats_service.get_admin_stats()
+    # Uncached full scan of every table - keep it off the event loop
+    result = await run_in_threadpool(stats_service.get_admin_stats)
     return result
 
 
 @app.get("/api/v1/admin/dictionaries")
-def list_dictionaries(admin=Depends(get_admin_user)):
+async def list_dictionaries(admin=Depends(get_admin_user)):
     """List all dictionaries (admin only)."""
-    result = dict_service.list_dictionaries(active_only=False)
-    return {"dictionaries": result}
+    if _dict_cache_version != dict_repo.version:
+        # Not preloaded yet, or written to outside the admin endpoints
+        _load_dict_cache()
+    return {"dictionaries": list(_DICT_CACHE.values())}
 
 
 @app.post("/api/v1/admin/dictionaries", status_code=201)
-def create_dictionary(
-    name: str,
-    words: list[str],
-    description: Optional[str] = None,
-    language: str = "ro",
-    difficulty: str = "auto",
-    admin=Depends(get_admin_user)
-):
+async def create_dictionary(req: DictionaryCreate, admin=Depends(get_admin_user)):
     """Create a new dictionary (admin only)."""
-    try:
-        # Generate dict_id from name (slugified)
-        import re
-        dict_id = "dict_" + re.sub(r'[^a-z0-9_]', '_', name.lower().replace(' ', '_'))
-        
-        dict_data = {
-            "dict_id": dict_id,
-            "name": name,
-            "words": words,
-            "description": description,
-            "language": language,
-            "difficulty": difficulty
-        }
-        result = dict_service.create_dictionary(dict_data)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    # Generate dict_id from name (slugified)
+    dict_id = "dict_" + _SLUG_RE.sub('_', req.name.lower().replace(' ', '_'))
+    
+    dict_data = {"dict_id": dict_id, **req.model_dump()}
+    async with _dict_cache_lock:
+        version_before = dict_repo.version
+        # Word cleaning/deduplication is CPU-bound; keep it off the event loop
+        result = await run_in_threadpool(dict_service.create_dictionary, dict_data)
+        _write_dict_cache(result["dictionary_id"], result, version_before)
+    return result
 
 
 @app.patch("/api/v1/admin/dictionaries/{dictionary_id}")
-def update_dictionary(
+async def update_dictionary(
     dictionary_id: str,
     name: Optional[str] = None,
     description: Optional[str] = None,
@@ -984,17 +1144,23 @@ def update_dictionary(
         if active is not None:
             updates["active"] = active
         
-        result = dict_service.update_dictionary(dictionary_id, updates)
+        async with _dict_cache_lock:
+            version_before = dict_repo.version
+            result = dict_service.update_dictionary(dictionary_id, updates)
+            _write_dict_cache(dictionary_id, result, version_before)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @app.delete("/api/v1/admin/dictionaries/{dictionary_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_dictionary(dictionary_id: str, admin=Depends(get_admin_user)):
+async def delete_dictionary(dictionary_id: str, admin=Depends(get_admin_user)):
     """Delete a dictionary (admin only). Cannot delete if in use by active sessions."""
     try:
-        dict_service.delete_dictionary(dictionary_id)
+        async with _dict_cache_lock:
+            version_before = dict_repo.version
+            dict_service.delete_dictionary(dictionary_id)
+            _write_dict_cache(dictionary_id, None, version_before)
         return None
     except DictionaryNotFoundException as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -1004,37 +1170,77 @@ def delete_dictionary(dictionary_id: str, admin=Depends(get_admin_user)):
 
 
 @app.get("/api/v1/admin/dictionaries/{dictionary_id}/words")
-def get_dictionary_words(dictionary_id: str, sample: Optional[int] = None, admin=Depends(get_admin_user)):
-    """Get words from a dictionary (admin only)."""
+async def get_dictionary_words(dictionary_id: str, sample: Optional[int] = None, admin=Depends(get_admin_user)):
+    """Get words from a dictionary (admin only).
+    
+    The word list is streamed in WORDS_STREAM_BATCH-sized JSON chunks so
+    large dictionaries are never serialized into one buffer.
+    """
     try:
         result = dict_service.get_dictionary_words(dictionary_id, sample)
-        return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    
+    return StreamingResponse(_stream_words(result), media_type="application/json")
+
+
+def _stream_words(result: dict):
+    """Yield the get_dictionary_words payload as JSON, word list in batches."""
+    words = result["words"]
+    header = {k: v for k, v in result.items() if k != "words"}
+    # Reopen the header object and append the "words" array to it
+    yield orjson.dumps(header)[:-1] + b',"words":['
+    for start in range(0, len(words), WORDS_STREAM_BATCH):
+        chunk = orjson.dumps(words[start:start + WORDS_STREAM_BATCH])[1:-1]
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]}"
 
 
 # ============= STARTUP/SHUTDOWN =============
 
+async def _refresh_leaderboard_periodically():
+    """Rebuild the materialized leaderboard from the games table once a day."""
+    while True:
+        await asyncio.sleep(LEADERBOARD_REFRESH_INTERVAL)
+        try:
+            # One batch of games per loop iteration, so requests keep being
+            # served while the table is rebuilt
+            games = 0
+            for games in stats_service.rebuild_leaderboard_steps():
+                await asyncio.sleep(0)
+            logger.info("Leaderboard rebuilt from %s finished games", games)
+        except Exception as e:
+            logger.error("Leaderboard rebuild failed: %s", e)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Log configuration on startup."""
     logger.info("=" * 60)
     logger.info("Hangman Server Starting")
     logger.info("=" * 60)
-    logger.info(f"Debug Mode: {settings.debug}")
-    logger.info(f"Server: {settings.server_host}:{settings.server_port}")
-    logger.info(f"CORS Origins: {settings.get_cors_origins_list()}")
-    logger.info(f"JWT Algorithm: {settings.jwt_algorithm}")
-    logger.info(f"Token Expiry: {settings.access_token_expire_minutes} minutes")
-    logger.info(f"Max Sessions/User: {settings.max_sessions_per_user}")
-    logger.info(f"Max Games/Session: {settings.max_games_per_session}")
-    logger.info(f"Log Level: {settings.log_level}")
+    logger.info("Debug Mode: %s", settings.debug)
+    logger.info("Server: %s:%s", settings.server_host, settings.server_port)
+    logger.info("CORS Origins: %s", settings.get_cors_origins_list())
+    logger.info("JWT Algorithm: %s", settings.jwt_algorithm)
+    logger.info("Token Expiry: %s minutes", settings.access_token_expire_minutes)
+    logger.info("Max Sessions/User: %s", settings.max_sessions_per_user)
+    logger.info("Max Games/Session: %s", settings.max_games_per_session)
+    logger.info("Log Level: %s", settings.log_level)
     logger.info("=" * 60)
+    
+    _load_dict_cache()
+    start_hash_pool(settings.password_hash_workers)
+    app.state.leaderboard_refresh_task = asyncio.create_task(_refresh_leaderboard_periodically())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown."""
+    refresh_task = getattr(app.state, "leaderboard_refresh_task", None)
+    if refresh_task:
+        refresh_task.cancel()
+    shutdown_hash_pool()
     logger.info("Hangman Server Shutting Down")
 
 
@@ -1043,20 +1249,36 @@ async def shutdown_event():
 if __name__ == "__main__":
     import uvicorn
     
-    # Prepare uvicorn configuration
+    import sys
+    
+    # Prepare uvicorn configuration (uvloop/httptools come with uvicorn[standard];
+    # uvloop does not support Windows)
     uvicorn_config = {
         "app": app,
         "host": settings.server_host,
         "port": settings.server_port,
-        "log_level": settings.log_level.lower()
+        "log_level": settings.log_level.lower(),
+        "loop": "asyncio" if sys.platform == "win32" else "uvloop",
+        "http": "httptools"
     }
     
+    if settings.server_workers > 1:
+        # Users, sessions, games, reset tokens, idempotency keys and rate limit
+        # buckets all live in process memory, so a token issued by one worker
+        # would 401/404 on another
+        logger.error(
+            "SERVER_WORKERS=%s is not supported: all state is kept in process "
+            "memory and is not shared between workers - refusing to start",
+            settings.server_workers
+        )
+        sys.exit(1)
+    
     # Add SSL/TLS configuration if enabled
     if settings.ssl_enabled:
         if settings.ssl_keyfile and settings.ssl_certfile:
             uvicorn_config["ssl_keyfile"] = settings.ssl_keyfile
             uvicorn_config["ssl_certfile"] = settings.ssl_certfile
-            logger.info(f"✓ TLS enabled: keyfile={settings.ssl_keyfile}, certfile={settings.ssl_certfile}")
+            logger.info("✓ TLS enabled: keyfile=%s, certfile=%s", settings.ssl_keyfile, settings.ssl_certfile)
         else:
             logger.warning("⚠ SSL_ENABLED=True but ssl_keyfile or ssl_certfile not set. Running without TLS.")
     
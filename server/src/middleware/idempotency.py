@@ -1,63 +1,103 @@
 """Idempotency middleware for handling Idempotency-Key header."""
 
 import hashlib
+import heapq
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import threading
+import time
+import xxhash
+from typing import Dict, Any, List, Optional, Tuple
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
-from starlette.background import BackgroundTask
+from starlette.responses import Response, JSONResponse, StreamingResponse
+from starlette.background import BackgroundTasks
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Largest response body kept for replay; bigger responses are streamed through
+# without being stored
+MAX_IDEMPOTENT_BODY = 256 * 1024
+
 
 class IdempotencyStore:
     """In-memory store for idempotency keys and responses.
     
+    Entries expire at a time.monotonic() deadline. Deadlines are also kept in
+    a min-heap, so cleanup only pops the entries that actually expired
+    instead of scanning the whole store.
+    
+    Thread safety: get() is lock-free. It does one dict.get() (atomic under
+    the GIL) and never mutates the store; expired entries it sees are just
+    treated as missing and are removed later by cleanup. set() and
+    cleanup_expired() update the dict and the heap together, so they hold
+    a lock.
+    
     In production, this should be replaced with Redis or similar distributed cache.
     """
     
     def __init__(self, ttl_hours: int = 24):
         self._store: Dict[str, Dict[str, Any]] = {}
+        # (deadline, key) min-heap; entries for overwritten keys are skipped
+        self._expiry: List[Tuple[float, str]] = []
         self.ttl_hours = ttl_hours
+        self._ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
     
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get stored response for idempotency key."""
-        if key in self._store:
-            entry = self._store[key]
-            # Check if expired
-            expires_at = datetime.fromisoformat(entry["expires_at"])
-            if datetime.utcnow() < expires_at:
-                return entry
-            else:
-                # Clean up expired entry
-                del self._store[key]
+        entry = self._store.get(key)
+        if entry is not None and time.monotonic() < entry["expires_at"]:
+            return entry
         return None
     
-    def set(self, key: str, status_code: int, body: bytes, headers: Dict[str, str]):
-        """Store response for idempotency key."""
-        expires_at = datetime.utcnow() + timedelta(hours=self.ttl_hours)
-        self._store[key] = {
-            "status_code": status_code,
-            "body": body,
-            "headers": headers,
-            "expires_at": expires_at.isoformat()
-        }
-        logger.debug(f"Stored idempotency key: {key[:16]}... (expires: {expires_at})")
+    def set(self, key: str, status_code: int, body: bytes, headers: Tuple[Tuple[bytes, bytes], ...]):
+        """Store response for idempotency key (headers as raw name/value byte pairs)."""
+        with self._lock:
+            self._cleanup_expired()
+            expires_at = time.monotonic() + self._ttl_seconds
+            self._store[key] = {
+                "status_code": status_code,
+                "body": body,
+                "headers": headers,
+                "expires_at": expires_at
+            }
+            heapq.heappush(self._expiry, (expires_at, key))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Stored idempotency key: %s... (ttl: %sh)", key[:16], self.ttl_hours)
     
     def cleanup_expired(self):
         """Remove expired entries from store."""
-        now = datetime.utcnow()
-        expired_keys = [
-            key for key, entry in self._store.items()
-            if datetime.fromisoformat(entry["expires_at"]) < now
-        ]
-        for key in expired_keys:
-            del self._store[key]
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired idempotency keys")
+        with self._lock:
+            self._cleanup_expired()
+    
+    def _cleanup_expired(self):
+        now = time.monotonic()
+        expiry = self._expiry
+        removed = 0
+        while expiry and expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(expiry)
+            entry = self._store.get(key)
+            # Only drop the key if it was not stored again with a later deadline
+            if entry is not None and entry["expires_at"] == expires_at:
+                del self._store[key]
+                removed += 1
+        if removed:
+            logger.info("Cleaned up %s expired idempotency keys", removed)
+
+
+# Request body hashers, fed chunk by chunk and truncated to 16 hex chars.
+# The Idempotency-Key and user already scope the entry, so a fast
+# non-cryptographic hash is enough; sha256 stays available for deployments
+# that only allow approved hashes.
+_BODY_HASHERS = {
+    "xxh128": xxhash.xxh3_128,
+    "sha256": hashlib.sha256,
+}
+
+
+_STORED_HEADER = (b"x-idempotent-stored", b"true")
+_REPLAY_HEADER = (b"x-idempotent-replay", b"true")
 
 
 class IdempotencyMiddleware(BaseHTTPMiddleware):
@@ -71,10 +111,16 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
     GET and HEAD requests are naturally idempotent and don't need this.
     """
     
-    def __init__(self, app, ttl_hours: int = 24):
+    def __init__(
+        self, app, ttl_hours: int = 24,
+        body_hash: Optional[str] = None, max_request_body: Optional[int] = None
+    ):
         super().__init__(app)
         self.store = IdempotencyStore(ttl_hours=ttl_hours)
         self.idempotent_methods = {"POST", "PATCH", "DELETE"}
+        from ..config import settings
+        self._hasher = _BODY_HASHERS[body_hash or settings.idempotency_body_hash]
+        self.max_request_body = max_request_body or settings.idempotency_max_request_body
     
     async def dispatch(self, request: Request, call_next):
         """Process request with idempotency handling."""
@@ -112,74 +158,120 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
         if hasattr(request.state, "user"):
             user_id = request.state.user.get("user_id", "anonymous")
         
-        # Read request body for fingerprinting
-        body = await request.body()
-        body_hash = hashlib.sha256(body).hexdigest()[:16]
+        # Hash the request body as it streams in, refusing oversized bodies
+        body_hash = await self._hash_body(request)
+        if body_hash is None:
+            return JSONResponse(
+                status_code=413,
+                content={
+                    "error": {
+                        "code": "IDEMPOTENT_BODY_TOO_LARGE",
+                        "message": f"Requests with an Idempotency-Key are limited to {self.max_request_body} bytes"
+                    }
+                }
+            )
         
         composite_key = f"{request.method}:{request.url.path}:{idempotency_key}:{user_id}:{body_hash}"
         
         # Check if we have a stored response
         stored = self.store.get(composite_key)
         if stored:
-            logger.info(f"Returning stored response for idempotency key: {idempotency_key[:16]}...")
-            # Return stored response
-            return Response(
-                content=stored["body"],
-                status_code=stored["status_code"],
-                headers={
-                    **stored["headers"],
-                    "X-Idempotent-Replay": "true"
-                }
-            )
+            logger.info("Returning stored response for idempotency key: %s...", idempotency_key[:16])
+            # Return stored response; its raw headers are reused as-is
+            replay = Response(content=stored["body"], status_code=stored["status_code"])
+            replay.raw_headers = [*stored["headers"], *replay.raw_headers, _REPLAY_HEADER]
+            return replay
         
         # Process request normally
         response = await call_next(request)
         
         # For successful responses (2xx, 3xx), store them for idempotency
         if 200 <= response.status_code < 400:
-            try:
-                # Try to capture response body
-                response_body = b""
-                
-                # For responses with body attribute (JSONResponse, etc)
-                if hasattr(response, 'body'):
-                    response_body = response.body
-                # For streaming responses
-                elif hasattr(response, 'body_iterator'):
-                    chunks = []
-                    async for chunk in response.body_iterator:
-                        if isinstance(chunk, bytes):
-                            chunks.append(chunk)
-                        elif isinstance(chunk, str):
-                            chunks.append(chunk.encode('utf-8'))
-                    response_body = b"".join(chunks)
-                
-                if response_body:
-                    # Store the response
-                    response_headers = dict(response.headers)
-                    response_headers.pop("content-length", None)  # Will be recalculated
-                    
-                    self.store.set(
-                        composite_key,
-                        response.status_code,
-                        response_body,
-                        response_headers
-                    )
-                    
-                    # Return a new response with the captured body
-                    return Response(
-                        content=response_body,
-                        status_code=response.status_code,
-                        headers={
-                            **response_headers,
-                            "X-Idempotent-Stored": "true"
-                        },
-                        media_type=getattr(response, 'media_type', None)
-                    )
-            except Exception as e:
-                # If we can't capture the body, log and return original response
-                logger.warning(f"Could not capture response body for idempotency: {e}")
-                return response
-        
-        # Don't store error responses (4xx, 5xx) or if capture failed
+            return self._tee_response(composite_key, response)
+        
+        # Don't store error responses (4xx, 5xx)
         return response
+    
+    async def _hash_body(self, request: Request) -> Optional[str]:
+        """Read and fingerprint the request body, or None if it is too large.
+        
+        The body is read chunk by chunk and reading stops as soon as it
+        passes max_request_body, so oversized uploads are never fully
+        buffered. The read body is then replayed to the endpoint.
+        """
+        declared = request.headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_request_body:
+            return None
+        
+        hasher = self._hasher()
+        chunks = []
+        total = 0
+        async for chunk in request.stream():
+            total += len(chunk)
+            if total > self.max_request_body:
+                return None
+            hasher.update(chunk)
+            chunks.append(chunk)
+        body = b"".join(chunks)
+        request._body = body
+        
+        # call_next reads the body through request.receive, which was drained
+        # above; hand the buffered body over once, then defer to the server
+        receive = request._receive
+        replayed = False
+        
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        
+        request._receive = replay_receive
+        return hasher.hexdigest()[:16]
+    
+    def _tee_response(self, composite_key: str, response: Response) -> Response:
+        """Stream the response to the client while capturing it for the store.
+        
+        Chunks are forwarded as they arrive and copied into a buffer that is
+        dropped once it grows past MAX_IDEMPOTENT_BODY. The body is stored by
+        a background task after the last chunk is sent, so only complete
+        responses are ever replayed.
+        """
+        declared = response.headers.get("content-length")
+        if declared is not None and int(declared) > MAX_IDEMPOTENT_BODY:
+            return response
+        
+        captured = bytearray()
+        state = {"complete": False, "overflow": False}
+        
+        async def tee():
+            async for chunk in response.body_iterator:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if not state["overflow"]:
+                    if len(captured) + len(chunk) > MAX_IDEMPOTENT_BODY:
+                        state["overflow"] = True
+                        captured.clear()
+                    else:
+                        captured.extend(chunk)
+                yield chunk
+            state["complete"] = True
+        
+        def store():
+            if state["complete"] and not state["overflow"] and captured:
+                # content-length is recalculated on replay
+                stored_headers = tuple(h for h in response.raw_headers if h[0] != b"content-length")
+                self.store.set(composite_key, response.status_code, bytes(captured), stored_headers)
+        
+        background = BackgroundTasks()
+        if response.background is not None:
+            background.add_task(response.background)
+        background.add_task(store)
+        
+        streamed = StreamingResponse(tee(), status_code=response.status_code, background=background)
+        streamed.raw_headers = list(response.raw_headers)
+        if declared is not None:
+            # Known to fit under the cap, so it is stored once fully sent
+            streamed.raw_headers.append(_STORED_HEADER)
+        return streamed
@@ -28,48 +28,50 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         request_id = getattr(request.state, "request_id", "unknown")
         
         # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Extract request info
         method = request.method
         path = request.url.path
-        query_params = str(request.query_params) if request.query_params else None
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
+        
+        # Only build the request/response log records if INFO is enabled
+        log_info = logger.isEnabledFor(logging.INFO)
         
         # Log incoming request
-        logger.info(
-            f"Request: {method} {path}",
-            extra={
-                "request_id": request_id,
-                "method": method,
-                "path": path,
-                "query_params": query_params,
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-                "event": "request_start"
-            }
-        )
+        if log_info:
+            logger.info(
+                "Request: %s %s", method, path,
+                extra={
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "query_params": request.url.query or None,
+                    "client_ip": request.client.host if request.client else "unknown",
+                    "user_agent": request.headers.get("user-agent", "unknown"),
+                    "event": "request_start"
+                }
+            )
         
         # Process request and handle errors
         try:
             response = await call_next(request)
             
             # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             
             # Log response
-            logger.info(
-                f"Response: {method} {path} - {response.status_code} ({duration_ms:.2f}ms)",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "path": path,
-                    "status_code": response.status_code,
-                    "duration_ms": duration_ms,
-                    "event": "request_end"
-                }
-            )
+            if log_info:
+                logger.info(
+                    "Response: %s %s - %s (%.2fms)", method, path, response.status_code, duration_ms,
+                    extra={
+                        "request_id": request_id,
+                        "method": method,
+                        "path": path,
+                        "status_code": response.status_code,
+                        "duration_ms": duration_ms,
+                        "event": "request_end"
+                    }
+                )
             
             # Add duration header for debugging
             response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
@@ -78,11 +80,11 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             # Calculate duration even for errors
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             
             # Log error
             logger.error(
-                f"Error: {method} {path} - {type(e).__name__}: {str(e)}",
+                "Error: %s %s - %s: %s", method, path, type(e).__name__, e,
                 extra={
                     "request_id": request_id,
                     "method": method,
@@ -2,71 +2,18 @@
 
 import time
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from collections import defaultdict
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
-from ..utils.auth_utils import decode_token
+from ..utils.auth_utils import decode_token_cached
+from .token_bucket import NS_PER_SECOND, TokenBucket
 
 logger = logging.getLogger(__name__)
 
-
-class TokenBucket:
-    """Token bucket for rate limiting."""
-    
-    def __init__(self, capacity: int, refill_rate: float):
-        """
-        Initialize token bucket.
-        
-        Args:
-            capacity: Maximum number of tokens
-            refill_rate: Tokens added per second
-        """
-        self.capacity = capacity
-        self.refill_rate = refill_rate
-        self.tokens = capacity
-        self.last_refill = time.time()
-    
-    def consume(self, tokens: int = 1) -> bool:
-        """
-        Try to consume tokens.
-        
-        Args:
-            tokens: Number of tokens to consume
-            
-        Returns:
-            True if tokens were consumed, False if insufficient tokens
-        """
-        self._refill()
-        
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True
-        return False
-    
-    def _refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
-        
-        # Add tokens based on elapsed time
-        tokens_to_add = elapsed * self.refill_rate
-        self.tokens = min(self.capacity, self.tokens + tokens_to_add)
-        self.last_refill = now
-    
-    def remaining(self) -> int:
-        """Get remaining tokens."""
-        self._refill()
-        return int(self.tokens)
-    
-    def reset_time(self) -> float:
-        """Get time until full refill in seconds."""
-        self._refill()
-        if self.tokens >= self.capacity:
-            return 0.0
-        tokens_needed = self.capacity - self.tokens
-        return tokens_needed / self.refill_rate
+# Paths that are never rate limited
+SKIP_PATHS = frozenset({"/healthz", "/docs", "/openapi.json", "/redoc"})
 
 
 class RateLimiterMiddleware(BaseHTTPMiddleware):
@@ -75,10 +22,19 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
     - 60 requests per minute per token (general rate limit)
     - 10 sessions per minute per user
     - 5 games per session per minute
+    
+    Buckets are kept in process memory like the rest of the application
+    state, which is why the server runs as a single worker. A shared store
+    (e.g. Redis) is needed before limits can span processes.
     """
     
-    def __init__(self, app):
+    # Most buckets kept per kind; the least recently used one is evicted
+    # past this, so unique tokens/IPs cannot grow memory without bound
+    MAX_BUCKETS = 100_000
+    
+    def __init__(self, app, max_buckets: Optional[int] = None):
         super().__init__(app)
+        self.max_buckets = max_buckets or self.MAX_BUCKETS
         
         # General rate limit: 60 requests/min per token
         self.general_buckets: Dict[str, TokenBucket] = {}
@@ -90,8 +46,8 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         self.game_buckets: Dict[str, TokenBucket] = {}
         
         # Cleanup old buckets periodically
-        self.last_cleanup = time.time()
-        self.cleanup_interval = 300  # 5 minutes
+        self.last_cleanup = time.monotonic_ns()
+        self.cleanup_interval = 300 * NS_PER_SECOND  # 5 minutes
     
     async def dispatch(self, request: Request, call_next):
         """Process request with rate limiting."""
@@ -104,7 +60,8 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
         
         # Skip rate limiting for health checks and docs
-        if request.url.path in ["/healthz", "/docs", "/openapi.json", "/redoc"]:
+        path = request.url.path
+        if path in SKIP_PATHS:
             return await call_next(request)
         
         # Extract token from Authorization header
@@ -115,39 +72,49 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         if auth_header.startswith("Bearer "):
             token = auth_header[7:]
             try:
-                payload = decode_token(token)
+                payload = decode_token_cached(token)
                 user_id = payload.get("user_id")
+                # Reused by the auth dependencies instead of decoding again
+                request.state.jwt_payload = payload
             except Exception:
                 pass  # Invalid token, will be handled by auth middleware
         
         # If no token, use IP address as identifier
         identifier = token if token else self._get_client_ip(request)
         
+        # One clock read shared by the limit checks
+        now_ns = time.monotonic_ns()
+        
         # Periodic cleanup of old buckets
-        self._cleanup_old_buckets()
+        self._cleanup_old_buckets(now_ns)
         
         # 1. Check general rate limit (60 req/min)
-        if not self._check_general_limit(identifier):
+        if not self._check_general_limit(identifier, now_ns):
             return self._rate_limit_response("General rate limit exceeded: 60 requests per minute")
         
-        # 2. Check session creation limit (10 sessions/min per user)
-        if request.method == "POST" and "/sessions" in request.url.path and "/games" not in request.url.path:
-            if user_id and not self._check_session_limit(user_id):
-                return self._rate_limit_response("Session creation rate limit exceeded: 10 sessions per minute")
-        
-        # 3. Check game creation limit (5 games/session/min)
-        if request.method == "POST" and "/games" in request.url.path:
-            session_id = self._extract_session_id(request.url.path)
-            if session_id and not self._check_game_limit(session_id):
-                return self._rate_limit_response("Game creation rate limit exceeded: 5 games per session per minute")
+        # Classify session/game POSTs from one split:
+        # /api/v1/sessions/{session_id}/games/...
+        if request.method == "POST":
+            parts = path.split("/", 6)
+            if len(parts) > 3 and parts[3] == "sessions":
+                if len(parts) > 5 and parts[5] == "games":
+                    # 3. Check game creation limit (5 games/session/min)
+                    session_id = parts[4]
+                    if session_id and not self._check_game_limit(session_id, now_ns):
+                        return self._rate_limit_response("Game creation rate limit exceeded: 5 games per session per minute")
+                # 2. Check session creation limit (10 sessions/min per user)
+                elif user_id and not self._check_session_limit(user_id, now_ns):
+                    return self._rate_limit_response("Session creation rate limit exceeded: 10 sessions per minute")
         
         # Process request
         response = await call_next(request)
         
-        # Add rate limit headers
+        # Add rate limit headers (fresh clock: other requests may have used
+        # the bucket while this one was being handled)
         if identifier:
-            remaining = self._get_remaining_tokens(identifier)
-            reset_time = self._get_reset_time(identifier)
+            now_ns = time.monotonic_ns()
+            remaining = self._get_remaining_tokens(identifier, now_ns)
+            reset_time = self._get_reset_time(identifier, now_ns)
             
             response.headers["X-RateLimit-Limit"] = "60"
             response.headers["X-RateLimit-Remaining"] = str(remaining)
@@ -155,42 +122,54 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         
         return response
     
-    def _check_general_limit(self, identifier: str) -> bool:
+    def _check_general_limit(self, identifier: str, now_ns: Optional[int] = None) -> bool:
         """Check general rate limit (60 req/min)."""
-        if identifier not in self.general_buckets:
-            # 60 requests per minute = 1 request per second
-            self.general_buckets[identifier] = TokenBucket(capacity=60, refill_rate=1.0)
-        
-        return self.general_buckets[identifier].consume(1)
+        # 60 requests per minute = 1 request per second
+        bucket = self._get_bucket(self.general_buckets, identifier, 60, 1.0, now_ns)
+        return bucket.consume(1, now_ns)
     
-    def _check_session_limit(self, user_id: str) -> bool:
+    def _check_session_limit(self, user_id: str, now_ns: Optional[int] = None) -> bool:
         """Check session creation limit (10 sessions/min per user)."""
         key = f"session:{user_id}"
-        if key not in self.session_buckets:
-            # 10 sessions per minute = 1 session per 6 seconds
-            self.session_buckets[key] = TokenBucket(capacity=10, refill_rate=10.0/60.0)
-        
-        return self.session_buckets[key].consume(1)
+        # 10 sessions per minute = 1 session per 6 seconds
+        bucket = self._get_bucket(self.session_buckets, key, 10, 10.0/60.0, now_ns)
+        return bucket.consume(1, now_ns)
     
-    def _check_game_limit(self, session_id: str) -> bool:
+    def _check_game_limit(self, session_id: str, now_ns: Optional[int] = None) -> bool:
         """Check game creation limit (5 games/session/min)."""
         key = f"game:{session_id}"
-        if key not in self.game_buckets:
-            # 5 games per minute = 1 game per 12 seconds
-            self.game_buckets[key] = TokenBucket(capacity=5, refill_rate=5.0/60.0)
-        
-        return self.game_buckets[key].consume(1)
-    
-    def _get_remaining_tokens(self, identifier: str) -> int:
+        # 5 games per minute = 1 game per 12 seconds
+        bucket = self._get_bucket(self.game_buckets, key, 5, 5.0/60.0, now_ns)
+        return bucket.consume(1, now_ns)
+    
+    def _get_bucket(
+        self, buckets: Dict[str, TokenBucket], key: str,
+        capacity: int, refill_rate: float, now_ns: Optional[int]
+    ) -> TokenBucket:
+        """Get (or create) a bucket and mark it most recently used.
+        
+        Dicts keep insertion order, so re-inserting on access keeps the
+        least recently used bucket first, where it is evicted in O(1) once
+        the dict holds max_buckets entries.
+        """
+        bucket = buckets.pop(key, None)
+        if bucket is None:
+            if len(buckets) >= self.max_buckets:
+                buckets.pop(next(iter(buckets)))
+            bucket = TokenBucket(capacity=capacity, refill_rate=refill_rate, now_ns=now_ns)
+        buckets[key] = bucket
+        return bucket
+    
+    def _get_remaining_tokens(self, identifier: str, now_ns: Optional[int] = None) -> int:
         """Get remaining tokens for identifier."""
         if identifier in self.general_buckets:
-            return self.general_buckets[identifier].remaining()
+            return self.general_buckets[identifier].remaining(now_ns)
         return 60
     
-    def _get_reset_time(self, identifier: str) -> float:
+    def _get_reset_time(self, identifier: str, now_ns: Optional[int] = None) -> float:
         """Get time until rate limit resets."""
         if identifier in self.general_buckets:
-            return self.general_buckets[identifier].reset_time()
+            return self.general_buckets[identifier].reset_time(now_ns)
         return 0.0
     
     def _get_client_ip(self, request: Request) -> str:
@@ -211,47 +190,36 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         
         return "unknown"
     
-    def _extract_session_id(self, path: str) -> str:
-        """Extract session ID from URL path."""
-        # Match pattern: /api/v1/sessions/{session_id}/games
-        parts = path.split("/")
-        try:
-            sessions_idx = parts.index("sessions")
-            if sessions_idx + 1 < len(parts):
-                return parts[sessions_idx + 1]
-        except (ValueError, IndexError):
-            pass
-        return ""
-    
-    def _cleanup_old_buckets(self):
+    def _cleanup_old_buckets(self, now_ns: Optional[int] = None):
         """Remove buckets that haven't been used recently."""
-        now = time.time()
+        now = time.monotonic_ns() if now_ns is None else now_ns
         
         if now - self.last_cleanup < self.cleanup_interval:
             return
         
-        # Remove buckets with full tokens (unused for a while)
+        # Remove buckets with full tokens (unused for a while), checked
+        # against one timestamp instead of refilling every bucket
         self.general_buckets = {
             k: v for k, v in self.general_buckets.items()
-            if v.remaining() < v.capacity
+            if not v.is_full(now)
         }
         
         self.session_buckets = {
             k: v for k, v in self.session_buckets.items()
-            if v.remaining() < v.capacity
+            if not v.is_full(now)
         }
         
         self.game_buckets = {
             k: v for k, v in self.game_buckets.items()
-            if v.remaining() < v.capacity
+            if not v.is_full(now)
         }
         
         self.last_cleanup = now
-        logger.debug(f"Cleaned up rate limiter buckets. Remaining: general={len(self.general_buckets)}, session={len(self.session_buckets)}, game={len(self.game_buckets)}")
+        logger.debug("Cleaned up rate limiter buckets. Remaining: general=%s, session=%s, game=%s", len(self.general_buckets), len(self.session_buckets), len(self.game_buckets))
     
     def _rate_limit_response(self, message: str) -> JSONResponse:
         """Return 429 rate limit response."""
-        logger.warning(f"Rate limit exceeded: {message}")
+        logger.warning("Rate limit exceeded: %s", message)
         
         return JSONResponse(
             status_code=429,
@@ -1,6 +1,6 @@
 """Request ID middleware for tracking requests."""
 
-import uuid
+import secrets
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
@@ -28,7 +28,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         
         # Generate a new ID if not provided
         if not request_id:
-            request_id = f"req_{uuid.uuid4().hex[:16]}"
+            request_id = f"req_{secrets.token_hex(8)}"
         
         # Store request ID in request state (accessible throughout the request)
         request.state.request_id = request_id
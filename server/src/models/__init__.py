@@ -1,7 +1,7 @@
 """Pydantic models for API requests and responses."""
 
 from .user import RegisterRequest, LoginRequest, RefreshRequest, UserResponse, ForgotPasswordRequest, ResetPasswordRequest, UpdateProfileRequest
-from .session import CreateSessionRequest, SessionResponse
+from .session import CreateSessionRequest, SessionParams, SessionResponse
 from .game import GuessRequest, GameResponse, GuessResponse
 from .dictionary import DictionaryCreate, DictionaryUpdate, DictionaryResponse
 from .stats import UserStats, GlobalStats, LeaderboardEntry
@@ -16,6 +16,7 @@ __all__ = [
     "UpdateProfileRequest",
     "UserResponse",
     "CreateSessionRequest",
+    "SessionParams",
     "SessionResponse",
     "GuessRequest",
     "GameResponse",
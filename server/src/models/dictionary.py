@@ -1,15 +1,19 @@
 """Dictionary-related Pydantic models."""
 
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Tuple
 
 
 class DictionaryCreate(BaseModel):
+    # Uploads can carry thousands of words; validate them into an immutable
+    # tuple that the service can consume without another copy
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     description: Optional[str] = None
     language: str = "ro"
     difficulty: str = "auto"
-    words: List[str]
+    words: Tuple[str, ...]
 
 
 class DictionaryUpdate(BaseModel):
@@ -19,6 +23,8 @@ class DictionaryUpdate(BaseModel):
 
 
 class DictionaryResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     dictionary_id: str
     name: str
     description: Optional[str] = None
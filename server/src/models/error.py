@@ -2,8 +2,8 @@
 
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
-from datetime import datetime
 from enum import Enum
+from ..utils.time_utils import now_iso_z
 
 
 class ErrorCode(str, Enum):
@@ -74,11 +74,13 @@ class ErrorResponse(BaseModel):
     ) -> "ErrorResponse":
         """Factory method to create error responses."""
         return cls(
-            error_code=error_code.value,
+            # _value_ is the plain attribute behind the .value property
+            error_code=error_code._value_,
             message=message,
             detail=detail,
             request_id=request_id,
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            # Second precision, formatted once per second under error bursts
+            timestamp=now_iso_z(),
             path=path
         )
     
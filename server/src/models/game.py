@@ -1,6 +1,6 @@
 """Game-related Pydantic models."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 
 
@@ -10,6 +10,8 @@ class GuessRequest(BaseModel):
 
 
 class GuessResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     guess_index: int
     type: str
     value: str
@@ -20,6 +22,8 @@ class GuessResponse(BaseModel):
 
 
 class GameResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     game_id: str
     session_id: str
     status: str
@@ -1,11 +1,19 @@
 """Session-related Pydantic models."""
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional, Literal
 from ..config import get_settings
 
 settings = get_settings()
 
+# Validation limits and their messages, resolved once at import
+_MAX_GAMES = settings.max_games_per_session
+_MAX_MISSES = 20
+_NUM_GAMES_TOO_LOW = "num_games must be at least 1"
+_NUM_GAMES_TOO_HIGH = f"num_games cannot exceed {_MAX_GAMES}"
+_MAX_MISSES_TOO_LOW = "max_misses must be at least 1"
+_MAX_MISSES_TOO_HIGH = f"max_misses cannot exceed {_MAX_MISSES}"
+
 
 class CreateSessionRequest(BaseModel):
     num_games: int = 100
@@ -20,26 +28,39 @@ class CreateSessionRequest(BaseModel):
     @classmethod
     def validate_num_games(cls, v: int) -> int:
         if v < 1:
-            raise ValueError("num_games must be at least 1")
-        if v > settings.max_games_per_session:
-            raise ValueError(f"num_games cannot exceed {settings.max_games_per_session}")
+            raise ValueError(_NUM_GAMES_TOO_LOW)
+        if v > _MAX_GAMES:
+            raise ValueError(_NUM_GAMES_TOO_HIGH)
         return v
     
     @field_validator("max_misses")
     @classmethod
     def validate_max_misses(cls, v: int) -> int:
         if v < 1:
-            raise ValueError("max_misses must be at least 1")
-        if v > 20:
-            raise ValueError("max_misses cannot exceed 20")
+            raise ValueError(_MAX_MISSES_TOO_LOW)
+        if v > _MAX_MISSES:
+            raise ValueError(_MAX_MISSES_TOO_HIGH)
         return v
 
 
+class SessionParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
+    dictionary_id: str
+    difficulty: str
+    language: str
+    max_misses: int
+    allow_word_guess: bool
+    seed: Optional[int] = None
+
+
 class SessionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     session_id: str
     user_id: str
     num_games: int
     dictionary_id: str
     status: str
     created_at: str
-    params: dict
+    params: SessionParams
@@ -1,10 +1,12 @@
 """Statistics-related Pydantic models."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
 class UserStats(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     user_id: str
     total_games: int
     games_won: int
@@ -18,6 +20,8 @@ class UserStats(BaseModel):
 
 
 class GlobalStats(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     total_users: int
     total_sessions: int
     total_games: int
@@ -29,6 +33,8 @@ class GlobalStats(BaseModel):
 
 
 class LeaderboardEntry(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     rank: int
     user_id: str
     nickname: Optional[str] = None
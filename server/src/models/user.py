@@ -1,6 +1,6 @@
 """User-related Pydantic models."""
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 from datetime import datetime
 
@@ -35,6 +35,8 @@ class UpdateProfileRequest(BaseModel):
 
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     user_id: str
     email: str
     nickname: Optional[str] = None
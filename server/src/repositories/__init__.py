@@ -4,10 +4,12 @@ from .user_repository import UserRepository
 from .session_repository import SessionRepository
 from .game_repository import GameRepository
 from .dictionary_repository import DictionaryRepository
+from .leaderboard_repository import LeaderboardRepository
 
 __all__ = [
     "UserRepository",
     "SessionRepository",
     "GameRepository",
     "DictionaryRepository",
+    "LeaderboardRepository",
 ]
@@ -1,49 +1,131 @@
 """Dictionary repository: in-memory dictionary storage."""
 
-from typing import Dict, Optional, List
-from datetime import datetime
+import logging
+import marshal
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, List, Tuple
 from pathlib import Path
+from ..utils.time_utils import now_iso_z
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DICTIONARY_PATH = Path(__file__).parent.parent / "dict_ro_basic.txt"
+
+
+def _parse_word_file(dict_path: Path) -> Tuple[str, ...]:
+    """Parse a word file: one word per line, lowercased, blank lines dropped."""
+    # Word lists are stored as tuples: shared read-only, never copied per game.
+    # Lowercase the whole text in one call, then split/strip/filter at C level.
+    # (Decoded first: bytes.lower() would leave diacritics like "Î" as is.)
+    with open(dict_path, encoding="utf-8") as f:
+        text = f.read().lower()
+    return tuple(filter(None, map(str.strip, text.splitlines())))
+
+
+def _read_cached_words(dict_path: Path) -> Tuple[str, ...]:
+    """Parse a word file, reusing a marshal cache written next to it.
+    
+    The cache is keyed by the source's mtime and size, so editing the word
+    file invalidates it. Cache errors are never fatal: the file is parsed.
+    """
+    src_stat = dict_path.stat()
+    key = (src_stat.st_mtime_ns, src_stat.st_size)
+    cache_path = dict_path.with_suffix(".cache")
+    try:
+        cached_key, words = marshal.loads(cache_path.read_bytes())
+        if cached_key == key and isinstance(words, tuple):
+            return words
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    words = _parse_word_file(dict_path)
+    try:
+        # Write to a temp file and rename so readers never see a partial cache
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump((key, words), f)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError as e:
+        logger.debug("Could not write dictionary cache %s: %s", cache_path, e)
+    return words
+
+
+@lru_cache(maxsize=None)
+def _load_words(dict_path: Path) -> Tuple[str, ...]:
+    """Read and parse a word file once per process (shared by all repositories)."""
+    if not dict_path.exists():
+        dict_path.write_text(
+            "student\nprogramare\ncomputer\npython\nserver\nclient\n"
+            "aplicatie\ndicționar\nîncercare\nstatistică"
+        )
+    return _read_cached_words(dict_path)
 
 
 class DictionaryRepository:
-    """Repository for dictionary data management."""
+    """Repository for dictionary data management.
+    
+    The default dictionary is loaded on first access rather than at
+    construction, so workers that never touch dictionaries skip the file read.
+    """
     
     def __init__(self):
         self._dictionaries: Dict[str, dict] = {}
-        self._initialize_default_dictionary()
+        # Bumped on every write; lets caches detect stale reads
+        self._version = 0
+        self._default_loaded = False
+        self._default_lock = threading.Lock()
+        
+    def _ensure_default(self):
+        """Load the default dictionary if it has not been loaded yet."""
+        if self._default_loaded:
+            return
+        with self._default_lock:
+            if not self._default_loaded:
+                self._initialize_default_dictionary()
+                self._default_loaded = True
         
     def _initialize_default_dictionary(self):
         """Initialize default Romanian dictionary."""
-        dict_path = Path(__file__).parent.parent / "dict_ro_basic.txt"
-        if not dict_path.exists():
-            dict_path.write_text(
-                "student\nprogramare\ncomputer\npython\nserver\nclient\n"
-                "aplicatie\ndicționar\nîncercare\nstatistică"
-            )
-        words = [w.strip().lower() for w in dict_path.read_text(encoding="utf-8").splitlines() if w.strip()]
-        
         self._dictionaries["dict_ro_basic"] = {
             "dictionary_id": "dict_ro_basic",
             "name": "Romanian Basic",
             "description": "Default Romanian word dictionary",
             "language": "ro",
             "difficulty": "auto",
-            "words": words,
+            "words": _load_words(DEFAULT_DICTIONARY_PATH),
             "active": True,
-            "created_at": datetime.utcnow().isoformat() + "Z"
+            "created_at": now_iso_z()
         }
         
+    @property
+    def version(self) -> int:
+        """Monotonic write counter for cache invalidation."""
+        return self._version
+        
     def create(self, dict_data: dict) -> dict:
         """Create a new dictionary."""
+        self._ensure_default()
         self._dictionaries[dict_data["dictionary_id"]] = dict_data
+        # Bumped after the write so a reader never caches old data under the new version
+        self._version += 1
         return dict_data
         
     def get_by_id(self, dictionary_id: str) -> Optional[dict]:
         """Get dictionary by ID."""
+        self._ensure_default()
         return self._dictionaries.get(dictionary_id)
         
     def get_all(self, active_only: bool = False) -> List[dict]:
         """Get all dictionaries."""
+        self._ensure_default()
         dicts = list(self._dictionaries.values())
         if active_only:
             return [d for d in dicts if d.get("active", True)]
@@ -51,18 +133,23 @@ class DictionaryRepository:
         
     def update(self, dictionary_id: str, updates: dict) -> Optional[dict]:
         """Update dictionary data."""
+        self._ensure_default()
         if dictionary_id in self._dictionaries:
             self._dictionaries[dictionary_id].update(updates)
+            self._version += 1
             return self._dictionaries[dictionary_id]
         return None
         
     def exists(self, dictionary_id: str) -> bool:
         """Check if dictionary exists."""
+        self._ensure_default()
         return dictionary_id in self._dictionaries
     
     def delete(self, dictionary_id: str) -> bool:
         """Delete dictionary by ID. Returns True if deleted, False if not found."""
+        self._ensure_default()
         if dictionary_id in self._dictionaries:
             del self._dictionaries[dictionary_id]
+            self._version += 1
             return True
         return False
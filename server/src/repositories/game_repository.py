@@ -1,7 +1,28 @@
 """Game repository: in-memory game storage."""
 
-from typing import Dict, Optional, List
-from copy import deepcopy
+import sys
+from itertools import islice
+from types import MappingProxyType
+from typing import Collection, Dict, Mapping, Optional, List, Set, Tuple
+
+
+# Game fields that services mutate in place; everything else is either
+# immutable or replaced wholesale on update
+_MUTABLE_GAME_FIELDS = ("guessed_letters", "wrong_letters", "_guessed_set")
+
+
+def _snapshot(game: dict) -> dict:
+    """Copy a game so callers can modify it without touching the stored one.
+    
+    A shallow dict copy plus copies of the in-place-mutated containers;
+    much cheaper than deepcopy, which walks every nested object.
+    """
+    copy = dict(game)
+    for field in _MUTABLE_GAME_FIELDS:
+        value = copy.get(field)
+        if value is not None:
+            copy[field] = value.copy()
+    return copy
 
 
 class GameRepository:
@@ -10,34 +31,109 @@ class GameRepository:
     def __init__(self):
         self._games: Dict[str, dict] = {}
         self._guesses: Dict[str, List[dict]] = {}
+        # session_id -> {game_id: game}, in creation order (secondary index)
+        self._by_session: Dict[str, Dict[str, dict]] = {}
+        # session_id -> secrets already used in that session
+        self._secrets_by_session: Dict[str, Set[str]] = {}
+        # Bumped after every write that changed something; lets caches detect
+        # stale reads
+        self._version = 0
+        
+    @property
+    def version(self) -> int:
+        """Monotonic write counter for cache invalidation."""
+        return self._version
         
     def create(self, game_data: dict) -> dict:
         """Create a new game."""
-        self._games[game_data["game_id"]] = game_data
-        self._guesses[game_data["game_id"]] = []
+        game_id = game_data["game_id"]
+        if game_id in self._games:
+            self._unindex(self._games[game_id])
+        # The session ID comes from the request path (a new string per call);
+        # intern it so all of a session's games share one object
+        game_data["session_id"] = sys.intern(game_data["session_id"])
+        self._games[game_id] = game_data
+        self._guesses[game_id] = []
+        self._by_session.setdefault(game_data["session_id"], {})[game_id] = game_data
+        if "secret" in game_data:
+            self._secrets_by_session.setdefault(game_data["session_id"], set()).add(game_data["secret"])
+        self._version += 1
         return game_data
         
+    def _unindex(self, game: dict):
+        """Remove a game from the per-session index."""
+        session_games = self._by_session.get(game["session_id"])
+        if session_games is not None:
+            session_games.pop(game["game_id"], None)
+            if not session_games:
+                del self._by_session[game["session_id"]]
+        if "secret" in game:
+            # Rebuild from the remaining games (another game may share the word)
+            remaining = {g["secret"] for g in (session_games or {}).values() if "secret" in g}
+            if remaining:
+                self._secrets_by_session[game["session_id"]] = remaining
+            else:
+                self._secrets_by_session.pop(game["session_id"], None)
+        
     def get_by_id(self, game_id: str) -> Optional[dict]:
         """Get game by ID."""
         game = self._games.get(game_id)
-        return deepcopy(game) if game else None
+        return _snapshot(game) if game else None
+        
+    def peek_by_id(self, game_id: str) -> Optional[Mapping]:
+        """Get a read-only view of a game without copying it."""
+        game = self._games.get(game_id)
+        return MappingProxyType(game) if game else None
         
     def get_by_session(self, session_id: str) -> List[dict]:
-        """Get all games for a session."""
-        return [deepcopy(g) for g in self._games.values() if g["session_id"] == session_id]
+        """Get all games for a session, oldest first.
+        
+        The per-session index is filled as games are created, so it is
+        already in creation order and callers never need to sort by created_at.
+        """
+        return [_snapshot(g) for g in self._by_session.get(session_id, {}).values()]
+        
+    def get_session_page(
+        self,
+        session_id: str,
+        offset: int,
+        limit: int,
+        exclude: Collection[str] = ()
+    ) -> Tuple[List[dict], int]:
+        """Get one page of a session's games (oldest first) as response views, plus the total.
+        
+        Only the requested page is copied, and fields in exclude are left
+        out while copying, so the caller needs no second filtering pass.
+        The copies are shallow: treat them as read-only.
+        """
+        session_games = self._by_session.get(session_id, {})
+        if offset < 0 or limit <= 0:
+            return [], len(session_games)
+        page = islice(session_games.values(), offset, offset + limit)
+        return [{k: v for k, v in g.items() if k not in exclude} for g in page], len(session_games)
+        
+    def get_by_sessions(self, session_ids: List[str]) -> List[dict]:
+        """Get all games for several sessions (shared references, read-only like get_all)."""
+        games = []
+        for session_id in session_ids:
+            games.extend(self._by_session.get(session_id, {}).values())
+        return games
+        
+    def get_used_secrets(self, session_id: str) -> Set[str]:
+        """Get the secret words already used in a session."""
+        return set(self._secrets_by_session.get(session_id, ()))
         
     def update(self, game_id: str, updates: dict) -> Optional[dict]:
         """Update game data."""
         if game_id in self._games:
             self._games[game_id].update(updates)
+            self._version += 1
             return self._games[game_id]
         return None
         
     def add_guess(self, game_id: str, guess_data: dict) -> dict:
         """Add a guess to a game."""
-        if game_id not in self._guesses:
-            self._guesses[game_id] = []
-        self._guesses[game_id].append(guess_data)
+        self._guesses.setdefault(game_id, []).append(guess_data)
         return guess_data
         
     def get_guesses(self, game_id: str) -> List[dict]:
@@ -55,19 +151,23 @@ class GameRepository:
     def delete(self, game_id: str) -> bool:
         """Delete game by ID. Returns True if deleted, False if not found."""
         if game_id in self._games:
-            del self._games[game_id]
+            self._unindex(self._games.pop(game_id))
             if game_id in self._guesses:
                 del self._guesses[game_id]
+            self._version += 1
             return True
         return False
     
     def delete_by_session(self, session_id: str) -> int:
         """Delete all games for a session. Returns number of games deleted."""
-        games_to_delete = [gid for gid, g in self._games.items() if g["session_id"] == session_id]
+        games_to_delete = list(self._by_session.pop(session_id, {}))
+        self._secrets_by_session.pop(session_id, None)
         for game_id in games_to_delete:
             del self._games[game_id]
             if game_id in self._guesses:
                 del self._guesses[game_id]
+        if games_to_delete:
+            self._version += 1
         return len(games_to_delete)
     
     def delete_by_user(self, user_id: str, session_ids: list) -> int:
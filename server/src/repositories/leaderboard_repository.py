@@ -0,0 +1,249 @@
+"""Leaderboard repository: precomputed per-user game aggregates."""
+
+import heapq
+from typing import Callable, Dict, Optional, List, Set
+
+
+def _ranked_games(row: dict) -> int:
+    return row["games_won"] + row["games_lost"]
+
+
+# Descending sort keys backing the per-metric leaderboard indexes
+SORT_KEYS = {
+    "total_score": lambda r: r["total_score"],
+    "win_rate": lambda r: (r["games_won"] / _ranked_games(r), _ranked_games(r)),
+    "total_games": _ranked_games,
+}
+
+
+class LeaderboardRepository:
+    """Repository for materialized leaderboard rows and global rollups.
+
+    Rows are updated when a game finishes (WON, LOST or ABORTED), so
+    all-time leaderboard and global stats reads never scan the games table.
+    Rows also carry the user's nickname (denormalized, see set_nickname) so
+    leaderboard pages need no per-entry user lookups.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, dict] = {}
+        self._totals = self._empty_totals()
+        # metric -> ranked rows (users with won/lost games), sorted descending;
+        # built on first read, then kept current by merging in changed rows
+        self._indexes: Dict[str, List[dict]] = {}
+        # Users whose ranking changed since the indexes were last merged
+        self._dirty: Set[str] = set()
+        # Row creation order, used to break ties like a stable sort would
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        # Number of ranked rows, kept current by every write
+        self._ranked_count = 0
+        # Writes made while a rebuild is in progress (None otherwise), and
+        # the IDs of games recorded among them
+        self._rebuild_log: Optional[List[tuple]] = None
+        self._rebuild_game_ids: Set[str] = set()
+        # Bumped whenever rows or totals change (a game finishes, a user is
+        # removed or renamed, a rebuild); guesses in unfinished games leave
+        # it alone
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Monotonic write counter for cache invalidation."""
+        return self._version
+
+    @staticmethod
+    def _empty_totals() -> dict:
+        return {
+            "games_won": 0,
+            "games_lost": 0,
+            "games_aborted": 0,
+            "total_time_sec": 0.0,
+            "total_sessions": 0
+        }
+
+    def record_game(self, user_id: str, game: dict) -> dict:
+        """Fold a finished game into the user's row and the global totals."""
+        if self._rebuild_log is not None:
+            self._rebuild_log.append(("record_game", user_id, game))
+            self._rebuild_game_ids.add(game.get("game_id"))
+        row = self._rows.get(user_id)
+        if row is None:
+            row = {
+                "user_id": user_id,
+                "games_won": 0,
+                "games_lost": 0,
+                "games_aborted": 0,
+                "total_score": 0.0,
+                "total_time_sec": 0.0,
+                "total_guesses": 0,
+                # Best non-zero score of a won/lost game (None until there is one)
+                "best_score": None,
+                "session_ids": set()
+            }
+            self._rows[user_id] = row
+            self._seq[user_id] = self._next_seq
+            self._next_seq += 1
+
+        status = game["status"]
+        if status == "ABORTED":
+            row["games_aborted"] += 1
+            self._totals["games_aborted"] += 1
+        else:
+            if not _ranked_games(row):
+                self._ranked_count += 1
+            key = "games_won" if status == "WON" else "games_lost"
+            row[key] += 1
+            self._totals[key] += 1
+            time_sec = game.get("time_seconds", 0)
+            score = game.get("composite_score", 0)
+            row["total_score"] += score
+            row["total_time_sec"] += time_sec
+            row["total_guesses"] += game.get("total_guesses", 0)
+            if score and (row["best_score"] is None or score > row["best_score"]):
+                row["best_score"] = score
+            self._totals["total_time_sec"] += time_sec
+            self._dirty.add(user_id)
+
+        if game["session_id"] not in row["session_ids"]:
+            row["session_ids"].add(game["session_id"])
+            self._totals["total_sessions"] += 1
+
+        self._version += 1
+        return row
+
+    def get(self, user_id: str) -> Optional[dict]:
+        """Get aggregate row for a user."""
+        return self._rows.get(user_id)
+
+    def get_all(self) -> List[dict]:
+        """Get all aggregate rows."""
+        return list(self._rows.values())
+
+    def set_nickname(self, user_id: str, nickname: Optional[str]) -> bool:
+        """Store the user's display nickname on their row (if they have one)."""
+        row = self._rows.get(user_id)
+        if row is None:
+            return False
+        # Filling in a missing nickname does not change what readers saw
+        # (they looked it up); renaming a stored one does
+        if "nickname" in row and row["nickname"] != nickname:
+            self._version += 1
+        row["nickname"] = nickname
+        return True
+    
+    def get_top(self, metric: str, limit: int, offset: int = 0) -> List[dict]:
+        """Get ranked rows ordered by metric (descending), like an index range scan.
+        
+        Only users with at least one won or lost game are ranked. Ties keep
+        the order in which users first finished a game.
+        """
+        if self._dirty:
+            self._merge_dirty()
+        index = self._indexes.get(metric)
+        if index is None:
+            ranked = [r for r in self._rows.values() if _ranked_games(r)]
+            index = sorted(ranked, key=self._index_key(metric), reverse=True)
+            self._indexes[metric] = index
+        return index[offset:offset + limit]
+    
+    def _index_key(self, metric: str) -> Callable[[dict], tuple]:
+        sort_key = SORT_KEYS[metric]
+        seq = self._seq
+        return lambda r: (sort_key(r), -seq[r["user_id"]])
+    
+    def _merge_dirty(self):
+        """Fold rows changed since the last read into every built index.
+        
+        Only the K changed rows are sorted; they are then merged with the
+        N unchanged (already sorted) rows in O(N + K log K) instead of
+        re-sorting all N rows.
+        """
+        # Swap the set out first: rows recorded from here on land in the
+        # fresh set and are merged by the next read instead of being lost
+        dirty, self._dirty = self._dirty, set()
+        changed = [
+            self._rows[user_id] for user_id in dirty
+            if user_id in self._rows and _ranked_games(self._rows[user_id])
+        ]
+        for metric, index in self._indexes.items():
+            key = self._index_key(metric)
+            kept = [r for r in index if r["user_id"] not in dirty]
+            changed.sort(key=key, reverse=True)
+            self._indexes[metric] = list(heapq.merge(kept, changed, key=key, reverse=True))
+    
+    def count_ranked(self) -> int:
+        """Count users that appear on the leaderboard."""
+        return self._ranked_count
+    
+    def get_totals(self) -> dict:
+        """Get global rollup (finished game counts, time, distinct sessions)."""
+        return dict(self._totals)
+
+    def count(self) -> int:
+        """Count users with at least one finished game."""
+        return len(self._rows)
+
+    def delete_user(self, user_id: str) -> bool:
+        """Remove a user's row and subtract it from the totals."""
+        if self._rebuild_log is not None:
+            self._rebuild_log.append(("delete_user", user_id))
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return False
+        self._dirty.add(user_id)
+        del self._seq[user_id]
+        if _ranked_games(row):
+            self._ranked_count -= 1
+        for key in ("games_won", "games_lost", "games_aborted", "total_time_sec"):
+            self._totals[key] -= row[key]
+        self._totals["total_sessions"] -= len(row["session_ids"])
+        self._version += 1
+        return True
+
+    def clear(self):
+        """Remove all rows (used before a full rebuild)."""
+        self._rows.clear()
+        self._totals = self._empty_totals()
+        self._indexes.clear()
+        self._dirty.clear()
+        self._seq.clear()
+        self._ranked_count = 0
+        self._version += 1
+
+    def begin_rebuild(self) -> "LeaderboardRepository":
+        """Start logging writes for a rebuild; returns the empty repository to fill.
+        
+        The caller fills the returned repository (possibly over several event
+        loop iterations) and hands it to finish_rebuild, or calls
+        abort_rebuild if it gives up.
+        """
+        self._rebuild_log = []
+        self._rebuild_game_ids = set()
+        return LeaderboardRepository()
+
+    def recorded_during_rebuild(self, game_id: str) -> bool:
+        """Whether a game was recorded here after begin_rebuild (and will be replayed)."""
+        return game_id in self._rebuild_game_ids
+
+    def finish_rebuild(self, rebuilt: "LeaderboardRepository") -> int:
+        """Replay writes logged since begin_rebuild onto rebuilt, then adopt its state.
+        
+        Returns:
+            Number of games replayed
+        """
+        log = self._rebuild_log or []
+        self.abort_rebuild()
+        for op, *args in log:
+            getattr(rebuilt, op)(*args)
+        (self._rows, self._totals, self._indexes, self._dirty,
+         self._seq, self._next_seq, self._ranked_count) = (
+            rebuilt._rows, rebuilt._totals, rebuilt._indexes, rebuilt._dirty,
+            rebuilt._seq, rebuilt._next_seq, rebuilt._ranked_count)
+        self._version += 1
+        return sum(1 for entry in log if entry[0] == "record_game")
+
+    def abort_rebuild(self):
+        """Stop logging writes for a rebuild."""
+        self._rebuild_log = None
+        self._rebuild_game_ids = set()
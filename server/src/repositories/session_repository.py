@@ -1,6 +1,12 @@
 """Session repository: in-memory session storage."""
 
-from typing import Dict, Optional, List
+import sys
+from typing import Dict, Optional, List, Set
+
+
+# Low-cardinality params that arrive as fresh request strings; interned so
+# every session shares one object per distinct value
+_INTERNED_PARAMS = ("dictionary_id", "difficulty", "language")
 
 
 class SessionRepository:
@@ -8,25 +14,82 @@ class SessionRepository:
     
     def __init__(self):
         self._sessions: Dict[str, dict] = {}
+        # user_id -> {session_id: session}, in creation order (secondary index)
+        self._by_user: Dict[str, Dict[str, dict]] = {}
+        # dictionary_id -> IDs of ACTIVE sessions using it, and the reverse
+        # (session_id -> dictionary_id it is indexed under)
+        self._active_by_dict: Dict[Optional[str], Set[str]] = {}
+        self._active_dict_of: Dict[str, Optional[str]] = {}
+        # Bumped after every write that changed something; lets caches detect
+        # stale reads
+        self._version = 0
+        
+    @property
+    def version(self) -> int:
+        """Monotonic write counter for cache invalidation."""
+        return self._version
         
     def create(self, session_data: dict) -> dict:
         """Create a new session."""
-        self._sessions[session_data["session_id"]] = session_data
+        session_id = session_data["session_id"]
+        if session_id in self._sessions:
+            self._unindex(self._sessions[session_id])
+        params = session_data.get("params")
+        if params:
+            for key in _INTERNED_PARAMS:
+                value = params.get(key)
+                if type(value) is str:
+                    params[key] = sys.intern(value)
+        self._sessions[session_id] = session_data
+        self._by_user.setdefault(session_data["user_id"], {})[session_id] = session_data
+        self._index_active(session_data)
+        self._version += 1
         return session_data
         
+    def _unindex(self, session: dict):
+        """Remove a session from the per-user and active-dictionary indexes."""
+        user_sessions = self._by_user.get(session["user_id"])
+        if user_sessions is not None:
+            user_sessions.pop(session["session_id"], None)
+            if not user_sessions:
+                del self._by_user[session["user_id"]]
+        self._unindex_active(session["session_id"])
+        
+    def _index_active(self, session: dict):
+        """(Re)file a session in the active-dictionary index by its current status."""
+        session_id = session["session_id"]
+        self._unindex_active(session_id)
+        if session.get("status") == "ACTIVE":
+            # Dictionary ID is stored in params.dictionary_id
+            dictionary_id = session.get("params", {}).get("dictionary_id")
+            self._active_by_dict.setdefault(dictionary_id, set()).add(session_id)
+            self._active_dict_of[session_id] = dictionary_id
+        
+    def _unindex_active(self, session_id: str):
+        if session_id not in self._active_dict_of:
+            return
+        dictionary_id = self._active_dict_of.pop(session_id)
+        active = self._active_by_dict[dictionary_id]
+        active.discard(session_id)
+        if not active:
+            del self._active_by_dict[dictionary_id]
+        
     def get_by_id(self, session_id: str) -> Optional[dict]:
         """Get session by ID."""
         return self._sessions.get(session_id)
         
     def get_by_user(self, user_id: str) -> List[dict]:
         """Get all sessions for a user."""
-        return [s for s in self._sessions.values() if s["user_id"] == user_id]
+        return list(self._by_user.get(user_id, {}).values())
         
     def update(self, session_id: str, updates: dict) -> Optional[dict]:
         """Update session data."""
         if session_id in self._sessions:
-            self._sessions[session_id].update(updates)
-            return self._sessions[session_id]
+            session = self._sessions[session_id]
+            session.update(updates)
+            self._index_active(session)
+            self._version += 1
+            return session
         return None
         
     def get_all(self) -> List[dict]:
@@ -40,23 +103,21 @@ class SessionRepository:
     def delete(self, session_id: str) -> bool:
         """Delete session by ID. Returns True if deleted, False if not found."""
         if session_id in self._sessions:
-            del self._sessions[session_id]
+            self._unindex(self._sessions.pop(session_id))
+            self._version += 1
             return True
         return False
     
     def delete_by_user(self, user_id: str) -> int:
         """Delete all sessions for a user. Returns number of sessions deleted."""
-        sessions_to_delete = [sid for sid, s in self._sessions.items() if s["user_id"] == user_id]
+        sessions_to_delete = list(self._by_user.pop(user_id, {}))
         for session_id in sessions_to_delete:
             del self._sessions[session_id]
+            self._unindex_active(session_id)
+        if sessions_to_delete:
+            self._version += 1
         return len(sessions_to_delete)
     
     def is_dictionary_in_use(self, dictionary_id: str) -> bool:
         """Check if dictionary is used by any active sessions."""
-        for session in self._sessions.values():
-            if session.get("status") == "ACTIVE":
-                # Dictionary ID is stored in params.dictionary_id
-                params = session.get("params", {})
-                if params.get("dictionary_id") == dictionary_id:
-                    return True
-        return False
+        return dictionary_id in self._active_by_dict
@@ -1,6 +1,11 @@
 """User repository: in-memory user storage."""
 
-from typing import Dict, Optional, List
+from itertools import count
+from typing import Dict, Optional, List, Set
+
+from .game_repository import GameRepository
+from .leaderboard_repository import LeaderboardRepository
+from .session_repository import SessionRepository
 
 
 class UserRepository:
@@ -8,22 +13,59 @@ class UserRepository:
     
     def __init__(self):
         self._users: Dict[str, dict] = {}
+        # lowercased email -> user_id (unique lookup index for login/register;
+        # emails match case-insensitively)
+        self._by_email: Dict[str, str] = {}
+        # IDs of users with is_admin set (checked on every admin request)
+        self._admin_ids: Set[str] = set()
+        # Source of new user IDs; next() on it is atomic, so concurrent
+        # registrations never get the same ID
+        self._id_seq = count(1)
+        # Bumped after every write that changed something; lets caches detect
+        # stale reads
+        self._version = 0
+        
+    @property
+    def version(self) -> int:
+        """Monotonic write counter for cache invalidation."""
+        return self._version
         
     def create(self, user_data: dict) -> dict:
         """Create a new user."""
-        self._users[user_data["user_id"]] = user_data
+        user_id = user_data["user_id"]
+        if user_id in self._users:
+            self._unindex(self._users[user_id])
+        self._users[user_id] = user_data
+        self._by_email[user_data["email"].lower()] = user_id
+        if user_data.get("is_admin"):
+            self._admin_ids.add(user_id)
+        else:
+            self._admin_ids.discard(user_id)
+        self._version += 1
         return user_data
         
+    def _unindex(self, user: dict):
+        """Remove a user's email from the lookup index."""
+        key = user["email"].lower()
+        if self._by_email.get(key) == user["user_id"]:
+            del self._by_email[key]
+        
+    def next_user_id(self) -> str:
+        """Allocate a new user ID (never reused, even after deletes)."""
+        return f"u_{next(self._id_seq)}"
+        
     def get_by_id(self, user_id: str) -> Optional[dict]:
         """Get user by ID."""
         return self._users.get(user_id)
         
     def get_by_email(self, email: str) -> Optional[dict]:
-        """Get user by email."""
-        for user in self._users.values():
-            if user["email"] == email:
-                return user
-        return None
+        """Get user by email (case-insensitive)."""
+        user_id = self._by_email.get(email.lower())
+        return self._users.get(user_id) if user_id is not None else None
+        
+    def is_admin(self, user_id: str) -> bool:
+        """Check if a user has the admin flag."""
+        return user_id in self._admin_ids
         
     def get_all(self) -> List[dict]:
         """Get all users."""
@@ -42,12 +84,54 @@ class UserRepository:
         if user_id not in self._users:
             return None
         
-        self._users[user_id].update(updates)
-        return self._users[user_id]
+        user = self._users[user_id]
+        if "email" in updates and updates["email"] != user["email"]:
+            self._unindex(user)
+            self._by_email[updates["email"].lower()] = user_id
+        if "is_admin" in updates:
+            if updates["is_admin"]:
+                self._admin_ids.add(user_id)
+            else:
+                self._admin_ids.discard(user_id)
+        user.update(updates)
+        self._version += 1
+        return user
     
     def delete(self, user_id: str) -> bool:
         """Delete user by ID. Returns True if deleted, False if not found."""
         if user_id in self._users:
-            del self._users[user_id]
+            self._unindex(self._users.pop(user_id))
+            self._admin_ids.discard(user_id)
+            self._version += 1
             return True
         return False
+    
+    def cascade_delete(
+        self,
+        user_id: str,
+        session_repo: SessionRepository,
+        game_repo: GameRepository,
+        leaderboard_repo: Optional[LeaderboardRepository] = None
+    ) -> Dict[str, int]:
+        """Delete a user with all their sessions, games (including guesses)
+        and leaderboard row.
+        
+        Nothing is removed if the user does not exist, so a failed call never
+        leaves orphaned sessions or games behind.
+        
+        Returns:
+            Number of deleted records per entity: games, sessions, users
+        """
+        if user_id not in self._users:
+            return {"games": 0, "sessions": 0, "users": 0}
+        
+        session_ids = [s["session_id"] for s in session_repo.get_by_user(user_id)]
+        games_deleted = game_repo.delete_by_user(user_id, session_ids)
+        sessions_deleted = session_repo.delete_by_user(user_id)
+        if leaderboard_repo is not None:
+            leaderboard_repo.delete_user(user_id)
+        self._unindex(self._users.pop(user_id))
+        self._admin_ids.discard(user_id)
+        self._version += 1
+        
+        return {"games": games_deleted, "sessions": sessions_deleted, "users": 1}
@@ -1,11 +1,14 @@
 """Authentication service: user registration, login, token management."""
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from typing import Optional, Dict, Any
 import secrets
+import time
 from ..repositories.user_repository import UserRepository
 from ..utils.auth_utils import hash_password, verify_password, create_access_token
-from ..utils.login_tracker import LoginAttemptTracker
+from ..utils.game_utils import public_game
+from ..utils.login_tracker import LoginAttemptTracker, RedisLoginAttemptTracker
+from ..utils.time_utils import now_iso_z
 from ..config import settings
 from ..exceptions import (
     UserAlreadyExistsException,
@@ -17,38 +20,69 @@ from ..exceptions import (
 )
 
 
+# Password reset tokens: lifetime, and cap on outstanding tokens (oldest dropped)
+RESET_TOKEN_TTL_SECONDS = 15 * 60
+MAX_RESET_TOKENS = 10_000
+
+
+def _validate_password(password: str) -> None:
+    """Enforce the password policy (same checks and messages for register and reset).
+    
+    One pass over the characters, stopping as soon as every class is seen.
+    """
+    if len(password) < 8:
+        raise InvalidPasswordException("Password must be at least 8 characters")
+    has_upper = has_lower = has_digit = False
+    for c in password:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit:
+            return
+    if not has_upper:
+        raise InvalidPasswordException("Password must contain at least one uppercase letter")
+    if not has_lower:
+        raise InvalidPasswordException("Password must contain at least one lowercase letter")
+    if not has_digit:
+        raise InvalidPasswordException("Password must contain at least one number")
+
+
 class AuthService:
     """Service for authentication operations."""
     
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
-        # In-memory storage for reset tokens (in production, use Redis or database)
+        # In-memory storage for reset tokens (in production, use Redis or database).
+        # Every token lives RESET_TOKEN_TTL_SECONDS, so insertion order is
+        # expiry order and expired tokens are always at the front.
         self._reset_tokens: Dict[str, Dict[str, Any]] = {}
-        # Login attempt tracker for brute-force protection
-        self.login_tracker = LoginAttemptTracker(
-            max_attempts=settings.max_login_attempts,
-            lockout_duration_minutes=settings.login_lockout_duration_minutes,
-            attempt_window_minutes=settings.login_attempt_window_minutes
-        )
+        # Login attempt tracker for brute-force protection (Redis-backed when
+        # enabled, so all workers share the counters)
+        limits = {
+            "max_attempts": settings.max_login_attempts,
+            "lockout_duration_minutes": settings.login_lockout_duration_minutes,
+            "attempt_window_minutes": settings.login_attempt_window_minutes
+        }
+        if settings.use_redis_login_tracker:
+            self.login_tracker = RedisLoginAttemptTracker.from_url(settings.redis_url, **limits)
+        else:
+            self.login_tracker = LoginAttemptTracker(**limits)
         
     def register_user(self, email: str, password: str, nickname: Optional[str] = None) -> Dict[str, Any]:
         """Register a new user."""
-        # Validate password
-        if len(password) < 8:
-            raise InvalidPasswordException("Password must be at least 8 characters")
-        if not any(c.isupper() for c in password):
-            raise InvalidPasswordException("Password must contain at least one uppercase letter")
-        if not any(c.islower() for c in password):
-            raise InvalidPasswordException("Password must contain at least one lowercase letter")
-        if not any(c.isdigit() for c in password):
-            raise InvalidPasswordException("Password must contain at least one number")
+        _validate_password(password)
         
         # Check if email already exists
         if self.user_repo.get_by_email(email):
             raise UserAlreadyExistsException(email)
             
         # Generate user ID
-        user_id = f"u_{self.user_repo.count() + 1}"
+        user_id = self.user_repo.next_user_id()
         
         # First user is admin
         is_admin = self.user_repo.count() == 0
@@ -60,7 +94,7 @@ class AuthService:
             "password": hash_password(password),
             "nickname": nickname or email.split("@")[0],
             "is_admin": is_admin,
-            "created_at": datetime.utcnow().isoformat() + "Z"
+            "created_at": now_iso_z()
         }
         
         self.user_repo.create(user_data)
@@ -75,6 +109,10 @@ class AuthService:
         
     def login_user(self, email: str, password: str) -> Dict[str, Any]:
         """Authenticate user and return tokens."""
+        # Emails match case-insensitively, so attempts are tracked under the
+        # lowercased address: case variants share one counter and lockout
+        email = email.lower()
+        
         # Check if account is locked
         if self.login_tracker.is_locked(email):
             lockout_seconds = self.login_tracker.get_lockout_remaining(email)
@@ -117,8 +155,17 @@ class AuthService:
         
     def is_admin(self, user_id: str) -> bool:
         """Check if user is admin."""
-        user = self.user_repo.get_by_id(user_id)
-        return user.get("is_admin", False) if user else False
+        return self.user_repo.is_admin(user_id)
+    
+    def _purge_reset_tokens(self, now: float) -> None:
+        """Drop expired reset tokens (they sit at the front of the dict)."""
+        tokens = self._reset_tokens
+        while tokens:
+            token = next(iter(tokens))
+            token_data = tokens.get(token)
+            if token_data is not None and token_data["expires_at"] > now:
+                break
+            tokens.pop(token, None)
     
     def request_password_reset(self, email: str) -> Dict[str, str]:
         """Generate password reset token for user."""
@@ -131,11 +178,15 @@ class AuthService:
         # Generate secure random token
         token = secrets.token_urlsafe(32)
         
-        # Store token with expiration (15 minutes)
+        # Store token with expiration (epoch seconds, 15 minutes out)
+        now = time.time()
+        self._purge_reset_tokens(now)
+        while len(self._reset_tokens) >= MAX_RESET_TOKENS:
+            self._reset_tokens.pop(next(iter(self._reset_tokens)), None)
         self._reset_tokens[token] = {
             "email": email,
             "user_id": user["user_id"],
-            "expires_at": (datetime.now(timezone.utc) + timedelta(minutes=15)).isoformat()
+            "expires_at": now + RESET_TOKEN_TTL_SECONDS
         }
         
         # In production, send email with reset link
@@ -147,28 +198,22 @@ class AuthService:
     
     def reset_password(self, token: str, new_password: str) -> Dict[str, str]:
         """Reset password using reset token."""
+        now = time.time()
+        token_data = self._reset_tokens.get(token)
+        self._purge_reset_tokens(now)
+        
         # Validate token exists
-        if token not in self._reset_tokens:
+        if token_data is None:
             raise InvalidTokenException("Token not found or already used")
         
-        token_data = self._reset_tokens[token]
-        
         # Check if token expired
-        expires_at = datetime.fromisoformat(token_data["expires_at"])
-        if datetime.now(timezone.utc) > expires_at:
+        if now > token_data["expires_at"]:
             # Clean up expired token
-            del self._reset_tokens[token]
+            self._reset_tokens.pop(token, None)
             raise InvalidTokenException("Token has expired")
         
         # Validate new password
-        if len(new_password) < 8:
-            raise InvalidPasswordException("Password must be at least 8 characters")
-        if not any(c.isupper() for c in new_password):
-            raise InvalidPasswordException("Password must contain at least one uppercase letter")
-        if not any(c.islower() for c in new_password):
-            raise InvalidPasswordException("Password must contain at least one lowercase letter")
-        if not any(c.isdigit() for c in new_password):
-            raise InvalidPasswordException("Password must contain at least one number")
+        _validate_password(new_password)
         
         # Update password
         user = self.user_repo.get_by_id(token_data["user_id"])
@@ -179,7 +224,7 @@ class AuthService:
         self.user_repo.update(user["user_id"], {"password": user["password"]})
         
         # Invalidate token
-        del self._reset_tokens[token]
+        self._reset_tokens.pop(token, None)
         
         return {"message": "Password successfully reset"}
     
@@ -195,9 +240,10 @@ class AuthService:
         if email is not None:
             # Check if new email is different
             if email != user["email"]:
-                # Check if email already exists
+                # Check if email already exists (lookups ignore case, so a
+                # case-only change finds this same user, which is fine)
                 existing_user = self.user_repo.get_by_email(email)
-                if existing_user:
+                if existing_user and existing_user["user_id"] != user_id:
                     raise UserAlreadyExistsException(email)
                 updates["email"] = email
         
@@ -239,7 +285,7 @@ class AuthService:
         all_games = []
         for session in sessions:
             session_games = game_repo.get_by_session(session["session_id"])
-            all_games.extend(session_games)
+            all_games.extend(public_game(g, reveal_secret=True) for g in session_games)
         
         # Get user stats
         stats = stats_service.get_user_stats(user_id)
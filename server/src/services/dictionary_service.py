@@ -88,7 +88,7 @@ class DictionaryService:
             raise DictionaryInvalidException("Dictionary contains invalid words (empty or whitespace)")
             
         # Clean and deduplicate words
-        clean_words = list(set([w.strip().lower() for w in words if w.strip()]))
+        clean_words = tuple({w.strip().lower() for w in words if w.strip()})
         
         if len(clean_words) == 0:
             raise DictionaryInvalidException("Dictionary must have at least one valid word")
@@ -121,24 +121,20 @@ class DictionaryService:
         
     def update_dictionary(self, dictionary_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update dictionary metadata and/or words."""
-        dictionary = self.dict_repo.get_by_id(dictionary_id)
-        
-        if not dictionary:
-            raise DictionaryNotFoundException(dictionary_id)
-        
         # If updating words, clean and deduplicate them
         if "words" in updates:
             words = updates["words"]
             if not words or len(words) == 0:
                 raise DictionaryInvalidException("Dictionary must have at least one word")
-            clean_words = list(set([w.strip().lower() for w in words if w.strip()]))
+            clean_words = tuple({w.strip().lower() for w in words if w.strip()})
             if len(clean_words) == 0:
                 raise DictionaryInvalidException("Dictionary must have at least one valid word")
             updates["words"] = clean_words
             
-        self.dict_repo.update(dictionary_id, updates)
-        
-        updated = self.dict_repo.get_by_id(dictionary_id)
+        # The repository returns the updated record, or None if it doesn't exist
+        updated = self.dict_repo.update(dictionary_id, updates)
+        if not updated:
+            raise DictionaryNotFoundException(dictionary_id)
         
         return {
             "dict_id": updated["dictionary_id"],
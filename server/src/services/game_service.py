@@ -6,7 +6,11 @@ import random
 from ..repositories.game_repository import GameRepository
 from ..repositories.session_repository import SessionRepository
 from ..repositories.dictionary_repository import DictionaryRepository
-from ..utils.game_utils import normalize, update_pattern, calculate_score
+from ..repositories.leaderboard_repository import LeaderboardRepository
+from ..utils.game_utils import (
+    normalize, letter_masks, pattern_mask, reveal_mask, calculate_score, public_game, game_created_dt,
+    HIDDEN_GAME_FIELDS, SCORED_STATUSES
+)
 from ..exceptions import (
     InvalidGuessException,
     GameAlreadyFinishedException,
@@ -17,15 +21,32 @@ from ..exceptions import (
 class GameService:
     """Service for game operations."""
     
+    # Random draws tried before falling back to filtering the word list
+    WORD_DRAW_ATTEMPTS = 8
+    
     def __init__(
         self,
         game_repo: GameRepository,
         session_repo: SessionRepository,
-        dict_repo: DictionaryRepository
+        dict_repo: DictionaryRepository,
+        leaderboard_repo: Optional[LeaderboardRepository] = None
     ):
         self.game_repo = game_repo
         self.session_repo = session_repo
         self.dict_repo = dict_repo
+        self.leaderboard_repo = leaderboard_repo
+        # Unseeded sessions share one RNG; seeded sessions derive one per game
+        self._rng = random.Random()
+        
+    def _session_rng(self, session: dict) -> random.Random:
+        """RNG used to pick the next secret of a session (seeded per game if requested)."""
+        seed = session["params"].get("seed")
+        if seed is None:
+            return self._rng
+        # Derived from the seed and the game's position so sessions with the
+        # same seed replay the same word sequence without any state being kept
+        # per session (which would outlive abandoned or deleted sessions)
+        return random.Random(f"{seed}:{session['games_created']}")
         
     def create_game(self, session_id: str, user_id: str) -> Dict[str, Any]:
         """Create a new game in a session."""
@@ -48,39 +69,58 @@ class GameService:
             dict_id = "dict_ro_basic"
             dictionary = self.dict_repo.get_by_id(dict_id)
             
-        available_words = dictionary["words"].copy()
-        
-        # Get words already used in this session
-        session_games = self.game_repo.get_by_session(session_id)
-        used_words = {game["secret"] for game in session_games}
-        
-        # Filter out used words
-        available_words = [w for w in available_words if w not in used_words]
-        
-        if not available_words:
-            raise ValueError("No more unique words available in dictionary")
-            
-        # Select random word
-        rng = random.Random(session["params"].get("seed", None))
-        secret = rng.choice(available_words)
+        words = dictionary["words"]
+        
+        # Words already used in this session (kept per session by the repository)
+        used_words = self.game_repo.get_used_secrets(session_id)
+        
+        # Select random unused word: a few direct draws first, so the word
+        # list is only copied and filtered once the session has used most of it
+        rng = self._session_rng(session)
+        secret = None
+        if words:
+            for _ in range(self.WORD_DRAW_ATTEMPTS):
+                candidate = rng.choice(words)
+                if candidate not in used_words:
+                    secret = candidate
+                    break
+        if secret is None:
+            available_words = [w for w in words if w not in used_words]
+            if not available_words:
+                raise ValueError("No more unique words available in dictionary")
+            secret = rng.choice(available_words)
         
         # Create game
         game_id = f"g_{self.game_repo.count() + 1}"
+        secret_norm = normalize(secret)
+        now = datetime.utcnow()
+        now_iso = now.isoformat() + "Z"
         
         game_data = {
             "game_id": game_id,
             "session_id": session_id,
             "status": "IN_PROGRESS",
             "secret": secret,
+            # Normalized once here instead of on every guess
+            "_secret_norm": secret_norm,
+            # Reveal state as bitmasks over positions: letter -> positions,
+            # positions revealed so far, and all positions (won when equal)
+            "_letter_masks": letter_masks(secret, secret_norm),
+            "_revealed": 0,
+            "_full_mask": (1 << len(secret)) - 1,
             "length": len(secret),
             "pattern": "*" * len(secret),
             "guessed_letters": [],
+            # Set mirror of guessed_letters for O(1) repeat checks (the list keeps order for clients)
+            "_guessed_set": set(),
             "wrong_letters": [],
             "remaining_misses": session["params"]["max_misses"],
             "total_guesses": 0,
             "wrong_word_guesses": 0,
-            "created_at": datetime.utcnow().isoformat() + "Z",
-            "updated_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": now_iso,
+            # Native datetime kept for period filters and scoring (never re-parsed)
+            "_created_dt": now,
+            "updated_at": now_iso,
             "finished_at": None,
             "time_seconds": 0.0,
             "composite_score": 0.0,
@@ -90,16 +130,17 @@ class GameService:
         self.game_repo.create(game_data)
         
         # Update session
+        games_created = session["games_created"] + 1
         self.session_repo.update(session_id, {
-            "games_created": session["games_created"] + 1
+            "games_created": games_created
         })
         
         # Return without secret
-        return {k: v for k, v in game_data.items() if k != "secret"}
+        return public_game(game_data)
         
     def get_game(self, game_id: str, user_id: str) -> Dict[str, Any]:
         """Get game state (without secret for active games)."""
-        game = self.game_repo.get_by_id(game_id)
+        game = self.game_repo.peek_by_id(game_id)
         
         if not game:
             raise ValueError("Game not found")
@@ -109,12 +150,8 @@ class GameService:
         if session["user_id"] != user_id:
             raise PermissionError("Access denied")
         
-        # Hide secret only for active games
-        if game["status"] == "IN_PROGRESS":
-            return {k: v for k, v in game.items() if k != "secret"}
-        else:
-            # Reveal secret for finished games
-            return game
+        # Hide secret only for active games (revealed once finished)
+        return public_game(game, reveal_secret=game["status"] != "IN_PROGRESS")
         
     def make_guess_letter(
         self,
@@ -141,14 +178,29 @@ class GameService:
         if len(letter) != 1:
             raise InvalidGuessException("Must be a single letter")
             
-        if letter in game["guessed_letters"]:
+        guessed = game.get("_guessed_set")
+        if guessed is None:
+            guessed = game["_guessed_set"] = set(game["guessed_letters"])
+        if letter in guessed:
             raise InvalidGuessException("Letter has already been guessed")
             
+        # One timestamp for the whole guess (history, finish and update times)
+        now = datetime.utcnow()
+        now_iso = now.isoformat() + "Z"
+        
         # Process guess
         game["guessed_letters"].append(letter)
-        old_pattern = game["pattern"]
-        game["pattern"] = update_pattern(game["secret"], game["pattern"], letter)
-        correct = old_pattern != game["pattern"]
+        guessed.add(letter)
+        masks = game.get("_letter_masks")
+        if masks is None:
+            self._init_reveal_masks(game)
+            masks = game["_letter_masks"]
+        # Positions of this letter that are not revealed yet
+        new_mask = masks.get(normalize(letter), 0) & ~game["_revealed"]
+        correct = new_mask != 0
+        if correct:
+            game["pattern"] = reveal_mask(game["secret"], game["pattern"], new_mask)
+            game["_revealed"] |= new_mask
         
         if not correct:
             game["wrong_letters"].append(letter)
@@ -163,30 +215,33 @@ class GameService:
             "value": letter,
             "correct": correct,
             "pattern_after": game["pattern"],
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": now_iso
         }
         
         self.game_repo.add_guess(game_id, guess_data)
         
         # Check win/loss conditions
-        if "*" not in game["pattern"]:
+        if game["_revealed"] == game["_full_mask"]:
             game["status"] = "WON"
-            game["finished_at"] = datetime.utcnow().isoformat() + "Z"
+            game["finished_at"] = now_iso
             game["result"] = {"won": True, "secret": game["secret"]}
         elif game["remaining_misses"] <= 0:
             game["status"] = "LOST"
-            game["finished_at"] = datetime.utcnow().isoformat() + "Z"
+            game["finished_at"] = now_iso
             game["result"] = {"won": False, "secret": game["secret"]}
             
-        game["updated_at"] = datetime.utcnow().isoformat() + "Z"
+        game["updated_at"] = now_iso
         
         # Calculate score if finished
-        if game["status"] in ["WON", "LOST"]:
-            self._calculate_final_score(game)
+        if game["status"] in SCORED_STATUSES:
+            self._calculate_final_score(game, now)
             
         # Update game
         self.game_repo.update(game_id, game)
         
+        if game["status"] in SCORED_STATUSES:
+            self._record_finished(game, session)
+        
         # Return game state with additional guess info
         return {
             "guess_index": guess_data["index"],
@@ -225,21 +280,28 @@ class GameService:
         if not session["params"]["allow_word_guess"]:
             raise InvalidGuessException("Word guessing not allowed")
             
+        # One timestamp for the whole guess (history, finish and update times)
+        now = datetime.utcnow()
+        now_iso = now.isoformat() + "Z"
+        
         word = word.strip().lower()
         game["total_guesses"] += 1
-        correct = normalize(word) == normalize(game["secret"])
+        secret_norm = game.get("_secret_norm") or normalize(game["secret"])
+        correct = normalize(word) == secret_norm
         
         if correct:
             game["pattern"] = game["secret"]
+            if "_full_mask" in game:
+                game["_revealed"] = game["_full_mask"]
             game["status"] = "WON"
-            game["finished_at"] = datetime.utcnow().isoformat() + "Z"
+            game["finished_at"] = now_iso
             game["result"] = {"won": True, "secret": game["secret"]}
         else:
             game["wrong_word_guesses"] += 1
             game["remaining_misses"] -= 2
             if game["remaining_misses"] <= 0:
                 game["status"] = "LOST"
-                game["finished_at"] = datetime.utcnow().isoformat() + "Z"
+                game["finished_at"] = now_iso
                 game["result"] = {"won": False, "secret": game["secret"]}
                 
         # Add guess to history
@@ -249,20 +311,23 @@ class GameService:
             "value": word,
             "correct": correct,
             "pattern_after": game["pattern"],
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": now_iso
         }
         
         self.game_repo.add_guess(game_id, guess_data)
         
-        game["updated_at"] = datetime.utcnow().isoformat() + "Z"
+        game["updated_at"] = now_iso
         
         # Calculate score if finished
-        if game["status"] in ["WON", "LOST"]:
-            self._calculate_final_score(game)
+        if game["status"] in SCORED_STATUSES:
+            self._calculate_final_score(game, now)
             
         # Update game
         self.game_repo.update(game_id, game)
         
+        if game["status"] in SCORED_STATUSES:
+            self._record_finished(game, session)
+        
         return {
             "guess_index": guess_data["index"],
             "type": "WORD",
@@ -292,12 +357,41 @@ class GameService:
             raise ValueError("Game is not in progress")
             
         game["status"] = "ABORTED"
-        game["finished_at"] = datetime.utcnow().isoformat() + "Z"
+        now_iso = datetime.utcnow().isoformat() + "Z"
+        game["finished_at"] = now_iso
+        game["updated_at"] = now_iso
         game["result"] = {"won": False, "secret": game["secret"], "aborted": True}
         
         self.game_repo.update(game_id, game)
+        self._record_finished(game, session)
         
-        return {k: v for k, v in game.items() if k != "secret"}
+        return public_game(game)
+    
+    def abort_session_games(self, session_id: str) -> int:
+        """Abort all in-progress games of a session. Returns number aborted."""
+        session = self.session_repo.get_by_id(session_id)
+        now = datetime.utcnow().isoformat() + "Z"
+        aborted = 0
+        
+        for game in self.game_repo.get_by_session(session_id):
+            if game["status"] != "IN_PROGRESS":
+                continue
+            game["status"] = "ABORTED"
+            game["updated_at"] = now
+            self.game_repo.update(game["game_id"], {
+                "status": "ABORTED",
+                "updated_at": now
+            })
+            if session:
+                self._record_finished(game, session)
+            aborted += 1
+        
+        return aborted
+    
+    def _record_finished(self, game: dict, session: dict):
+        """Fold a game that just finished into the materialized leaderboard."""
+        if self.leaderboard_repo is not None:
+            self.leaderboard_repo.record_game(session["user_id"], game)
         
     def list_session_games(
         self,
@@ -315,16 +409,11 @@ class GameService:
         if session["user_id"] != user_id:
             raise PermissionError("Access denied")
             
-        all_games = self.game_repo.get_by_session(session_id)
-        
-        # Pagination
-        total = len(all_games)
+        # Pagination; the repository copies only this page, without the secret
         start = (page - 1) * page_size
-        end = start + page_size
-        games = all_games[start:end]
-        
-        # Remove secret from response
-        games_safe = [{k: v for k, v in g.items() if k != "secret"} for g in games]
+        games_safe, total = self.game_repo.get_session_page(
+            session_id, start, page_size, exclude=HIDDEN_GAME_FIELDS
+        )
         
         return {
             "games": games_safe,
@@ -336,7 +425,7 @@ class GameService:
         
     def get_game_history(self, game_id: str, user_id: str) -> Dict[str, Any]:
         """Get guess history for a game."""
-        game = self.game_repo.get_by_id(game_id)
+        game = self.game_repo.peek_by_id(game_id)
         
         if not game:
             raise ValueError("Game not found")
@@ -356,10 +445,22 @@ class GameService:
             "total_guesses": len(guesses)
         }
     
-    def _calculate_final_score(self, game: dict):
-        """Calculate composite score for finished game."""
-        created = datetime.fromisoformat(game["created_at"].replace("Z", "+00:00"))
-        finished = datetime.fromisoformat(game["finished_at"].replace("Z", "+00:00"))
+    @staticmethod
+    def _init_reveal_masks(game: dict):
+        """Build the reveal bitmasks for a game created without them."""
+        game["_letter_masks"] = letter_masks(game["secret"], game.get("_secret_norm"))
+        game["_revealed"] = pattern_mask(game["pattern"])
+        game["_full_mask"] = (1 << len(game["secret"])) - 1
+        
+    def _calculate_final_score(self, game: dict, finished: Optional[datetime] = None):
+        """Calculate composite score for finished game.
+        
+        finished is the (naive UTC) datetime behind finished_at, when the
+        caller has it; otherwise finished_at is parsed.
+        """
+        created = game_created_dt(game)
+        if finished is None:
+            finished = datetime.fromisoformat(game["finished_at"].replace("Z", "+00:00")).replace(tzinfo=None)
         game["time_seconds"] = (finished - created).total_seconds()
         
         won = 1 if game["status"] == "WON" else 0
@@ -374,4 +475,4 @@ class GameService:
 
     def count(self) -> int:
         """Count total games (helper for ID generation)."""
-        return len(self.game_repo.get_all())
+        return self.game_repo.count()
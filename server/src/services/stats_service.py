@@ -1,10 +1,19 @@
 """Statistics service: user stats, global stats, leaderboard."""
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from ..repositories.user_repository import UserRepository
 from ..repositories.session_repository import SessionRepository
 from ..repositories.game_repository import GameRepository
+from ..repositories.leaderboard_repository import LeaderboardRepository, SORT_KEYS
+from ..utils.game_utils import FINISHED_STATUSES, SCORED_STATUSES, game_created_dt
+
+
+# Rolling time windows accepted by the period filter; anything else means all time
+PERIOD_DAYS = {"1d": 1, "7d": 7, "30d": 30}
+
+# Games folded into the leaderboard per step of a rebuild
+REBUILD_BATCH_SIZE = 5000
 
 
 class StatsService:
@@ -14,46 +23,85 @@ class StatsService:
         self,
         user_repo: UserRepository,
         session_repo: SessionRepository,
-        game_repo: GameRepository
+        game_repo: GameRepository,
+        leaderboard_repo: Optional[LeaderboardRepository] = None
     ):
         self.user_repo = user_repo
         self.session_repo = session_repo
         self.game_repo = game_repo
+        # Materialized all-time aggregates; falls back to scanning games if absent
+        self.leaderboard_repo = leaderboard_repo
+    
+    def uses_materialized(self, period: str) -> bool:
+        """Whether the all-time aggregates can answer a query for this period."""
+        return self.leaderboard_repo is not None and period not in PERIOD_DAYS
+    
+    def rebuild_leaderboard(self) -> int:
+        """Recompute the materialized aggregates from all finished games.
+        
+        Returns:
+            Number of games folded into the aggregates
+        """
+        count = 0
+        for count in self.rebuild_leaderboard_steps():
+            pass
+        return count
+    
+    def rebuild_leaderboard_steps(self, batch_size: int = REBUILD_BATCH_SIZE) -> Iterator[int]:
+        """Recompute the materialized aggregates one batch of games per step.
+        
+        The aggregates are built in a separate repository and swapped in
+        after the last batch, so readers never see a partial table. Games
+        finished and users deleted between steps are replayed before the
+        swap. Yields the number of games folded in so far (the last value
+        is the total); callers can yield to the event loop between steps.
+        """
+        live = self.leaderboard_repo
+        if live is None:
+            return
+        rebuilt = live.begin_rebuild()
+        try:
+            games = self.game_repo.get_all()
+            count = 0
+            for start in range(0, len(games), batch_size):
+                for game in games[start:start + batch_size]:
+                    # Games recorded since the rebuild began are replayed instead
+                    if game["status"] not in FINISHED_STATUSES or live.recorded_during_rebuild(game["game_id"]):
+                        continue
+                    session = self.session_repo.get_by_id(game["session_id"])
+                    if session:
+                        rebuilt.record_game(session["user_id"], game)
+                        count += 1
+                yield count
+        except BaseException:
+            live.abort_rebuild()
+            raise
+        # Nicknames are filled in on the rows' first leaderboard read
+        yield count + live.finish_rebuild(rebuilt)
         
     def get_user_stats(self, user_id: str, period: str = "all") -> Dict[str, Any]:
         """Get statistics for a specific user."""
-        # Get all games for user
-        user_games = []
-        for game in self.game_repo.get_all():
-            if game["status"] not in ["WON", "LOST", "ABORTED"]:
-                continue
-            session = self.session_repo.get_by_id(game["session_id"])
-            if session and session["user_id"] == user_id:
-                user_games.append(game)
+        if self.uses_materialized(period):
+            return self._get_user_stats_materialized(user_id, period)
+        
+        # Get the user's finished games via the per-user/per-session indexes
+        session_ids = [s["session_id"] for s in self.session_repo.get_by_user(user_id)]
+        user_games = [
+            g for g in self.game_repo.get_by_sessions(session_ids)
+            if g["status"] in FINISHED_STATUSES
+        ]
                 
         # Filter by period
         user_games = self._filter_by_period(user_games, period)
         
         if not user_games:
-            return {
-                "user_id": user_id,
-                "period": period,
-                "total_games": 0,
-                "games_won": 0,
-                "games_lost": 0,
-                "games_aborted": 0,
-                "win_rate": 0.0,
-                "avg_guesses": 0.0,
-                "avg_score": 0.0,
-                "best_score": 0.0,
-                "total_time_sec": 0.0
-            }
+            return self._empty_user_stats(user_id, period)
             
         wins = sum(1 for g in user_games if g["status"] == "WON")
         losses = sum(1 for g in user_games if g["status"] == "LOST")
         aborted = sum(1 for g in user_games if g["status"] == "ABORTED")
         
-        finished_games = [g for g in user_games if g["status"] in ["WON", "LOST"]]
+        finished_games = [g for g in user_games if g["status"] in SCORED_STATUSES]
         
         total_score = sum(g.get("composite_score", 0) for g in finished_games)
         total_time = sum(g.get("time_seconds", 0) for g in finished_games)
@@ -78,7 +126,10 @@ class StatsService:
         
     def get_global_stats(self, period: str = "all") -> Dict[str, Any]:
         """Get global statistics across all users."""
-        all_games = [g for g in self.game_repo.get_all() if g["status"] in ["WON", "LOST", "ABORTED"]]
+        if self.uses_materialized(period):
+            return self._get_global_stats_materialized(period)
+        
+        all_games = [g for g in self.game_repo.get_all() if g["status"] in FINISHED_STATUSES]
         all_games = self._filter_by_period(all_games, period)
         
         if not all_games:
@@ -98,7 +149,7 @@ class StatsService:
         losses = sum(1 for g in all_games if g["status"] == "LOST")
         aborted = sum(1 for g in all_games if g["status"] == "ABORTED")
         
-        finished_games = [g for g in all_games if g["status"] in ["WON", "LOST"]]
+        finished_games = [g for g in all_games if g["status"] in SCORED_STATUSES]
         total_duration = sum(g.get("time_seconds", 0) for g in finished_games)
         
         # Find most active user
@@ -138,12 +189,40 @@ class StatsService:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Get leaderboard of top players."""
+        entries, _ = self.get_leaderboard_page(metric, period, limit)
+        return entries
+    
+    def get_leaderboard_page(
+        self,
+        metric: str = "composite_score",
+        period: str = "all",
+        limit: int = 10,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get one page of the leaderboard and the total number of ranked players."""
+        if self.uses_materialized(period):
+            # Read the page straight from the per-metric index (no sort)
+            index = metric if metric in SORT_KEYS else "total_score"
+            entries = []
+            rows = self.leaderboard_repo.get_top(index, limit, offset)
+            for rank, row in enumerate(rows, offset + 1):
+                entry = self._make_entry(
+                    row["user_id"],
+                    self._row_nickname(row),
+                    row["games_won"] + row["games_lost"],
+                    row["games_won"],
+                    row["total_score"]
+                )
+                entry["rank"] = rank
+                entries.append(entry)
+            return entries, self.leaderboard_repo.count_ranked()
+        
         # Get all games
-        all_games = [g for g in self.game_repo.get_all() if g["status"] in ["WON", "LOST"]]
+        all_games = [g for g in self.game_repo.get_all() if g["status"] in SCORED_STATUSES]
         all_games = self._filter_by_period(all_games, period)
         
         if not all_games:
-            return []
+            return [], 0
             
         # Aggregate stats per user
         user_stats = {}
@@ -173,21 +252,112 @@ class StatsService:
             user_stats[user_id]["total_score"] += score
             user_stats[user_id]["scores"].append(score)
             
+        return self._rank_entries(user_stats, metric, limit, offset)
+    
+    def _get_nickname(self, user_id: str):
+        """Look up a user's current nickname (None if the user is gone)."""
+        user = self.user_repo.get_by_id(user_id)
+        return user.get("nickname") if user else None
+    
+    def _row_nickname(self, row: dict):
+        """Nickname denormalized onto a leaderboard row, filled on first read."""
+        if "nickname" not in row:
+            self.leaderboard_repo.set_nickname(row["user_id"], self._get_nickname(row["user_id"]))
+        return row["nickname"]
+    
+    @staticmethod
+    def _empty_user_stats(user_id: str, period: str) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "period": period,
+            "total_games": 0,
+            "games_won": 0,
+            "games_lost": 0,
+            "games_aborted": 0,
+            "win_rate": 0.0,
+            "avg_guesses": 0.0,
+            "avg_score": 0.0,
+            "best_score": 0.0,
+            "total_time_sec": 0.0
+        }
+    
+    def _get_user_stats_materialized(self, user_id: str, period: str) -> Dict[str, Any]:
+        """User statistics served from the user's materialized row."""
+        row = self.leaderboard_repo.get(user_id)
+        if row is None:
+            return self._empty_user_stats(user_id, period)
+        
+        wins = row["games_won"]
+        finished = wins + row["games_lost"]
+        return {
+            "user_id": user_id,
+            "period": period,
+            "total_games": finished + row["games_aborted"],
+            "games_won": wins,
+            "games_lost": row["games_lost"],
+            "games_aborted": row["games_aborted"],
+            "win_rate": (wins / finished * 100) if finished else 0.0,
+            "avg_guesses": row["total_guesses"] / finished if finished else 0.0,
+            "avg_score": row["total_score"] / finished if finished else 0.0,
+            "best_score": row["best_score"] or 0.0,
+            "total_time_sec": row["total_time_sec"]
+        }
+    
+    def _get_global_stats_materialized(self, period: str) -> Dict[str, Any]:
+        """Global statistics served from the materialized rollup."""
+        totals = self.leaderboard_repo.get_totals()
+        rows = self.leaderboard_repo.get_all()
+        finished = totals["games_won"] + totals["games_lost"]
+        total_games = finished + totals["games_aborted"]
+        
+        most_active = None
+        if rows:
+            most_active = max(
+                rows,
+                key=lambda r: r["games_won"] + r["games_lost"] + r["games_aborted"]
+            )["user_id"]
+        
+        return {
+            "period": period,
+            "total_users": len(rows),
+            "total_sessions": totals["total_sessions"],
+            "total_games": total_games,
+            "games_won": totals["games_won"],
+            "games_lost": totals["games_lost"],
+            "games_aborted": totals["games_aborted"],
+            "avg_game_duration_sec": totals["total_time_sec"] / finished if finished else 0.0,
+            "most_active_user": most_active
+        }
+    
+    @staticmethod
+    def _make_entry(user_id: str, nickname, total_games: int, games_won: int, total_score: float) -> Dict[str, Any]:
+        """Build a leaderboard entry (without rank) from per-user aggregates."""
+        return {
+            "user_id": user_id,
+            "nickname": nickname,
+            "total_games": total_games,
+            "games_won": games_won,
+            "win_rate": games_won / total_games if total_games else 0,
+            "avg_score": total_score / total_games if total_games else 0,
+            "total_score": total_score  # Total score for sorting
+        }
+    
+    def _rank_entries(
+        self,
+        user_stats: Dict[str, dict],
+        metric: str,
+        limit: int,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Compute per-user metrics, sort by the requested metric and rank one page."""
         # Calculate metrics
-        entries = []
-        for user_id, stats in user_stats.items():
-            avg_score = stats["total_score"] / stats["total_games"] if stats["total_games"] else 0
-            win_rate = stats["games_won"] / stats["total_games"] if stats["total_games"] else 0
-            
-            entries.append({
-                "user_id": user_id,
-                "nickname": stats["nickname"],
-                "total_games": stats["total_games"],
-                "games_won": stats["games_won"],
-                "win_rate": win_rate,
-                "avg_score": avg_score,
-                "total_score": stats["total_score"]  # Total score for sorting
-            })
+        entries = [
+            self._make_entry(
+                user_id, stats["nickname"], stats["total_games"],
+                stats["games_won"], stats["total_score"]
+            )
+            for user_id, stats in user_stats.items()
+        ]
             
         # Sort by metric
         if metric == "total_score":
@@ -201,10 +371,11 @@ class StatsService:
             entries.sort(key=lambda x: x["total_score"], reverse=True)
             
         # Add rank and limit
-        for i, entry in enumerate(entries[:limit], 1):
+        page = entries[offset:offset + limit]
+        for i, entry in enumerate(page, offset + 1):
             entry["rank"] = i
             
-        return entries[:limit]
+        return page, len(entries)
         
     def get_admin_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics for admin dashboard."""
@@ -233,22 +404,21 @@ class StatsService:
         games_month = 0
         
         for game in all_games:
-            if game.get("created_at"):
-                try:
-                    created = datetime.fromisoformat(game["created_at"].replace("Z", "+00:00"))
-                    created_naive = created.replace(tzinfo=None)
-                    
-                    if created_naive >= today_start:
-                        games_today += 1
-                    if created_naive >= week_start:
-                        games_week += 1
-                    if created_naive >= month_start:
-                        games_month += 1
-                except:
-                    continue
+            try:
+                created_naive = game_created_dt(game)
+            except ValueError:
+                continue
+            if created_naive is None:
+                continue
+            if created_naive >= today_start:
+                games_today += 1
+            if created_naive >= week_start:
+                games_week += 1
+            if created_naive >= month_start:
+                games_month += 1
         
         # Games by status
-        finished_games = [g for g in all_games if g["status"] in ["WON", "LOST", "ABORTED"]]
+        finished_games = [g for g in all_games if g["status"] in FINISHED_STATUSES]
         games_won = sum(1 for g in finished_games if g["status"] == "WON")
         games_lost = sum(1 for g in finished_games if g["status"] == "LOST")
         games_aborted = sum(1 for g in finished_games if g["status"] == "ABORTED")
@@ -319,7 +489,7 @@ class StatsService:
             return games
             
         now = datetime.utcnow()
-        period_days = {"1d": 1, "7d": 7, "30d": 30}.get(period, 0)
+        period_days = PERIOD_DAYS.get(period, 0)
         
         if period_days == 0:
             return games
@@ -328,12 +498,11 @@ class StatsService:
         filtered = []
         
         for game in games:
-            if game.get("created_at"):
-                try:
-                    created = datetime.fromisoformat(game["created_at"].replace("Z", "+00:00"))
-                    if created.replace(tzinfo=None) >= cutoff:
-                        filtered.append(game)
-                except:
-                    continue
+            try:
+                created = game_created_dt(game)
+            except ValueError:
+                continue
+            if created is not None and created >= cutoff:
+                filtered.append(game)
                     
         return filtered
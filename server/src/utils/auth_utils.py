@@ -2,8 +2,14 @@
 
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 from ..config import get_settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -11,21 +17,91 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Get settings instance
 settings = get_settings()
 
+# Decoded payloads of recently seen tokens (bounded, oldest evicted first)
+_DECODED_TOKEN_CACHE_SIZE = 1024
+_decoded_tokens: Dict[str, Dict[str, Any]] = {}
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
+
+# Recent successful password checks: (stored hash, keyed password digest) ->
+# monotonic expiry. Only successes are kept, so wrong guesses always pay the
+# full bcrypt cost; keying by the stored hash drops entries on password change.
+_VERIFIED_CACHE_SIZE = 1024
+_VERIFIED_TTL_SECONDS = 300.0
+_verified_key = secrets.token_bytes(32)
+_verified: Dict[Tuple[str, bytes], float] = {}
+_verified_lock = threading.Lock()
+
+
+# Worker processes for bcrypt, started by start_hash_pool (None: hash in the calling thread)
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_hash_pool(workers: int) -> None:
+    """Run password hashing/verification in a pool of worker processes.
+    
+    Requests waiting on bcrypt then only block a threadpool thread while
+    the hash runs on another core.
+    """
+    global _hash_pool
+    shutdown_hash_pool()
+    if workers > 0:
+        _hash_pool = ProcessPoolExecutor(max_workers=workers)
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the hashing pool (hashing falls back to the calling thread)."""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
     # Bcrypt has 72-byte limit, truncate to be safe
     password_bytes = plain_password.encode('utf-8')[:72]
     return pwd_context.verify(password_bytes.decode('utf-8', errors='ignore'), hashed_password)
 
 
-def hash_password(password: str) -> str:
-    """Hash a plain password."""
+def _hash(password: str) -> str:
     # Bcrypt has 72-byte limit, truncate to be safe
     password_bytes = password.encode('utf-8')[:72]
     return pwd_context.hash(password_bytes.decode('utf-8', errors='ignore'))
 
 
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hashed password.
+    
+    A match is remembered for _VERIFIED_TTL_SECONDS (as an HMAC of the
+    password under a per-process key, never the password itself), so repeat
+    logins skip bcrypt.
+    """
+    digest = hmac.new(_verified_key, plain_password.encode("utf-8"), hashlib.sha256).digest()
+    cache_key = (hashed_password, digest)
+    now = time.monotonic()
+    expires = _verified.get(cache_key)
+    if expires is not None and expires > now:
+        return True
+    
+    if _hash_pool is not None:
+        ok = _hash_pool.submit(_verify, plain_password, hashed_password).result()
+    else:
+        ok = _verify(plain_password, hashed_password)
+    if ok:
+        with _verified_lock:
+            _verified.pop(cache_key, None)
+            if len(_verified) >= _VERIFIED_CACHE_SIZE:
+                del _verified[next(iter(_verified))]
+            _verified[cache_key] = now + _VERIFIED_TTL_SECONDS
+    return ok
+
+
+def hash_password(password: str) -> str:
+    """Hash a plain password."""
+    if _hash_pool is not None:
+        return _hash_pool.submit(_hash, password).result()
+    return _hash(password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -44,3 +120,22 @@ def decode_token(token: str) -> Dict[str, Any]:
         return payload
     except JWTError:
         raise ValueError("Invalid token")
+
+
+def decode_token_cached(token: str) -> Dict[str, Any]:
+    """Decode a JWT token, reusing the payload for tokens seen before.
+    
+    Must be called from the event loop thread: the lookup and the decode run
+    without an await in between, so concurrent requests carrying the same
+    token never decode it more than once. Expired entries are re-validated
+    (and rejected) by decode_token.
+    """
+    payload = _decoded_tokens.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
+    payload = decode_token(token)
+    if len(_decoded_tokens) >= _DECODED_TOKEN_CACHE_SIZE:
+        del _decoded_tokens[next(iter(_decoded_tokens))]
+    _decoded_tokens[token] = payload
+    return payload
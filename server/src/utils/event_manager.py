@@ -28,7 +28,7 @@ class EventManager:
             if user_id not in self.subscribers:
                 self.subscribers[user_id] = []
             self.subscribers[user_id].append(queue)
-            logger.info(f"Client subscribed to events for user {user_id}")
+            logger.info("Client subscribed to events for user %s", user_id)
     
     async def unsubscribe(self, user_id: str, queue: asyncio.Queue):
         """Unsubscribe a client from receiving events.
@@ -43,7 +43,7 @@ class EventManager:
                     self.subscribers[user_id].remove(queue)
                     if not self.subscribers[user_id]:
                         del self.subscribers[user_id]
-                    logger.info(f"Client unsubscribed from events for user {user_id}")
+                    logger.info("Client unsubscribed from events for user %s", user_id)
                 except ValueError:
                     pass
     
@@ -64,7 +64,7 @@ class EventManager:
             subscribers = self.subscribers.get(user_id, [])
         
         if not subscribers:
-            logger.debug(f"No subscribers for user {user_id}, skipping broadcast")
+            logger.debug("No subscribers for user %s, skipping broadcast", user_id)
             return
         
         event = {
@@ -79,10 +79,10 @@ class EventManager:
             try:
                 await asyncio.wait_for(queue.put(event), timeout=1.0)
             except asyncio.TimeoutError:
-                logger.warning(f"Timeout sending event to subscriber for user {user_id}")
+                logger.warning("Timeout sending event to subscriber for user %s", user_id)
                 dead_queues.append(queue)
             except Exception as e:
-                logger.error(f"Error sending event to subscriber: {e}")
+                logger.error("Error sending event to subscriber: %s", e)
                 dead_queues.append(queue)
         
         # Clean up dead queues
@@ -96,7 +96,7 @@ class EventManager:
                 if user_id in self.subscribers and not self.subscribers[user_id]:
                     del self.subscribers[user_id]
         
-        logger.info(f"Broadcasted {event_type} event to {len(subscribers) - len(dead_queues)} subscribers for user {user_id}")
+        logger.info("Broadcasted %s event to %s subscribers for user %s", event_type, len(subscribers) - len(dead_queues), user_id)
     
     async def get_subscriber_count(self, user_id: Optional[str] = None) -> int:
         """Get number of active subscribers.
@@ -1,31 +1,117 @@
 """Game logic utilities: pattern matching, scoring."""
 
+from datetime import datetime
+from typing import Dict, Optional
+
+# Game status groups (frozensets: O(1) membership, built once at import)
+FINISHED_STATUSES = frozenset(("WON", "LOST", "ABORTED"))
+SCORED_STATUSES = frozenset(("WON", "LOST"))
+
+# Server-side game fields that are never sent to clients
+INTERNAL_GAME_FIELDS = frozenset((
+    "_secret_norm", "_created_dt", "_guessed_set", "_letter_masks", "_revealed", "_full_mask"
+))
+# Fields left out of game responses while the game is in progress
+HIDDEN_GAME_FIELDS = INTERNAL_GAME_FIELDS | {"secret"}
+
+
+# Romanian diacritics -> ASCII, applied after lower() in a single translate pass
+_NORM_TABLE = str.maketrans({'ă': 'a', 'â': 'a', 'î': 'i', 'ș': 's', 'ț': 't'})
+
 
 def normalize(s: str) -> str:
     """Normalize Romanian diacritics for case-insensitive comparison.
     
     Converts: ă→a, â→a, î→i, ș→s, ț→t
     """
-    return s.lower().replace('ă', 'a').replace('â', 'a').replace('î', 'i').replace('ș', 's').replace('ț', 't')
+    return s.lower().translate(_NORM_TABLE)
 
 
-def update_pattern(secret: str, pattern: str, letter: str) -> str:
+def update_pattern(secret: str, pattern: str, letter: str, secret_norm: Optional[str] = None) -> str:
     """Update the pattern by revealing positions where the letter appears in the secret word.
     
     Args:
         secret: The secret word
         pattern: Current pattern (e.g., "***d***")
         letter: Letter to reveal
+        secret_norm: normalize(secret), if already computed (e.g. stored on the game)
         
     Returns:
         Updated pattern with revealed letter positions
     """
     letter_norm = normalize(letter)
-    result = list(pattern)
-    for i, c in enumerate(secret):
-        if normalize(c) == letter_norm:
-            result[i] = secret[i]
-    return ''.join(result)
+    if secret_norm is None:
+        secret_norm = normalize(secret)
+    if len(secret_norm) != len(secret):
+        # Lowercasing changed the length (rare Unicode); compare per character
+        secret_norm = [normalize(c) for c in secret]
+    if letter_norm not in secret_norm:
+        # Miss: one C-level search instead of rebuilding the pattern
+        return pattern
+    return ''.join(
+        c if n == letter_norm else p for c, n, p in zip(secret, secret_norm, pattern)
+    )
+
+
+def letter_masks(secret: str, secret_norm: Optional[str] = None) -> Dict[str, int]:
+    """Map each normalized letter of the secret to a bitmask of its positions (bit i = index i).
+    
+    Built once per game: a guess then reveals with one dict lookup and an
+    OR into the game's revealed mask instead of walking the secret.
+    """
+    if secret_norm is None:
+        secret_norm = normalize(secret)
+    if len(secret_norm) != len(secret):
+        # Lowercasing changed the length (rare Unicode); normalize per character
+        secret_norm = [normalize(c) for c in secret]
+    masks: Dict[str, int] = {}
+    for i, c in enumerate(secret_norm):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def pattern_mask(pattern: str) -> int:
+    """Bitmask of the revealed (non-'*') positions of a pattern."""
+    mask = 0
+    for i, c in enumerate(pattern):
+        if c != '*':
+            mask |= 1 << i
+    return mask
+
+
+def reveal_mask(secret: str, pattern: str, mask: int) -> str:
+    """Return pattern with the positions set in mask showing the secret's characters.
+    
+    Only the unchanged runs between revealed positions are sliced, so the
+    work is per revealed position rather than per character.
+    """
+    if not mask:
+        return pattern
+    pieces = []
+    start = 0
+    while mask:
+        low = mask & -mask
+        i = low.bit_length() - 1
+        pieces.append(pattern[start:i])
+        pieces.append(secret[i])
+        start = i + 1
+        mask ^= low
+    pieces.append(pattern[start:])
+    return ''.join(pieces)
+
+
+def game_created_dt(game: dict) -> Optional[datetime]:
+    """Naive UTC creation time of a game, parsing created_at only if it was not stored."""
+    created = game.get("_created_dt")
+    if created is None and game.get("created_at"):
+        created = datetime.fromisoformat(game["created_at"].replace("Z", "+00:00")).replace(tzinfo=None)
+    return created
+
+
+def public_game(game: dict, reveal_secret: bool = False) -> dict:
+    """Copy of a game without internal fields (and without the secret unless revealed)."""
+    hidden = INTERNAL_GAME_FIELDS if reveal_secret else HIDDEN_GAME_FIELDS
+    return {k: v for k, v in game.items() if k not in hidden}
 
 
 def calculate_score(
@@ -24,7 +24,7 @@ def _cleanup_expired_keys(ttl_hours: int = 24):
     for key in expired_keys:
         del _idempotency_store[key]
     if expired_keys:
-        logger.debug(f"Cleaned up {len(expired_keys)} expired idempotency keys")
+        logger.debug("Cleaned up %s expired idempotency keys", len(expired_keys))
 
 
 def idempotent(
@@ -77,7 +77,7 @@ def idempotent(
             
             if not request:
                 # No request object found, execute without idempotency
-                logger.warning(f"Idempotent decorator: Request object not found in {func.__name__}")
+                logger.warning("Idempotent decorator: Request object not found in %s", func.__name__)
                 return await func(*args, **kwargs)
             
             # Check for idempotency key in headers
@@ -96,7 +96,7 @@ def idempotent(
                     body_hash = hashlib.sha256(body).hexdigest()[:16]
                     composite_key = f"{user_id}:{idempotency_key}:{body_hash}"
                 except Exception as e:
-                    logger.warning(f"Failed to read request body for idempotency: {e}")
+                    logger.warning("Failed to read request body for idempotency: %s", e)
                     composite_key = f"{user_id}:{idempotency_key}"
             else:
                 composite_key = f"{user_id}:{idempotency_key}"
@@ -111,7 +111,7 @@ def idempotent(
                 
                 # Check if not expired
                 if datetime.utcnow() - timestamp < timedelta(hours=ttl_hours):
-                    logger.info(f"Idempotency replay: key={idempotency_key}, func={func.__name__}")
+                    logger.info("Idempotency replay: key=%s, func=%s", idempotency_key, func.__name__)
                     return cached_result
                 else:
                     # Expired, remove from store
@@ -122,7 +122,7 @@ def idempotent(
             
             # Store the result
             _idempotency_store[composite_key] = (result, datetime.utcnow())
-            logger.debug(f"Idempotency stored: key={idempotency_key}, func={func.__name__}")
+            logger.debug("Idempotency stored: key=%s, func=%s", idempotency_key, func.__name__)
             
             return result
         
@@ -135,7 +135,7 @@ def clear_idempotency_store():
     global _idempotency_store
     count = len(_idempotency_store)
     _idempotency_store.clear()
-    logger.info(f"Cleared {count} idempotency keys from store")
+    logger.info("Cleared %s idempotency keys from store", count)
 
 
 def get_idempotency_stats() -> dict[str, Any]:
@@ -146,3 +146,82 @@ class LoginAttemptTracker:
             # Account is locked
             remaining = self.get_lockout_remaining(email)
             return remaining if remaining else 0
+
+
+class RedisLoginAttemptTracker(LoginAttemptTracker):
+    """Login attempt tracker whose counters live in Redis.
+    
+    Every worker process sees the same counters and lockouts, so running
+    several workers does not multiply the allowed attempts. Keys:
+    
+    - auth:failed:{email}: failed attempt counter, expires attempt_window
+      after the first failure of the window
+    - auth:locked:{email}: present while the account is locked; its TTL is
+      the remaining lockout
+    """
+    
+    def __init__(
+        self,
+        client,
+        max_attempts: int = 5,
+        lockout_duration_minutes: int = 15,
+        attempt_window_minutes: int = 15
+    ):
+        """
+        Initialize Redis-backed login attempt tracker.
+        
+        Args:
+            client: Synchronous redis.Redis client
+            max_attempts: Maximum failed attempts before lockout
+            lockout_duration_minutes: Duration of account lockout in minutes
+            attempt_window_minutes: Time window to reset failed attempts counter
+        """
+        super().__init__(max_attempts, lockout_duration_minutes, attempt_window_minutes)
+        self._redis = client
+        self._lockout_seconds = lockout_duration_minutes * 60
+        self._window_seconds = attempt_window_minutes * 60
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisLoginAttemptTracker":
+        """Create a tracker connected to the Redis server at url."""
+        import redis  # only needed when the Redis tracker is enabled
+        return cls(redis.Redis.from_url(url), **kwargs)
+    
+    @staticmethod
+    def _failed_key(email: str) -> str:
+        return f"auth:failed:{email}"
+    
+    @staticmethod
+    def _locked_key(email: str) -> str:
+        return f"auth:locked:{email}"
+    
+    def is_locked(self, email: str) -> bool:
+        """Check if account is currently locked due to failed attempts."""
+        return bool(self._redis.exists(self._locked_key(email)))
+    
+    def get_lockout_remaining(self, email: str) -> Optional[int]:
+        """Get remaining lockout time in seconds, or None if not locked."""
+        ttl = self._redis.ttl(self._locked_key(email))
+        return ttl if ttl > 0 else None
+    
+    def record_failed_attempt(self, email: str) -> None:
+        """Record a failed login attempt and apply lockout if needed."""
+        failed_key = self._failed_key(email)
+        # One MULTI/EXEC round-trip: start the window (and its TTL) if this is
+        # the first failure, then count this one
+        pipe = self._redis.pipeline()
+        pipe.set(failed_key, 0, nx=True, ex=self._window_seconds)
+        pipe.incr(failed_key)
+        _, failed_attempts = pipe.execute()
+        
+        if failed_attempts >= self.max_attempts:
+            self._redis.set(self._locked_key(email), 1, nx=True, ex=self._lockout_seconds)
+    
+    def record_successful_login(self, email: str) -> None:
+        """Reset failed attempts counter after successful login."""
+        self._redis.delete(self._failed_key(email), self._locked_key(email))
+    
+    def get_failed_attempts(self, email: str) -> int:
+        """Get the number of failed attempts for an email."""
+        value = self._redis.get(self._failed_key(email))
+        return int(value) if value else 0
@@ -0,0 +1,69 @@
+"""In-memory TTL cache for read-heavy GET endpoints."""
+
+import time
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """TTL cache for computed endpoint payloads.
+
+    Callers include a data version (see the repositories' ``version``
+    property) in the key, so any write makes older entries unreachable
+    without explicit invalidation; the TTL bounds staleness for time-window
+    queries such as ``period=1d``.
+
+    In production with several workers, this should be replaced with Redis.
+    """
+
+    def __init__(self, default_ttl: float = 60.0, max_entries: int = 1024):
+        self._store: Dict[Hashable, Tuple[float, Any]] = {}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get cached value, or None if missing or expired."""
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._store.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store value under key for ttl_seconds (default_ttl if omitted)."""
+        if len(self._store) >= self.max_entries:
+            # Evict the oldest entry (dicts keep insertion order)
+            self._store.pop(next(iter(self._store)), None)
+        ttl = self.default_ttl if ttl_seconds is None else ttl_seconds
+        self._store[key] = (time.monotonic() + ttl, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl_seconds: Optional[float] = None) -> Any:
+        """Return cached value for key, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value, ttl_seconds)
+        return value
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """Drop entries whose key starts with namespace (all entries if None)."""
+        if namespace is None:
+            count = len(self._store)
+            self._store.clear()
+        else:
+            keys = [k for k in self._store if isinstance(k, tuple) and k and k[0] == namespace]
+            for key in keys:
+                del self._store[key]
+            count = len(keys)
+        if count:
+            logger.debug("Invalidated %s cached responses", count)
+        return count
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -0,0 +1,25 @@
+"""UTC timestamp formatting helpers."""
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+# (epoch second, ISO 8601 string) of the last timestamp formatted
+_last_iso: Tuple[int, str] = (-1, "")
+
+
+def now_iso_z() -> str:
+    """Current UTC time as an ISO 8601 string with second precision ("...T12:34:56Z").
+    
+    The string is formatted at most once per second and reused, so bursts
+    of writes (registrations, error responses) share one formatting call.
+    Use datetime.utcnow() directly where sub-second precision matters,
+    e.g. game timings.
+    """
+    global _last_iso
+    second = int(time.time())
+    cached_second, iso = _last_iso
+    if second != cached_second:
+        iso = datetime.utcfromtimestamp(second).isoformat() + "Z"
+        _last_iso = (second, iso)
+    return iso
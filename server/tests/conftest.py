@@ -51,15 +51,24 @@ class MockUserRepository(UserRepository):
         self.users[user_data["user_id"]] = user_data
         return user_data
     
+    def next_user_id(self) -> str:
+        user_id = f"u_{self.next_id}"
+        self.next_id += 1
+        return user_id
+    
     def get_by_id(self, user_id: str) -> Dict[str, Any] | None:
         return self.users.get(user_id)
     
     def get_by_email(self, email: str) -> Dict[str, Any] | None:
         for user in self.users.values():
-            if user["email"] == email:
+            if user["email"].lower() == email.lower():
                 return user
         return None
     
+    def is_admin(self, user_id: str) -> bool:
+        user = self.users.get(user_id)
+        return bool(user and user.get("is_admin"))
+    
     def get_all(self) -> List[Dict[str, Any]]:
         return list(self.users.values())
     
@@ -130,9 +139,23 @@ class MockGameRepository(GameRepository):
     def get_by_id(self, game_id: str) -> Dict[str, Any] | None:
         return self.games.get(game_id)
     
+    def peek_by_id(self, game_id: str) -> Dict[str, Any] | None:
+        return self.games.get(game_id)
+    
     def get_by_session(self, session_id: str) -> List[Dict[str, Any]]:
         return [g for g in self.games.values() if g["session_id"] == session_id]
     
+    def get_session_page(self, session_id: str, offset: int, limit: int, exclude=()):
+        games = self.get_by_session(session_id)
+        page = [{k: v for k, v in g.items() if k not in exclude} for g in games[offset:offset + limit]]
+        return page, len(games)
+    
+    def get_by_sessions(self, session_ids: List[str]) -> List[Dict[str, Any]]:
+        return [g for g in self.games.values() if g["session_id"] in session_ids]
+    
+    def get_used_secrets(self, session_id: str) -> set:
+        return {g["secret"] for g in self.get_by_session(session_id)}
+    
     def get_all(self) -> List[Dict[str, Any]]:
         return list(self.games.values())
     
@@ -13,7 +13,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.exceptions import (
     UserAlreadyExistsException,
     InvalidCredentialsException,
-    UserNotFoundException
+    UserNotFoundException,
+    InvalidPasswordException
 )
 
 
@@ -114,6 +115,25 @@ class TestAuthServiceRegister:
         assert login_result["user_id"] == result["user_id"]
 
 
+    @pytest.mark.parametrize("password,message", [
+        ("Ab1", "at least 8 characters"),
+        ("abcdefg1", "uppercase"),
+        ("ABCDEFG1", "lowercase"),
+        ("Abcdefgh", "number"),
+    ])
+    def test_register_weak_password_rejected(self, auth_service, password, message):
+        """Test that each password rule is enforced with its own message."""
+        with pytest.raises(InvalidPasswordException) as exc_info:
+            auth_service.register_user(email="weak@example.com", password=password)
+        
+        assert message in exc_info.value.detail
+    
+    def test_register_accepts_non_ascii_letters(self, auth_service):
+        """Test that Unicode upper/lowercase letters count toward the rules."""
+        result = auth_service.register_user(email="diacritice@example.com", password="ĂÎȘȚâîșț1")
+        
+        assert result["email"] == "diacritice@example.com"
+
 @pytest.mark.unit
 class TestAuthServiceLogin:
     """Test user login functionality."""
@@ -184,3 +204,26 @@ class TestAuthServiceTokenManagement:
         """Test getting non-existent user."""
         with pytest.raises(UserNotFoundException):
             auth_service.get_user_by_id("u_nonexistent")
+
+
+@pytest.mark.unit
+class TestAuthServicePasswordReset:
+    """Test reset token bookkeeping."""
+    
+    def test_expired_tokens_purged_on_next_request(self, auth_service, created_user):
+        """Test that expired tokens are dropped without being used."""
+        old = auth_service.request_password_reset(created_user["email"])["token"]
+        auth_service._reset_tokens[old]["expires_at"] = 0.0
+        
+        new = auth_service.request_password_reset(created_user["email"])["token"]
+        
+        assert list(auth_service._reset_tokens) == [new]
+        
+    def test_outstanding_tokens_capped(self, auth_service, created_user, monkeypatch):
+        """Test that the oldest token is dropped once the cap is reached."""
+        from src.services import auth_service as auth_module
+        monkeypatch.setattr(auth_module, "MAX_RESET_TOKENS", 2)
+        
+        tokens = [auth_service.request_password_reset(created_user["email"])["token"] for _ in range(3)]
+        
+        assert list(auth_service._reset_tokens) == tokens[1:]
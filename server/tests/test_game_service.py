@@ -91,6 +91,29 @@ class TestGameServiceCreation:
             )
 
 
+    def test_seeded_sessions_replay_the_same_words(self, game_service, mock_game_repo, session_service, created_user):
+        """Test that sessions with the same seed draw the same word sequence."""
+        sequences = []
+        for _ in range(2):
+            session = session_service.create_session(
+                user_id=created_user["user_id"],
+                num_games=3,
+                dictionary_id="dict_ro_basic",
+                difficulty="medium",
+                language="ro",
+                max_misses=6,
+                allow_word_guess=True,
+                seed=42
+            )
+            game_ids = [
+                game_service.create_game(session["session_id"], created_user["user_id"])["game_id"]
+                for _ in range(3)
+            ]
+            sequences.append([mock_game_repo.get_by_id(g)["secret"] for g in game_ids])
+        
+        assert sequences[0] == sequences[1]
+        assert len(set(sequences[0])) == 3
+
 @pytest.mark.unit
 class TestGameServiceGuesses:
     """Test guess processing functionality."""
@@ -150,13 +150,13 @@ class TestDictionaryAdminEndpoints:
         response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={
+            json={
                 "name": "test_dict_create",
                 "description": "Test dictionary for creation",
                 "language": "ro",
-                "difficulty": "medium"
-            },
-            json=["test", "word", "list", "create"]
+                "difficulty": "medium",
+                "words": ["test", "word", "list", "create"]
+            }
         )
         
         assert response.status_code == 201
@@ -172,16 +172,14 @@ class TestDictionaryAdminEndpoints:
         client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "duplicate_test"},
-            json=["word1", "word2"]
+            json={"name": "duplicate_test", "words": ["word1", "word2"]}
         )
         
         # Try to create with same name (will have same dict_id)
         response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "duplicate_test"},
-            json=["word3", "word4"]
+            json={"name": "duplicate_test", "words": ["word3", "word4"]}
         )
         
         # Should fail with 400 or 409 (either is acceptable for duplicate)
@@ -194,8 +192,7 @@ class TestDictionaryAdminEndpoints:
         response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "empty_dict"},
-            json=[]
+            json={"name": "empty_dict", "words": []}
         )
         
         assert response.status_code == 400
@@ -207,8 +204,7 @@ class TestDictionaryAdminEndpoints:
         response = client.post(
             "/api/v1/admin/dictionaries",
             headers=regular_user_headers,
-            params={"name": "unauthorized_dict"},
-            json=["test", "words"]
+            json={"name": "unauthorized_dict", "words": ["test", "words"]}
         )
         
         assert response.status_code == 403
@@ -221,8 +217,7 @@ class TestDictionaryAdminEndpoints:
         create_response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "update_test"},
-            json=["original", "words"]
+            json={"name": "update_test", "words": ["original", "words"]}
         )
         assert create_response.status_code == 201
         # Get dict_id or dictionary_id from response
@@ -251,8 +246,7 @@ class TestDictionaryAdminEndpoints:
         create_response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "deactivate_test"},
-            json=["test", "words"]
+            json={"name": "deactivate_test", "words": ["test", "words"]}
         )
         assert create_response.status_code == 201
         # Get dict_id or dictionary_id from response
@@ -300,8 +294,7 @@ class TestDictionaryAdminEndpoints:
         create_response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "delete_test"},
-            json=["word1", "word2", "word3"]
+            json={"name": "delete_test", "words": ["word1", "word2", "word3"]}
         )
         assert create_response.status_code == 201
         created_data = create_response.json()
@@ -356,8 +349,7 @@ class TestDictionaryAdminEndpoints:
         create_response = client.post(
             "/api/v1/admin/dictionaries",
             headers=admin_headers,
-            params={"name": "in_use_test"},
-            json=["test", "word", "list"]
+            json={"name": "in_use_test", "words": ["test", "word", "list"]}
         )
         assert create_response.status_code == 201
         created_data = create_response.json()
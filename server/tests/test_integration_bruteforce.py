@@ -109,6 +109,30 @@ class TestBruteForceProtection:
         data = response.json()
         assert "locked" in data.get("detail", "").lower() or "locked" in data.get("message", "").lower()
     
+    def test_lockout_ignores_email_case(self, client):
+        """Test that case variants of an email share one counter and lockout."""
+        import uuid
+        email = f"case_{uuid.uuid4().hex[:8]}@example.com"
+        password = "ValidPass123!"
+        client.post("/api/v1/auth/register", json={"email": email, "password": password})
+        
+        # Spread the failures over different spellings of the same address
+        variants = [email, email.upper(), email.capitalize(), email, email.upper()]
+        for i, variant in enumerate(variants):
+            response = client.post(
+                "/api/v1/auth/login",
+                json={"email": variant, "password": f"WrongPass{i}!"}
+            )
+            assert response.status_code == 401
+        
+        # Correct password under yet another case must still be locked out
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": email.upper(), "password": password}
+        )
+        assert response.status_code == 401
+        assert response.json()["error_code"] == "ACCOUNT_LOCKED"
+    
     def test_lockout_includes_remaining_time(self, client, registered_user):
         """Test that lockout response includes remaining time."""
         email = registered_user["email"]
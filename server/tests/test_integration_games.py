@@ -255,3 +255,26 @@ class TestGameEndpoints:
         )
         
         assert response.status_code == 404
+        
+    def test_other_users_game_forbidden(self, client, auth_headers, session_id):
+        """Test that another user's game is rejected with the standard 403 body."""
+        game_id = client.post(
+            f"/api/v1/sessions/{session_id}/games",
+            headers=auth_headers
+        ).json()["game_id"]
+        client.post(
+            "/api/v1/auth/register",
+            json={"email": "gameintruder@example.com", "password": "Intruder123!"}
+        )
+        token = client.post(
+            "/api/v1/auth/login",
+            json={"email": "gameintruder@example.com", "password": "Intruder123!"}
+        ).json()["access_token"]
+        
+        response = client.get(
+            f"/api/v1/sessions/{session_id}/games/{game_id}/state",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 403
+        assert response.json()["error_code"] == "FORBIDDEN"
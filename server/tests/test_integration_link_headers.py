@@ -237,3 +237,27 @@ class TestLinkHeaderPagination:
             assert "page" in data["pagination"]
             assert "page_size" in data["pagination"]
             assert "total" in data["pagination"] or "total_items" in data["pagination"]
+    
+    def test_sessions_list_pages_only_when_requested(self, registered_user_with_session):
+        """Test that GET /sessions paginates (with Link header) only when page is given."""
+        token = registered_user_with_session["token"]
+        session_id = registered_user_with_session["session_id"]
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        response = client.get("/api/v1/sessions", headers=headers)
+        assert response.status_code == 200
+        assert "Link" not in response.headers
+        assert [s["session_id"] for s in response.json()] == [session_id]
+        assert response.json()[0]["games_created"] == len(registered_user_with_session["game_ids"])
+        
+        response = client.get("/api/v1/sessions?page=1&page_size=1", headers=headers)
+        assert response.status_code == 200
+        assert 'rel="first"' in response.headers["Link"]
+        assert [s["session_id"] for s in response.json()] == [session_id]
+        
+        response = client.get("/api/v1/sessions?page=2&page_size=1", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == []
+        
+        response = client.get("/api/v1/sessions?page=0", headers=headers)
+        assert response.status_code == 400
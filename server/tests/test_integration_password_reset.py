@@ -95,7 +95,7 @@ def test_reset_password_invalid_token(client: TestClient):
 
 def test_reset_password_expired_token(client: TestClient, test_user):
     """Test password reset with expired token."""
-    from datetime import datetime, timedelta, timezone
+    import time
     from src.main import auth_service
     
     # Request reset token
@@ -107,7 +107,7 @@ def test_reset_password_expired_token(client: TestClient, test_user):
     
     # Manually expire the token by setting past expiration time
     if token in auth_service._reset_tokens:
-        past_time = (datetime.now(timezone.utc) - timedelta(minutes=20)).isoformat()
+        past_time = time.time() - 20 * 60
         auth_service._reset_tokens[token]["expires_at"] = past_time
     
     # Try to reset with expired token
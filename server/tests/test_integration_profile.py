@@ -169,6 +169,27 @@ class TestProfileUpdate:
         assert data["email"] == same_email
         assert data["nickname"] == "ChangedNick"
     
+    def test_update_email_case_only_allowed(self, registered_user, user_repo):
+        """Test that changing only the letter case of your own email is allowed."""
+        token = registered_user["token"]
+        new_email = registered_user["email"].capitalize()
+        
+        response = client.patch(
+            "/api/v1/users/me",
+            json={"email": new_email},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["email"] == new_email
+        assert user_repo.get_by_email(registered_user["email"])["user_id"] == registered_user["user_id"]
+        
+        login_response = client.post("/api/v1/auth/login", json={
+            "email": new_email,
+            "password": registered_user["password"]
+        })
+        assert login_response.status_code == 200
+    
     def test_update_without_token_fails(self, registered_user):
         """Test that update without authentication returns 401."""
         response = client.patch(
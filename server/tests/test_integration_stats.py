@@ -137,6 +137,12 @@ class TestStatsEndpoints:
         
         assert response.status_code == 403
         
+    def test_get_user_stats_requires_token(self, client):
+        """Test that user stats need authentication."""
+        response = client.get("/api/v1/users/other_user_id/stats")
+        
+        assert response.status_code == 401
+        
     def test_get_global_stats(self, client):
         """Test getting global statistics."""
         response = client.get("/api/v1/stats/global")
@@ -183,3 +189,48 @@ class TestStatsEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["period"] == "week"
+        
+    def test_get_leaderboard_etag_not_modified(self, client):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        response = client.get("/api/v1/leaderboard?limit=5")
+        
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+        
+        response = client.get("/api/v1/leaderboard?limit=5", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+        
+    def test_etags_unchanged_by_guess_in_unfinished_game(self, client, auth_headers):
+        """Test that a guess that does not finish a game keeps stats ETags valid."""
+        headers = auth_headers["headers"]
+        session = client.post("/api/v1/sessions", headers=headers, json={
+            "num_games": 1,
+            "dictionary_id": "dict_ro_basic",
+            "difficulty": "easy",
+            "language": "ro",
+            "max_misses": 6,
+            "allow_word_guess": True
+        }).json()
+        game = client.post(f"/api/v1/sessions/{session['session_id']}/games", headers=headers).json()
+        before = [client.get(url).headers["ETag"] for url in ("/api/v1/leaderboard", "/api/v1/stats/global")]
+        
+        response = client.post(
+            f"/api/v1/sessions/{session['session_id']}/games/{game['game_id']}/guess",
+            headers=headers,
+            json={"letter": "a"}
+        )
+        assert response.json()["status"] == "IN_PROGRESS"
+        
+        after = [client.get(url).headers["ETag"] for url in ("/api/v1/leaderboard", "/api/v1/stats/global")]
+        assert after == before
+        
+    def test_get_global_stats_etag_varies_by_period(self, client):
+        """Test that global stats ETags differ per period."""
+        all_time = client.get("/api/v1/stats/global")
+        weekly = client.get("/api/v1/stats/global?period=7d")
+        
+        assert all_time.headers["ETag"] != weekly.headers["ETag"]
@@ -0,0 +1,178 @@
+"""
+Unit tests for the Redis-backed login attempt tracker.
+Uses a small in-memory stand-in for the redis client with a manual clock.
+"""
+
+import math
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.exceptions import AccountLockedException, InvalidCredentialsException
+from src.utils.login_tracker import RedisLoginAttemptTracker
+
+
+class StubRedis:
+    """Minimal synchronous redis client: strings, counters and key expiry."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self._data = {}
+    
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry and entry[1] is not None and entry[1] <= self.now:
+            del self._data[key]
+            return None
+        return entry
+    
+    def exists(self, *keys) -> int:
+        return sum(1 for key in keys if self._live(key))
+    
+    def ttl(self, key) -> int:
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return math.ceil(entry[1] - self.now)
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and self._live(key):
+            return None
+        self._data[key] = (str(value).encode(), self.now + ex if ex else None)
+        return True
+    
+    def incr(self, key) -> int:
+        entry = self._live(key)
+        value = int(entry[0]) + 1 if entry else 1
+        self._data[key] = (str(value).encode(), entry[1] if entry else None)
+        return value
+    
+    def get(self, key):
+        entry = self._live(key)
+        return entry[0] if entry else None
+    
+    def delete(self, *keys) -> int:
+        return sum(1 for key in keys if self._data.pop(key, None))
+    
+    def pipeline(self):
+        return StubPipeline(self)
+
+
+class StubPipeline:
+    """Queues commands and runs them in order on execute()."""
+    
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+    
+    def execute(self):
+        results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+
+@pytest.fixture
+def redis_client():
+    """Provide an empty stub redis client."""
+    return StubRedis()
+
+
+@pytest.fixture
+def tracker(redis_client):
+    """Provide a Redis tracker locking after 3 failures for 15 minutes."""
+    return RedisLoginAttemptTracker(
+        redis_client, max_attempts=3, lockout_duration_minutes=15, attempt_window_minutes=10
+    )
+
+
+@pytest.mark.unit
+class TestRedisLoginAttemptTracker:
+    """Test lockout, TTL and reset behaviour of the Redis tracker."""
+    
+    def test_locks_after_max_attempts(self, tracker):
+        """Test that the account locks on the max_attempts-th failure."""
+        email = "a@x.com"
+        for _ in range(2):
+            tracker.record_failed_attempt(email)
+        
+        assert tracker.get_failed_attempts(email) == 2
+        assert tracker.is_locked(email) is False
+        
+        tracker.record_failed_attempt(email)
+        
+        assert tracker.get_failed_attempts(email) == 3
+        assert tracker.is_locked(email) is True
+    
+    def test_lockout_remaining_follows_key_ttl(self, tracker, redis_client):
+        """Test that the remaining lockout is the TTL of the lock key."""
+        email = "a@x.com"
+        assert tracker.get_lockout_remaining(email) is None
+        for _ in range(3):
+            tracker.record_failed_attempt(email)
+        
+        assert tracker.get_lockout_remaining(email) == 15 * 60
+        
+        redis_client.now += 300
+        assert tracker.get_lockout_remaining(email) == 10 * 60
+        
+        redis_client.now += 10 * 60
+        assert tracker.get_lockout_remaining(email) is None
+        assert tracker.is_locked(email) is False
+    
+    def test_further_failures_do_not_extend_lockout(self, tracker, redis_client):
+        """Test that failures while locked keep the original lock expiry."""
+        email = "a@x.com"
+        for _ in range(3):
+            tracker.record_failed_attempt(email)
+        redis_client.now += 60
+        tracker.record_failed_attempt(email)
+        
+        assert tracker.get_lockout_remaining(email) == 14 * 60
+    
+    def test_failures_expire_with_window(self, tracker, redis_client):
+        """Test that the counter starts over once the attempt window passes."""
+        email = "a@x.com"
+        for _ in range(2):
+            tracker.record_failed_attempt(email)
+        redis_client.now += 10 * 60
+        tracker.record_failed_attempt(email)
+        
+        assert tracker.get_failed_attempts(email) == 1
+        assert tracker.is_locked(email) is False
+    
+    def test_successful_login_resets(self, tracker):
+        """Test that a successful login clears both the counter and the lock."""
+        email = "a@x.com"
+        for _ in range(3):
+            tracker.record_failed_attempt(email)
+        
+        tracker.record_successful_login(email)
+        
+        assert tracker.is_locked(email) is False
+        assert tracker.get_failed_attempts(email) == 0
+        assert tracker.get_lockout_remaining(email) is None
+    
+    def test_auth_service_tracks_normalized_email(self, auth_service, created_user, redis_client, test_user_data):
+        """Test that login attempts reach the tracker under the lowercased email."""
+        auth_service.login_tracker = RedisLoginAttemptTracker(redis_client, max_attempts=2)
+        email = test_user_data["email"]
+        
+        for variant in (email.upper(), email.capitalize()):
+            with pytest.raises(InvalidCredentialsException):
+                auth_service.login_user(variant, "WrongPass1!")
+        
+        assert redis_client.get(f"auth:failed:{email.lower()}") == b"2"
+        assert redis_client.exists(f"auth:locked:{email.lower()}") == 1
+        with pytest.raises(AccountLockedException):
+            auth_service.login_user(email, test_user_data["password"])
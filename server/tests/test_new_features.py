@@ -409,6 +409,17 @@ def test_tls_config_can_be_enabled():
     assert tls_settings.ssl_certfile == "certs/cert.pem"
 
 
+
+def test_multiple_workers_rejected():
+    """Test that more than one worker fails config validation (state is per process)."""
+    from src.config import Settings
+    
+    multi_worker_settings = Settings(server_workers=4, debug=True)
+    
+    with pytest.raises(ValueError, match="SERVER_WORKERS"):
+        multi_worker_settings.validate_config()
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,512 @@
+"""
+Unit tests for in-memory repositories.
+Tests cross-repository operations and lookup helpers.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.repositories.user_repository import UserRepository
+from src.repositories.session_repository import SessionRepository
+from src.repositories.game_repository import GameRepository
+from src.repositories.dictionary_repository import DictionaryRepository, _read_cached_words
+from src.repositories.leaderboard_repository import LeaderboardRepository
+
+
+@pytest.fixture
+def repos():
+    """Provide fresh user, session and game repositories."""
+    return UserRepository(), SessionRepository(), GameRepository()
+
+
+def _seed_user(user_repo, session_repo, game_repo, user_id: str, num_sessions: int = 2):
+    """Create a user with sessions and one game (plus a guess) per session."""
+    user_repo.create({"user_id": user_id, "email": f"{user_id}@example.com"})
+    for i in range(num_sessions):
+        session_id = f"s_{user_id}_{i}"
+        session_repo.create({"session_id": session_id, "user_id": user_id, "status": "ACTIVE"})
+        game_id = f"g_{user_id}_{i}"
+        game_repo.create({"game_id": game_id, "session_id": session_id, "status": "IN_PROGRESS"})
+        game_repo.add_guess(game_id, {"index": 1, "type": "LETTER", "value": "a"})
+
+
+@pytest.mark.unit
+class TestUserCascadeDelete:
+    """Test UserRepository.cascade_delete."""
+
+    def test_cascade_delete_removes_all_user_data(self, repos):
+        """Test that user, sessions, games and guesses are all removed."""
+        user_repo, session_repo, game_repo = repos
+        _seed_user(user_repo, session_repo, game_repo, "u_1")
+
+        deleted = user_repo.cascade_delete("u_1", session_repo, game_repo)
+
+        assert deleted == {"games": 2, "sessions": 2, "users": 1}
+        assert user_repo.get_by_id("u_1") is None
+        assert session_repo.get_by_user("u_1") == []
+        assert game_repo.count() == 0
+        assert game_repo.get_guesses("g_u_1_0") == []
+
+    def test_cascade_delete_keeps_other_users(self, repos):
+        """Test that other users' data is untouched."""
+        user_repo, session_repo, game_repo = repos
+        _seed_user(user_repo, session_repo, game_repo, "u_1")
+        _seed_user(user_repo, session_repo, game_repo, "u_2", num_sessions=1)
+
+        user_repo.cascade_delete("u_1", session_repo, game_repo)
+
+        assert user_repo.exists("u_2")
+        assert len(session_repo.get_by_user("u_2")) == 1
+        assert len(game_repo.get_by_session("s_u_2_0")) == 1
+
+    def test_cascade_delete_unknown_user(self, repos):
+        """Test that deleting an unknown user removes nothing."""
+        user_repo, session_repo, game_repo = repos
+        _seed_user(user_repo, session_repo, game_repo, "u_1")
+
+        version = user_repo.version
+
+        deleted = user_repo.cascade_delete("u_missing", session_repo, game_repo)
+
+        assert deleted == {"games": 0, "sessions": 0, "users": 0}
+        assert game_repo.count() == 2
+        assert user_repo.version == version
+
+    def test_cascade_delete_removes_leaderboard_row(self, repos):
+        """Test that the user's leaderboard row goes in the same call."""
+        user_repo, session_repo, game_repo = repos
+        _seed_user(user_repo, session_repo, game_repo, "u_1")
+        leaderboard_repo = LeaderboardRepository()
+        leaderboard_repo.record_game("u_1", {"session_id": "s_u_1_0", "status": "WON", "composite_score": 900.0})
+
+        user_repo.cascade_delete("u_1", session_repo, game_repo, leaderboard_repo)
+
+        assert leaderboard_repo.get("u_1") is None
+        assert leaderboard_repo.count_ranked() == 0
+
+
+@pytest.mark.unit
+class TestUserEmailIndex:
+    """Test UserRepository's email lookup index."""
+
+    def test_get_by_email_tracks_updates_and_deletes(self, repos):
+        """Test that email lookups follow email changes and deletions."""
+        user_repo, session_repo, game_repo = repos
+        user_repo.create({"user_id": "u_1", "email": "a@example.com"})
+        user_repo.create({"user_id": "u_2", "email": "b@example.com"})
+
+        assert user_repo.get_by_email("a@example.com")["user_id"] == "u_1"
+
+        user_repo.update("u_1", {"email": "c@example.com"})
+        assert user_repo.get_by_email("a@example.com") is None
+        assert user_repo.get_by_email("c@example.com")["user_id"] == "u_1"
+
+        user_repo.delete("u_1")
+        user_repo.cascade_delete("u_2", session_repo, game_repo)
+        assert user_repo.get_by_email("c@example.com") is None
+        assert user_repo.get_by_email("b@example.com") is None
+
+    def test_get_by_email_ignores_case(self, repos):
+        """Test that email lookups match regardless of letter case."""
+        user_repo, _, _ = repos
+        user_repo.create({"user_id": "u_1", "email": "Ana@Example.com"})
+
+        assert user_repo.get_by_email("ana@example.com")["user_id"] == "u_1"
+        user_repo.update("u_1", {"email": "ana@example.com"})
+        assert user_repo.get_by_email("ANA@EXAMPLE.COM")["user_id"] == "u_1"
+
+
+@pytest.mark.unit
+class TestUserIds:
+    """Test UserRepository.next_user_id."""
+
+    def test_ids_not_reused_after_delete(self, repos):
+        """Test that deleting a user does not hand its ID out again."""
+        user_repo, _, _ = repos
+        first = user_repo.next_user_id()
+        user_repo.create({"user_id": first, "email": "a@example.com"})
+        second = user_repo.next_user_id()
+        user_repo.create({"user_id": second, "email": "b@example.com"})
+        user_repo.delete(first)
+
+        third = user_repo.next_user_id()
+        assert len({first, second, third}) == 3
+        assert not user_repo.exists(third)
+
+
+@pytest.mark.unit
+class TestUserAdminIndex:
+    """Test UserRepository's admin ID set."""
+
+    def test_is_admin_tracks_creates_updates_and_deletes(self, repos):
+        """Test that the admin flag follows creates, updates and deletes."""
+        user_repo, session_repo, game_repo = repos
+        user_repo.create({"user_id": "u_1", "email": "a@example.com", "is_admin": True})
+        user_repo.create({"user_id": "u_2", "email": "b@example.com", "is_admin": False})
+
+        assert user_repo.is_admin("u_1") is True
+        assert user_repo.is_admin("u_2") is False
+        assert user_repo.is_admin("u_missing") is False
+
+        user_repo.update("u_1", {"email": "c@example.com"})
+        assert user_repo.is_admin("u_1") is True
+        user_repo.update("u_2", {"is_admin": True})
+        user_repo.update("u_1", {"is_admin": False})
+        assert user_repo.is_admin("u_1") is False
+        assert user_repo.is_admin("u_2") is True
+
+        user_repo.cascade_delete("u_2", session_repo, game_repo)
+        assert user_repo.is_admin("u_2") is False
+
+
+@pytest.mark.unit
+class TestGameSessionIndex:
+    """Test GameRepository's per-session index."""
+
+    def test_get_by_session_tracks_creates_and_deletes(self, repos):
+        """Test that session lookups reflect creates, updates and deletes."""
+        _, _, game_repo = repos
+        game_repo.create({"game_id": "g_1", "session_id": "s_1", "status": "IN_PROGRESS"})
+        game_repo.create({"game_id": "g_2", "session_id": "s_2", "status": "IN_PROGRESS"})
+        game_repo.create({"game_id": "g_3", "session_id": "s_1", "status": "IN_PROGRESS"})
+        game_repo.update("g_1", {"status": "WON"})
+
+        assert [g["game_id"] for g in game_repo.get_by_session("s_1")] == ["g_1", "g_3"]
+        assert game_repo.get_by_session("s_1")[0]["status"] == "WON"
+
+        game_repo.delete("g_1")
+        assert [g["game_id"] for g in game_repo.get_by_session("s_1")] == ["g_3"]
+        assert game_repo.delete_by_session("s_1") == 1
+        assert game_repo.get_by_session("s_1") == []
+        assert [g["game_id"] for g in game_repo.get_by_session("s_2")] == ["g_2"]
+
+    def test_get_session_page_copies_page_without_excluded_fields(self, repos):
+        """Test that session pages are sliced, counted and filtered."""
+        _, _, game_repo = repos
+        for i in range(5):
+            game_repo.create({"game_id": f"g_{i}", "session_id": "s_1", "secret": "casa"})
+
+        page, total = game_repo.get_session_page("s_1", 2, 2, exclude={"secret"})
+
+        assert total == 5
+        assert page == [{"game_id": "g_2", "session_id": "s_1"}, {"game_id": "g_3", "session_id": "s_1"}]
+        assert game_repo.get_session_page("s_missing", 0, 10) == ([], 0)
+
+    def test_get_used_secrets_per_session(self, repos):
+        """Test that used secrets are tracked per session and drop on delete."""
+        _, _, game_repo = repos
+        game_repo.create({"game_id": "g_1", "session_id": "s_1", "secret": "casa"})
+        game_repo.create({"game_id": "g_2", "session_id": "s_1", "secret": "masa"})
+        game_repo.create({"game_id": "g_3", "session_id": "s_2", "secret": "casa"})
+
+        assert game_repo.get_used_secrets("s_1") == {"casa", "masa"}
+        game_repo.delete("g_1")
+        assert game_repo.get_used_secrets("s_1") == {"masa"}
+        game_repo.delete_by_session("s_1")
+        assert game_repo.get_used_secrets("s_1") == set()
+        assert game_repo.get_used_secrets("s_2") == {"casa"}
+
+
+@pytest.mark.unit
+class TestGameReads:
+    """Test GameRepository's copying and read-only reads."""
+
+    def test_get_by_id_copies_mutable_fields(self, repos):
+        """Test that changes to a returned game do not leak into the store."""
+        _, _, game_repo = repos
+        game_repo.create({"game_id": "g_1", "session_id": "s_1", "guessed_letters": ["a"], "wrong_letters": []})
+
+        game = game_repo.get_by_id("g_1")
+        game["guessed_letters"].append("b")
+        game["wrong_letters"].append("b")
+        game["status"] = "WON"
+
+        stored = game_repo.peek_by_id("g_1")
+        assert stored["guessed_letters"] == ["a"]
+        assert stored["wrong_letters"] == []
+        assert "status" not in stored
+        with pytest.raises(TypeError):
+            stored["status"] = "LOST"
+        assert game_repo.peek_by_id("g_missing") is None
+
+
+@pytest.mark.unit
+class TestRepositoryVersions:
+    """Test that write versions only move when data actually changes."""
+
+    def test_missing_ids_keep_version(self, repos):
+        """Test that updates and deletes of unknown IDs are not counted as writes."""
+        user_repo, session_repo, game_repo = repos
+        _seed_user(user_repo, session_repo, game_repo, "u_1")
+        versions = (user_repo.version, session_repo.version, game_repo.version)
+
+        assert user_repo.update("u_missing", {"nickname": "x"}) is None
+        assert user_repo.delete("u_missing") is False
+        assert session_repo.update("s_missing", {"status": "FINISHED"}) is None
+        assert session_repo.delete("s_missing") is False
+        assert session_repo.delete_by_user("u_missing") == 0
+        assert game_repo.update("g_missing", {"status": "WON"}) is None
+        assert game_repo.delete("g_missing") is False
+        assert game_repo.delete_by_session("s_missing") == 0
+
+        assert (user_repo.version, session_repo.version, game_repo.version) == versions
+
+    def test_writes_bump_version(self, repos):
+        """Test that successful writes move the version."""
+        user_repo, session_repo, game_repo = repos
+        _seed_user(user_repo, session_repo, game_repo, "u_1")
+        versions = (user_repo.version, session_repo.version, game_repo.version)
+
+        user_repo.update("u_1", {"nickname": "x"})
+        session_repo.update("s_u_1_0", {"status": "FINISHED"})
+        game_repo.update("g_u_1_0", {"status": "WON"})
+
+        assert (user_repo.version, session_repo.version, game_repo.version) == tuple(v + 1 for v in versions)
+
+
+@pytest.mark.unit
+class TestInternedFields:
+    """Test that repeated low-cardinality strings share one object."""
+
+    def test_session_params_and_game_session_ids_interned(self, repos):
+        """Test that equal strings from separate requests end up identical."""
+        _, session_repo, game_repo = repos
+        for i in range(2):
+            session_repo.create({
+                "session_id": f"s_{i}", "user_id": "u_1", "status": "ACTIVE",
+                "params": {"dictionary_id": "".join(["dict_", "ro"]), "language": "".join(["r", "o"])}
+            })
+            game_repo.create({"game_id": f"g_{i}", "session_id": "".join(["s_", "0"]), "status": "IN_PROGRESS"})
+
+        first, second = session_repo.get_by_id("s_0"), session_repo.get_by_id("s_1")
+        assert first["params"]["dictionary_id"] is second["params"]["dictionary_id"]
+        assert first["params"]["language"] is second["params"]["language"]
+        assert game_repo.get_by_id("g_0")["session_id"] is game_repo.get_by_id("g_1")["session_id"]
+
+
+@pytest.mark.unit
+class TestSessionUserIndex:
+    """Test SessionRepository's per-user index."""
+
+    def test_get_by_user_tracks_creates_and_deletes(self, repos):
+        """Test that user lookups reflect creates and deletes."""
+        _, session_repo, game_repo = repos
+        for sid, uid in (("s_1", "u_1"), ("s_2", "u_2"), ("s_3", "u_1")):
+            session_repo.create({"session_id": sid, "user_id": uid, "status": "ACTIVE"})
+            game_repo.create({"game_id": f"g_{sid}", "session_id": sid, "status": "WON"})
+
+        assert [s["session_id"] for s in session_repo.get_by_user("u_1")] == ["s_1", "s_3"]
+        assert [g["game_id"] for g in game_repo.get_by_sessions(["s_1", "s_3"])] == ["g_s_1", "g_s_3"]
+
+        session_repo.delete("s_1")
+        assert [s["session_id"] for s in session_repo.get_by_user("u_1")] == ["s_3"]
+        assert session_repo.delete_by_user("u_1") == 1
+        assert session_repo.get_by_user("u_1") == []
+        assert len(session_repo.get_by_user("u_2")) == 1
+
+    def test_is_dictionary_in_use_tracks_active_sessions(self, repos):
+        """Test that only ACTIVE sessions keep a dictionary in use."""
+        _, session_repo, _ = repos
+        for sid, uid in (("s_1", "u_1"), ("s_2", "u_2")):
+            session_repo.create({
+                "session_id": sid, "user_id": uid, "status": "ACTIVE",
+                "params": {"dictionary_id": "dict_a"}
+            })
+
+        session_repo.update("s_1", {"status": "FINISHED"})
+        assert session_repo.is_dictionary_in_use("dict_a") is True
+        session_repo.delete_by_user("u_2")
+        assert session_repo.is_dictionary_in_use("dict_a") is False
+        assert session_repo.is_dictionary_in_use("dict_b") is False
+
+
+@pytest.mark.unit
+class TestDictionaryDefaultLoad:
+    """Test lazy loading of the default dictionary."""
+
+    def test_default_loaded_on_first_access(self):
+        """Test that the default dictionary appears on first read, once."""
+        repo = DictionaryRepository()
+        assert repo._dictionaries == {}
+
+        default = repo.get_by_id("dict_ro_basic")
+        assert default is not None
+        assert default["words"]
+        assert repo.get_by_id("dict_ro_basic") is default
+        # Parsed words are shared between repository instances
+        assert DictionaryRepository().get_by_id("dict_ro_basic")["words"] is default["words"]
+
+    def test_deleted_default_stays_deleted(self):
+        """Test that deleting the default dictionary does not reload it."""
+        repo = DictionaryRepository()
+        assert repo.delete("dict_ro_basic") is True
+        assert repo.exists("dict_ro_basic") is False
+        assert repo.get_all() == []
+
+    def test_version_bumped_only_on_write(self):
+        """Test that updates and deletes of missing dictionaries keep the version."""
+        repo = DictionaryRepository()
+        repo.get_all()
+        version = repo.version
+
+        assert repo.update("dict_missing", {"active": False}) is None
+        assert repo.delete("dict_missing") is False
+        assert repo.version == version
+
+        repo.update("dict_ro_basic", {"active": False})
+        assert repo.version == version + 1
+        repo.delete("dict_ro_basic")
+        assert repo.version == version + 2
+
+
+@pytest.mark.unit
+class TestDictionaryWordCache:
+    """Test the marshal cache of parsed word files."""
+
+    def test_cache_written_and_reused(self, tmp_path):
+        """Test that a second load reads the cache instead of the text file."""
+        words_file = tmp_path / "words.txt"
+        words_file.write_text("Alpha\n\n beta \n", encoding="utf-8")
+
+        assert _read_cached_words(words_file) == ("alpha", "beta")
+        assert (tmp_path / "words.cache").exists()
+        assert _read_cached_words(words_file) == ("alpha", "beta")
+
+    def test_cache_invalidated_when_source_changes(self, tmp_path):
+        """Test that editing the word file bypasses the stale cache."""
+        words_file = tmp_path / "words.txt"
+        words_file.write_text("alpha\n", encoding="utf-8")
+        _read_cached_words(words_file)
+
+        words_file.write_text("alpha\ngamma\n", encoding="utf-8")
+
+        assert _read_cached_words(words_file) == ("alpha", "gamma")
+
+    def test_corrupt_cache_is_ignored(self, tmp_path):
+        """Test that an unreadable cache falls back to parsing."""
+        words_file = tmp_path / "words.txt"
+        words_file.write_text("alpha\n", encoding="utf-8")
+        (tmp_path / "words.cache").write_bytes(b"not marshal data")
+
+        assert _read_cached_words(words_file) == ("alpha",)
+
+
+@pytest.mark.unit
+class TestLeaderboardRepository:
+    """Test materialized leaderboard aggregates."""
+
+    def test_record_game_updates_row_and_totals(self):
+        """Test that finished games fold into the user row and global totals."""
+        repo = LeaderboardRepository()
+        repo.record_game("u_1", {"session_id": "s_1", "status": "WON", "composite_score": 900.0, "time_seconds": 10.0})
+        repo.record_game("u_1", {"session_id": "s_1", "status": "LOST", "composite_score": -50.0, "time_seconds": 20.0})
+        repo.record_game("u_1", {"session_id": "s_2", "status": "ABORTED"})
+
+        row = repo.get("u_1")
+        assert row["games_won"] == 1
+        assert row["games_lost"] == 1
+        assert row["games_aborted"] == 1
+        assert row["total_score"] == 850.0
+
+        totals = repo.get_totals()
+        assert totals["total_sessions"] == 2
+        assert totals["total_time_sec"] == 30.0
+
+    def test_delete_user_subtracts_totals(self):
+        """Test that removing a user keeps the totals consistent."""
+        repo = LeaderboardRepository()
+        repo.record_game("u_1", {"session_id": "s_1", "status": "WON", "composite_score": 900.0, "time_seconds": 10.0})
+        repo.record_game("u_2", {"session_id": "s_2", "status": "LOST", "composite_score": -50.0, "time_seconds": 5.0})
+
+        assert repo.delete_user("u_1") is True
+        assert repo.delete_user("u_1") is False
+
+        totals = repo.get_totals()
+        assert totals["games_won"] == 0
+        assert totals["games_lost"] == 1
+        assert totals["total_sessions"] == 1
+        assert totals["total_time_sec"] == 5.0
+        assert repo.count() == 1
+        assert repo.count_ranked() == 1
+        repo.clear()
+        assert repo.count_ranked() == 0
+
+    def test_get_top_orders_by_metric(self):
+        """Test that the per-metric index ranks rows and tracks new writes."""
+        repo = LeaderboardRepository()
+        repo.record_game("u_1", {"session_id": "s_1", "status": "WON", "composite_score": 900.0})
+        repo.record_game("u_2", {"session_id": "s_2", "status": "LOST", "composite_score": -50.0})
+        repo.record_game("u_2", {"session_id": "s_2", "status": "LOST", "composite_score": -50.0})
+        repo.record_game("u_3", {"session_id": "s_3", "status": "ABORTED"})
+
+        assert [r["user_id"] for r in repo.get_top("total_score", 10)] == ["u_1", "u_2"]
+        assert [r["user_id"] for r in repo.get_top("total_games", 10)] == ["u_2", "u_1"]
+        assert [r["user_id"] for r in repo.get_top("total_score", 1, offset=1)] == ["u_2"]
+        assert repo.count_ranked() == 2
+
+        repo.record_game("u_2", {"session_id": "s_2", "status": "WON", "composite_score": 2000.0})
+        assert repo.get_top("total_score", 1)[0]["user_id"] == "u_2"
+
+    def test_set_nickname_only_for_existing_rows(self):
+        """Test that nicknames are denormalized onto existing rows only."""
+        repo = LeaderboardRepository()
+        repo.record_game("u_1", {"session_id": "s_1", "status": "WON", "composite_score": 900.0})
+
+        assert repo.set_nickname("u_1", "Ana") is True
+        assert repo.set_nickname("u_missing", "Bob") is False
+        assert repo.get_top("total_score", 1)[0]["nickname"] == "Ana"
+
+    def test_merged_index_matches_full_sort(self):
+        """Test that incremental index merges agree with a fresh sort."""
+        import random
+        rng = random.Random(7)
+        repo = LeaderboardRepository()
+        for step in range(300):
+            user_id = f"u_{rng.randrange(40)}"
+            status = rng.choice(["WON", "LOST", "ABORTED"])
+            repo.record_game(user_id, {"session_id": f"s_{step}", "status": status, "composite_score": rng.randrange(5) * 100.0})
+            if step % 37 == 0:
+                repo.delete_user(f"u_{rng.randrange(40)}")
+            if step % 10 == 0:
+                for metric in ("total_score", "win_rate", "total_games"):
+                    repo.get_top(metric, 5)
+
+        fresh = LeaderboardRepository()
+        fresh._rows, fresh._seq = repo._rows, repo._seq
+        for metric in ("total_score", "win_rate", "total_games"):
+            assert repo.get_top(metric, 50) == fresh.get_top(metric, 50)
+        assert repo.count_ranked() == sum(1 for r in repo.get_all() if r["games_won"] + r["games_lost"])
+
+    def test_version_tracks_finished_games(self):
+        """Test that the version moves on finished games, deletes and rebuilds only."""
+        repo = LeaderboardRepository()
+        version = repo.version
+
+        repo.record_game("u_1", {"session_id": "s_1", "status": "WON", "composite_score": 900.0})
+        assert repo.version == version + 1
+        repo.set_nickname("u_1", "Ana")
+        repo.get_top("total_score", 10)
+        assert repo.delete_user("u_missing") is False
+        assert repo.version == version + 1
+
+        repo.delete_user("u_1")
+        assert repo.version == version + 2
+        repo.clear()
+        assert repo.version == version + 3
+
+    def test_version_bumped_on_rename_only(self):
+        """Test that renaming a stored nickname moves the version but filling one in does not."""
+        repo = LeaderboardRepository()
+        repo.record_game("u_1", {"session_id": "s_1", "status": "WON", "composite_score": 900.0})
+        version = repo.version
+
+        repo.set_nickname("u_1", "Ana")
+        repo.set_nickname("u_1", "Ana")
+        assert repo.version == version
+
+        repo.set_nickname("u_1", "Bob")
+        assert repo.version == version + 1
@@ -232,4 +232,132 @@ class TestStatsServiceLeaderboard:
         result = stats_service.get_leaderboard(limit=2)
         
         assert len(result) <= 2
+    
+    def test_get_leaderboard_page_returns_total(
+        self, stats_service, game_service, auth_service, session_service
+    ):
+        """Test that a leaderboard page carries offset ranks and the exact total."""
+        for i in range(3):
+            user = auth_service.register_user(
+                email=f"pager{i}@example.com",
+                password="Pass123!"
+            )
+            session = session_service.create_session(
+                user_id=user["user_id"],
+                num_games=1,
+                dictionary_id="dict_ro_basic", difficulty="medium", language="ro", max_misses=6, allow_word_guess=True, seed=None
+            )
+            game = game_service.create_game(
+                session_id=session["session_id"],
+                user_id=user["user_id"]
+            )
+            game_full = game_service.game_repo.get_by_id(game["game_id"])
+            game_service.make_guess_word(
+                game_id=game["game_id"],
+                user_id=user["user_id"],
+                word=game_full["secret"]
+            )
+        
+        entries, total = stats_service.get_leaderboard_page(limit=2, offset=2)
+        
+        assert total == 3
+        assert len(entries) == 1
+        assert entries[0]["rank"] == 3
+
+
+
+@pytest.mark.unit
+class TestStatsServiceMaterialized:
+    """Test that materialized aggregates match the full-scan results."""
+    
+    def test_materialized_matches_scan(
+        self, mock_user_repo, mock_session_repo, mock_game_repo, mock_dict_repo,
+        auth_service, session_service
+    ):
+        """Test leaderboard and global stats served from LeaderboardRepository."""
+        from src.repositories.leaderboard_repository import LeaderboardRepository
+        from src.services.game_service import GameService
+        from src.services.stats_service import StatsService
+        
+        leaderboard_repo = LeaderboardRepository()
+        game_service = GameService(mock_game_repo, mock_session_repo, mock_dict_repo, leaderboard_repo)
+        materialized = StatsService(mock_user_repo, mock_session_repo, mock_game_repo, leaderboard_repo)
+        scanning = StatsService(mock_user_repo, mock_session_repo, mock_game_repo)
+        
+        user_ids = []
+        for i in range(3):
+            user = auth_service.register_user(email=f"mv{i}@example.com", password="Pass1234")
+            user_ids.append(user["user_id"])
+            session = session_service.create_session(
+                user_id=user["user_id"], num_games=2, dictionary_id="dict_ro_basic",
+                difficulty="auto", language="ro", max_misses=6, allow_word_guess=True, seed=None
+            )
+            game = game_service.create_game(session["session_id"], user["user_id"])
+            secret = mock_game_repo.get_by_id(game["game_id"])["secret"]
+            if i:
+                game_service.make_guess_word(game["game_id"], secret, user["user_id"])
+            else:
+                # Each wrong word costs two misses; three lose the game
+                for _ in range(3):
+                    game_service.make_guess_word(game["game_id"], "wrongword", user["user_id"])
+            game = game_service.create_game(session["session_id"], user["user_id"])
+            game_service.abort_game(game["game_id"], user["user_id"])
+        
+        assert materialized.get_leaderboard(limit=10) == scanning.get_leaderboard(limit=10)
+        
+        mv_global = materialized.get_global_stats()
+        scan_global = scanning.get_global_stats()
+        for key in ("total_users", "total_sessions", "total_games", "games_won", "games_lost", "games_aborted"):
+            assert mv_global[key] == scan_global[key]
+        
+        for user_id in user_ids + ["u_missing"]:
+            assert materialized.get_user_stats(user_id) == scanning.get_user_stats(user_id)
+        
+        assert materialized.rebuild_leaderboard() == 6
+        assert materialized.get_leaderboard(limit=10) == scanning.get_leaderboard(limit=10)
+    
+    def test_batched_rebuild_replays_concurrent_writes(
+        self, mock_user_repo, mock_session_repo, mock_game_repo, mock_dict_repo,
+        auth_service, session_service
+    ):
+        """Test that games finished and users removed mid-rebuild survive the swap."""
+        from src.repositories.leaderboard_repository import LeaderboardRepository
+        from src.services.game_service import GameService
+        from src.services.stats_service import StatsService
+        
+        leaderboard_repo = LeaderboardRepository()
+        game_service = GameService(mock_game_repo, mock_session_repo, mock_dict_repo, leaderboard_repo)
+        materialized = StatsService(mock_user_repo, mock_session_repo, mock_game_repo, leaderboard_repo)
+        scanning = StatsService(mock_user_repo, mock_session_repo, mock_game_repo)
+        
+        def play_won_game(user_id, session_id):
+            game = game_service.create_game(session_id, user_id)
+            secret = mock_game_repo.get_by_id(game["game_id"])["secret"]
+            game_service.make_guess_word(game["game_id"], secret, user_id)
+        
+        sessions = []
+        for i in range(3):
+            user = auth_service.register_user(email=f"rb{i}@example.com", password="Pass1234")
+            session = session_service.create_session(
+                user_id=user["user_id"], num_games=2, dictionary_id="dict_ro_basic",
+                difficulty="auto", language="ro", max_misses=6, allow_word_guess=True, seed=None
+            )
+            sessions.append((user["user_id"], session["session_id"]))
+            play_won_game(user["user_id"], session["session_id"])
+        before = materialized.get_leaderboard(limit=10)
+        
+        steps = materialized.rebuild_leaderboard_steps(batch_size=1)
+        assert next(steps) == 1
+        # Readers keep seeing the complete old table until the swap
+        assert materialized.get_leaderboard(limit=10) == before
+        
+        play_won_game(*sessions[0])
+        removed_user, removed_session = sessions[2]
+        mock_session_repo.delete(removed_session)
+        leaderboard_repo.delete_user(removed_user)
+        
+        assert list(steps)[-1] == 3
+        assert materialized.get_leaderboard(limit=10) == scanning.get_leaderboard(limit=10)
+        assert leaderboard_repo.count_ranked() == 2
+        assert leaderboard_repo.get(sessions[0][0])["games_won"] == 2
 
@@ -10,8 +10,15 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.game_utils import normalize, update_pattern, calculate_score
-from src.utils.auth_utils import hash_password, verify_password, create_access_token, decode_token
+from src.utils.game_utils import normalize, update_pattern, calculate_score, letter_masks, pattern_mask, reveal_mask
+from src.utils.response_cache import ResponseCache
+from src.middleware.idempotency import IdempotencyStore
+from src.middleware.rate_limiter import RateLimiterMiddleware
+from src.middleware.token_bucket import TokenBucket, NS_PER_SECOND
+from src.utils.auth_utils import (
+    hash_password, verify_password, create_access_token, decode_token, decode_token_cached,
+    start_hash_pool, shutdown_hash_pool
+)
 
 
 @pytest.mark.unit
@@ -92,6 +99,25 @@ class TestUpdatePattern:
         result = update_pattern("python", "p***on", "t")
         assert result == "p*t*on"  # Pattern reveals t in position 2
 
+    def test_update_pattern_with_precomputed_secret_norm(self):
+        """Test that a precomputed normalized secret gives the same pattern."""
+        secret = "Școală"
+        result = update_pattern(secret, "******", "a", normalize(secret))
+        assert result == update_pattern(secret, "******", "a") == "***a*ă"
+
+    def test_reveal_mask_matches_update_pattern(self):
+        """Test that the per-letter position bitmasks reveal like update_pattern."""
+        secret = "Școală"
+        masks = letter_masks(secret)
+        assert masks["a"] == 0b101000
+        pattern = "******"
+        for letter in "zașl":
+            expected = update_pattern(secret, pattern, letter)
+            pattern = reveal_mask(secret, pattern, masks.get(normalize(letter), 0))
+            assert pattern == expected
+        assert pattern == "Ș**ală"
+        assert pattern_mask(pattern) == 0b111001
+
 
 @pytest.mark.unit
 class TestCalculateScore:
@@ -201,6 +227,37 @@ class TestAuthUtils:
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
         
+    def test_verify_password_caches_only_successes(self, monkeypatch):
+        """Test that a repeat correct login skips bcrypt but wrong ones never do."""
+        from src.utils import auth_utils
+        password = "MySecure123!"
+        hashed = hash_password(password)
+        assert verify_password(password, hashed) is True
+        
+        calls = []
+        real_verify = auth_utils._verify
+        monkeypatch.setattr(auth_utils, "_verify", lambda p, h: calls.append(p) or real_verify(p, h))
+        
+        assert verify_password(password, hashed) is True
+        assert calls == []
+        assert verify_password("WrongPass1", hashed) is False
+        assert verify_password("WrongPass1", hashed) is False
+        assert calls == ["WrongPass1", "WrongPass1"]
+        # A new hash (password change) is not covered by the old entry
+        assert verify_password(password, hash_password(password)) is True
+        assert calls[-1] == password
+        
+    def test_hash_pool_hashes_in_worker_processes(self):
+        """Test that hashing and verification work through the process pool."""
+        start_hash_pool(1)
+        try:
+            hashed = hash_password("MySecure123!")
+            assert verify_password("MySecure123!", hashed) is True
+            assert verify_password("WrongPass", hashed) is False
+        finally:
+            shutdown_hash_pool()
+        assert verify_password("MySecure123!", hashed) is True
+        
     def test_create_access_token(self):
         """Test JWT token creation."""
         payload = {"sub": "u_123", "role": "user"}
@@ -224,3 +281,143 @@ class TestAuthUtils:
         """Test decoding invalid JWT token."""
         with pytest.raises(Exception):  # Should raise JWTError or similar
             decode_token("invalid.token.here")
+            
+    def test_decode_token_cached_reuses_payload(self):
+        """Test that repeated decodes of the same token share one payload."""
+        token = create_access_token({"sub": "u_456"})
+        
+        first = decode_token_cached(token)
+        second = decode_token_cached(token)
+        
+        assert first["sub"] == "u_456"
+        assert second is first
+        
+    def test_decode_token_cached_invalid_token(self):
+        """Test that invalid tokens are rejected and not cached."""
+        with pytest.raises(ValueError):
+            decode_token_cached("invalid.token.here")
+        with pytest.raises(ValueError):
+            decode_token_cached("invalid.token.here")
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test the in-memory response cache."""
+    
+    def test_get_or_set_computes_once(self):
+        """Test that the factory runs only on a cache miss."""
+        cache = ResponseCache()
+        calls = []
+        
+        def factory():
+            calls.append(1)
+            return {"value": 42}
+        
+        assert cache.get_or_set(("stats", "all", 1), factory) == {"value": 42}
+        assert cache.get_or_set(("stats", "all", 1), factory) == {"value": 42}
+        assert len(calls) == 1
+        
+    def test_new_version_misses(self):
+        """Test that a different data version in the key recomputes."""
+        cache = ResponseCache()
+        cache.set(("stats", "all", 1), "old")
+        
+        assert cache.get_or_set(("stats", "all", 2), lambda: "new") == "new"
+        
+    def test_expired_entry_is_dropped(self):
+        """Test that entries expire after their TTL."""
+        cache = ResponseCache()
+        cache.set(("stats",), "value", ttl_seconds=0)
+        
+        assert cache.get(("stats",)) is None
+        
+    def test_invalidate_namespace(self):
+        """Test that invalidation only drops the given namespace."""
+        cache = ResponseCache()
+        cache.set(("leaderboard", "all"), [1])
+        cache.set(("dictionaries", 0), [2])
+        
+        assert cache.invalidate("leaderboard") == 1
+        assert cache.get(("leaderboard", "all")) is None
+        assert cache.get(("dictionaries", 0)) == [2]
+        
+    def test_max_entries_evicts_oldest(self):
+        """Test that the cache stays bounded."""
+        cache = ResponseCache(max_entries=2)
+        cache.set(("a",), 1)
+        cache.set(("b",), 2)
+        cache.set(("c",), 3)
+        
+        assert cache.get(("a",)) is None
+        assert cache.get(("c",)) == 3
+
+
+@pytest.mark.unit
+class TestIdempotencyStore:
+    """Test the idempotency store's deadline-based expiry."""
+    
+    def test_get_returns_live_entry(self):
+        """Test that stored responses are returned before they expire."""
+        store = IdempotencyStore(ttl_hours=1)
+        store.set("k", 201, b"{}", ((b"content-type", b"application/json"),))
+        
+        assert store.get("k")["status_code"] == 201
+        
+    def test_cleanup_pops_only_expired_entries(self):
+        """Test that cleanup drops expired keys and keeps re-stored ones."""
+        store = IdempotencyStore(ttl_hours=0)
+        store.set("old", 200, b"a", ())
+        store.set("kept", 200, b"b", ())
+        store.ttl_hours, store._ttl_seconds = 1, 3600
+        store.set("kept", 200, b"c", ())
+        
+        store.cleanup_expired()
+        
+        assert store.get("old") is None
+        assert store.get("kept")["body"] == b"c"
+        assert store._expiry == [(store.get("kept")["expires_at"], "kept")]
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test the integer-nanosecond token bucket."""
+    
+    def test_consume_and_refill_exactly(self):
+        """Test that tokens refill at the exact integer rate."""
+        bucket = TokenBucket(capacity=5, refill_rate=5.0/60.0, now_ns=0)
+        for _ in range(5):
+            assert bucket.consume(1, now_ns=0) is True
+        assert bucket.consume(1, now_ns=0) is False
+        
+        # One game token refills every 12 seconds
+        assert bucket.consume(1, now_ns=12 * NS_PER_SECOND - 1) is False
+        assert bucket.consume(1, now_ns=12 * NS_PER_SECOND) is True
+        assert bucket.remaining(now_ns=12 * NS_PER_SECOND) == 0
+        assert bucket.reset_time(now_ns=12 * NS_PER_SECOND) == 60.0
+        
+    def test_is_full_does_not_refill(self):
+        """Test that the cleanup check leaves the bucket untouched."""
+        bucket = TokenBucket(capacity=2, refill_rate=1.0, now_ns=0)
+        bucket.consume(1, now_ns=0)
+        
+        assert bucket.is_full(NS_PER_SECOND - 1) is False
+        assert bucket.is_full(NS_PER_SECOND) is True
+        assert bucket.remaining(now_ns=0) == 1
+        
+    def test_stale_time_does_not_rewind_bucket(self):
+        """Test that a time older than the last refill neither drains nor rewinds."""
+        bucket = TokenBucket(capacity=60, refill_rate=1.0, now_ns=0)
+        bucket.consume(1, now_ns=10 * NS_PER_SECOND)
+        
+        assert bucket.remaining(now_ns=5 * NS_PER_SECOND) == 59
+        assert bucket.last_ns == 10 * NS_PER_SECOND
+        assert bucket.remaining(now_ns=11 * NS_PER_SECOND) == 60
+        
+    def test_rate_limiter_evicts_least_recently_used_bucket(self):
+        """Test that bucket dicts stay bounded and keep recently used keys."""
+        limiter = RateLimiterMiddleware(app=None, max_buckets=2)
+        for identifier in ("a", "b", "a", "c"):
+            limiter._check_general_limit(identifier, now_ns=0)
+        
+        assert list(limiter.general_buckets) == ["a", "c"]
+        assert limiter.general_buckets["a"].remaining(now_ns=0) == 58